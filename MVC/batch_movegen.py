@@ -0,0 +1,207 @@
+import numpy as np
+from assets.consts import Consts
+from MVC.tables import ROWS, COLS, SQUARES, JUMPS, TERRAIN, CAPTURES, is_river
+from MVC.moves import MAX_MOVES, CAPTURE_FLAG, JUMP_FLAG, TARGET_FLAGS
+
+
+# Geração de movimentos vetorizada para muitos tabuleiros de uma vez (N, 7, 6), com as mesmas regras
+# que Model.get_possible_moves. Cada casa tem 8 "slots": os 4 passos de Consts.DIRECTIONS e os 4 saltos
+# do Leão nas mesmas direções. Um salto só existe quando a casa vizinha nessa direção é rio, por isso
+# nunca há um passo e um salto legais na mesma direção.
+
+OFF = SQUARES       # Coluna extra, sempre vazia, usada como destino fora do tabuleiro
+SLOTS = 8
+
+
+def _build_targets():
+    """Gera as casas de destino (8, 42) de cada slot, o caminho de rio dos saltos (4, 42, 3) e a máscara de rio"""
+    targets = np.full((SLOTS, SQUARES), OFF, dtype=np.intp)
+    paths = np.full((4, SQUARES, 3), OFF, dtype=np.intp)
+    for row in range(ROWS):
+        for col in range(COLS):
+            sq = row * COLS + col
+            for d, (d_row, d_col) in enumerate(Consts.DIRECTIONS):
+                new_row, new_col = row + d_row, col + d_col
+                if 0 <= new_row < ROWS and 0 <= new_col < COLS:
+                    targets[d, sq] = new_row * COLS + new_col
+            for (t_row, t_col), path in JUMPS[sq]:
+                # A direção do salto é a do destino em relação à casa de origem
+                d = Consts.DIRECTIONS.index(((t_row > row) - (t_row < row), (t_col > col) - (t_col < col)))
+                targets[4 + d, sq] = t_row * COLS + t_col
+                paths[d, sq, :len(path)] = [r * COLS + c for r, c in path]
+    river = np.array([is_river((sq // COLS, sq % COLS)) for sq in range(SQUARES)] + [False])
+    return targets, paths, river
+
+
+TARGETS, JUMP_PATHS, RIVER = _build_targets()
+IS_JUMP = np.arange(SLOTS)[:, None] >= 4                        # (8, 1)
+
+TERRAIN_ARRAY = np.array([list(TERRAIN[0]) + [0], list(TERRAIN[1]) + [0]], dtype=np.intp)    # (2, 43)
+CAPTURES_ARRAY = np.array(CAPTURES, dtype=bool).reshape(9, 9, 3, 3)
+OWN_DEN = np.array([6 * COLS + 2, 0 * COLS + 3])                # Toca de cada lado (azul, vermelho)
+TARGET_FLAGS_ARRAY = np.array([list(TARGET_FLAGS[0]) + [0], list(TARGET_FLAGS[1]) + [0]], dtype=np.uint16)
+
+
+def _legal_slots(boards, side):
+    """Calcula os slots legais de todos os tabuleiros
+
+    Args:
+        boards (ndarray): tabuleiros (N, 7, 6) com os ranks das peças
+        side (int | ndarray): jogador a jogar, 0 (Azul) ou 1 (Vermelho), igual para todos ou um por tabuleiro
+
+    Returns:
+        tuple(ndarray, ndarray, ndarray): slots legais (N, 8, 42), tabuleiros planos (N, 43) e lados (N,)
+    """
+    boards = np.asarray(boards)
+    n = boards.shape[0]
+    side = np.broadcast_to(np.asarray(side, dtype=np.intp), (n,))
+
+    flat = np.zeros((n, SQUARES + 1), dtype=np.int64)
+    flat[:, :SQUARES] = boards.reshape(n, SQUARES)
+    pieces = flat[:, None, :SQUARES]                            # (N, 1, 42) peça que se move
+    targets = flat[:, TARGETS]                                  # (N, 8, 42) peça no destino
+    ranks = np.abs(pieces)
+    target_ranks = np.abs(targets)
+
+    blue = (side == 0)[:, None, None]
+    own = np.where(blue, pieces > 0, pieces < 0)
+    friendly = np.where(blue, targets > 0, targets < 0)
+
+    # Capturas: a mesma tabela que Model.is_self_rank_higher, com o terreno de cada peça
+    attacker_terrain = TERRAIN_ARRAY[side][:, None, :SQUARES]
+    defender_terrain = TERRAIN_ARRAY[1 - side][:, TARGETS]
+    can_take = CAPTURES_ARRAY[ranks, target_ranks, attacker_terrain, defender_terrain]
+
+    legal = own & (TARGETS != OFF) & ~friendly & ((targets == 0) | can_take)
+    legal &= TARGETS != OWN_DEN[side][:, None, None]
+
+    # Só o Rato entra no rio; só o Leão salta, e qualquer Rato no caminho bloqueia o salto
+    legal &= np.where(IS_JUMP, ranks == 7, ~RIVER[TARGETS] | (ranks == 1))
+    rat_on_path = (np.abs(flat[:, JUMP_PATHS]) == 1).any(axis=-1)          # (N, 4, 42)
+    legal[:, 4:] &= ~rat_on_path
+    return legal, flat, side
+
+
+def legal_move_mask(boards, side) -> np.ndarray:
+    """Calcula as direções legais de cada peça do jogador a jogar, para muitos tabuleiros de uma vez
+
+    Args:
+        boards (ndarray): tabuleiros (N, 7, 6) no formato de Model.game_board
+        side (int | ndarray): jogador a jogar, 0 (Azul) ou 1 (Vermelho), igual para todos ou um por tabuleiro
+
+    Returns:
+        ndarray: máscara (N, 7, 6, 4); mask[n, linha, coluna, d] indica que a peça nessa casa pode
+        mover-se na direção Consts.DIRECTIONS[d] (no caso do Leão, saltando o rio se a vizinha for rio)
+    """
+    legal, _, _ = _legal_slots(boards, side)
+    mask = legal[:, :4] | legal[:, 4:]                          # (N, 4, 42)
+    return mask.transpose(0, 2, 1).reshape(-1, ROWS, COLS, 4)
+
+
+def generate_moves_batch(boards, side, max_moves: int = MAX_MOVES) -> tuple:
+    """Gera as jogadas codificadas (MVC.moves) de muitos tabuleiros de uma vez
+
+    A ordem das jogadas de cada tabuleiro é a mesma de Model.generate_moves.
+
+    Args:
+        boards (ndarray): tabuleiros (N, 7, 6) no formato de Model.game_board
+        side (int | ndarray): jogador a jogar, 0 (Azul) ou 1 (Vermelho), igual para todos ou um por tabuleiro
+        max_moves (int): tamanho de cada linha do resultado (default: MAX_MOVES)
+
+    Returns:
+        tuple(ndarray, ndarray): jogadas (N, max_moves) em uint16, preenchidas com 0 depois da última,
+        e o número de jogadas (N,) de cada tabuleiro
+    """
+    legal, flat, side = _legal_slots(boards, side)
+    n = legal.shape[0]
+
+    # Ordem do Model: por casa de origem, primeiro os passos e depois os saltos
+    legal = legal.transpose(0, 2, 1).reshape(n, SQUARES * SLOTS)
+    counts = legal.sum(axis=1)
+    order = np.argsort(~legal, axis=1, kind='stable')[:, :max_moves]
+
+    from_sq = order // SLOTS
+    slot = order % SLOTS
+    to_sq = TARGETS[slot, from_sq]
+    moves = (from_sq * SQUARES + to_sq).astype(np.uint16)
+    moves |= TARGET_FLAGS_ARRAY[side[:, None], to_sq]
+    moves |= np.where(np.take_along_axis(flat, to_sq, axis=1) != 0, CAPTURE_FLAG, 0).astype(np.uint16)
+    moves |= np.where(slot >= 4, JUMP_FLAG, 0).astype(np.uint16)
+    moves[np.arange(order.shape[1]) >= counts[:, None]] = 0
+    return moves, counts
+
+
+def _build_rollout_tables():
+    """Tabelas de sample_moves_batch, indexadas pelo lado, pelo rank e pela casa de origem
+
+    Returns:
+        tuple(ndarray, ndarray): slots possíveis (2, 9, 42, 8) sem olhar para as outras peças (fora do
+        tabuleiro, toca própria, rio e saltos) e código do terreno (2, 42, 8) do atacante e do defensor
+    """
+    rank = np.arange(9)[:, None, None]
+    targets = TARGETS.T[None]                                   # (1, 42, 8)
+    step_ok = np.where(IS_JUMP.T[None], rank == 7, ~RIVER[targets] | (rank == 1))
+    allowed = np.stack([(targets != OFF) & (targets != OWN_DEN[side]) & step_ok for side in (0, 1)])
+    terrain = np.stack([TERRAIN_ARRAY[side][:SQUARES, None] * 3 + TERRAIN_ARRAY[1 - side][targets[0]]
+                        for side in (0, 1)])
+    return allowed, terrain
+
+
+ROLLOUT_ALLOWED, ROLLOUT_TERRAIN = _build_rollout_tables()
+CAPTURES_FLAT = CAPTURES_ARRAY.reshape(-1)
+ENEMY_DEN_ARRAY = OWN_DEN[::-1].copy()                          # Toca adversária de cada lado
+
+
+def sample_moves_batch(boards, side, rng, capture_weight: float = 1.0) -> tuple:
+    """Escolhe uma jogada aleatória em cada um de muitos tabuleiros, para os rollouts do MCTS
+
+    Ao contrário de generate_moves_batch, só olha para as casas com peças de quem joga e não
+    ordena nem codifica as jogadas. A escolha é proporcional ao peso de cada jogada: 1 para as
+    jogadas calmas e capture_weight para as capturas; quando há entradas na toca, é escolhida uma delas.
+
+    Args:
+        boards (ndarray): tabuleiros planos (N, 42) com os ranks das peças
+        side (ndarray): jogador a jogar em cada tabuleiro (N,), 0 (Azul) ou 1 (Vermelho)
+        rng (Generator): gerador de números aleatórios do NumPy
+        capture_weight (float): peso das capturas (default: 1.0)
+
+    Returns:
+        tuple(ndarray, ndarray, ndarray): casas de origem (N,), casas de destino (N,) e se cada
+        tabuleiro tem alguma jogada (N,); sem jogadas, a origem e o destino não têm significado
+    """
+    n = boards.shape[0]
+    side = np.asarray(side, dtype=np.intp)
+    flat = np.zeros((n, SQUARES + 1), dtype=boards.dtype)
+    flat[:, :SQUARES] = boards
+
+    # Um par (tabuleiro, casa de origem) por peça de quem joga, por ordem de tabuleiro
+    own = np.where((side == 0)[:, None], boards > 0, boards < 0)
+    board_index, from_sq = np.nonzero(own)
+    pieces = boards[board_index, from_sq]
+    piece_side = side[board_index]
+    ranks = np.abs(pieces)
+    to_sq = TARGETS.T[from_sq]                                  # (K, 8)
+    targets = flat[board_index[:, None], to_sq]
+
+    # As mesmas regras de _legal_slots, só para as peças de quem joga
+    legal = ROLLOUT_ALLOWED[piece_side, ranks, from_sq] & (targets * pieces[:, None] <= 0)
+    code = (ranks[:, None] * 9 + np.abs(targets)) * 9 + ROLLOUT_TERRAIN[piece_side, from_sq]
+    legal &= (targets == 0) | CAPTURES_FLAT[code]
+    rat_on_path = (np.abs(flat[board_index[:, None, None], JUMP_PATHS[:, from_sq].transpose(1, 0, 2)]) == 1)
+    legal[:, 4:] &= ~rat_on_path.any(axis=-1)
+
+    # Nos tabuleiros em que é possível entrar na toca, só essas jogadas ficam com peso
+    weights = np.where(targets != 0, capture_weight, 1.0) * legal
+    den = legal & (to_sq == ENEMY_DEN_ARRAY[piece_side][:, None])
+    has_den = np.bincount(board_index, den.any(axis=1), minlength=n) > 0
+    weights[has_den[board_index][:, None] & ~den] = 0.0
+
+    # Amostragem pela soma acumulada de todos os tabuleiros, com um só número aleatório por tabuleiro
+    # (os pesos são pequenos, por isso as somas são exatas e nenhuma escolha passa para o tabuleiro vizinho)
+    cumulative = weights.reshape(-1).cumsum()
+    totals = np.bincount(board_index, weights.sum(axis=1), minlength=n)
+    starts = totals.cumsum() - totals
+    index = np.searchsorted(cumulative, starts + rng.random(n) * totals, side='right')
+    index = np.minimum(index, cumulative.size - 1)
+    pair, slot = index // SLOTS, index % SLOTS
+    return from_sq[pair], to_sq[pair, slot], totals > 0
@@ -0,0 +1,259 @@
+from MVC.model import Model
+from MVC.tables import ROWS, COLS, SQUARES, JUMPS
+from MVC.moves import CAPTURE_FLAG, JUMP_FLAG, TARGET_FLAGS
+
+
+FULL = (1 << (ROWS * COLS)) - 1     # Todas as 42 casas do tabuleiro
+
+
+def square_bit(pos) -> int:
+    """Converte uma posição (linha, coluna) na máscara com o bit da casa correspondente
+
+    Args:
+        pos (tuple(int, int)): posição no tabuleiro
+
+    Returns:
+        int: máscara de 42 bits com apenas a casa dada ativa
+    """
+    return 1 << (pos[0] * COLS + pos[1])
+
+
+def _mask(positions) -> int:
+    """Junta uma lista de posições numa única máscara"""
+    mask = 0
+    for pos in positions:
+        mask |= square_bit(pos)
+    return mask
+
+
+# Máscaras das colunas das bordas, usadas para evitar que os deslocamentos laterais "deem a volta"
+COL_0 = _mask((row, 0) for row in range(ROWS))
+COL_5 = _mask((row, COLS - 1) for row in range(ROWS))
+
+# Terreno do tabuleiro
+RIVER = _mask((row, col) for row in range(2, 5) for col in (1, 4))
+TRAPS = (_mask([(6, 1), (6, 3), (5, 2)]),     # Armadilhas azuis, onde o azul (lado 0) captura qualquer peça vermelha
+         _mask([(0, 2), (0, 4), (1, 3)]))     # Armadilhas vermelhas, onde o vermelho (lado 1) captura qualquer peça azul
+OWN_DEN = (square_bit((6, 2)), square_bit((0, 3)))    # Toca de cada lado (azul, vermelho)
+
+
+def _shift_up(bb: int) -> int:
+    return bb >> COLS
+
+
+def _shift_down(bb: int) -> int:
+    return (bb << COLS) & FULL
+
+
+def _shift_left(bb: int) -> int:
+    return (bb & ~COL_0) >> 1
+
+
+def _shift_right(bb: int) -> int:
+    return (bb & ~COL_5) << 1
+
+
+# Mesma ordem que Consts.DIRECTIONS, para que a lista de movimentos seja igual à do Model
+SHIFTS = (_shift_up, _shift_down, _shift_left, _shift_right)
+
+
+# Saltos do Leão de MVC.tables, convertidos para máscaras: (bit do destino, destino, máscara do caminho)
+JUMP_MASKS = tuple(tuple((square_bit(target), target, _mask(path)) for target, path in jumps) for jumps in JUMPS)
+
+# Os mesmos passos e saltos por casa de origem, com o destino como número da casa, para generate_moves
+STEPS = tuple(tuple((bit.bit_length() - 1, bit) for bit in (shift(1 << sq) for shift in SHIFTS) if bit)
+              for sq in range(SQUARES))
+JUMP_SQUARES = tuple(tuple((bit.bit_length() - 1, bit, path) for bit, _, path in jumps) for jumps in JUMP_MASKS)
+
+
+class BitboardModel(Model):
+    """Model alternativo que guarda o tabuleiro também em máscaras de bits
+
+    Cada lado e cada rank têm uma máscara de 42 bits (bit = linha * 6 + coluna). O game_board continua
+    a ser mantido para a View, o SaveManager e as funções de avaliação, mas a geração de movimentos
+    é feita apenas com deslocamentos e máscaras pré-calculadas.
+    """
+
+    def set_board(self, board, turn: int = 0) -> None:
+        """Substitui o tabuleiro atual e reconstrói as máscaras de bits
+
+        Args:
+            board (list | ndarray): tabuleiro 7x6 com os ranks das peças
+            turn (int): jogador a jogar nesta posição, usado na chave de Zobrist (default: 0)
+        """
+        super().set_board(board, turn)
+        self.side_bb = [0, 0]       # Máscara de cada lado (0 azul, 1 vermelho)
+        self.rank_bb = [0] * 9      # Máscara de cada rank (ambos os lados), indexada pelo valor absoluto
+        for row in range(ROWS):
+            for col in range(COLS):
+                piece = int(self.game_board[row, col])
+                if piece != 0:
+                    bit = square_bit((row, col))
+                    self.side_bb[0 if piece > 0 else 1] |= bit
+                    self.rank_bb[abs(piece)] |= bit
+
+    def move_piece(self, start: tuple, end: tuple) -> int:
+        """Move uma peça e atualiza as máscaras de bits
+
+        Args:
+            start (tuple): posição inicial (linha, coluna)
+            end (tuple): posição final (linha, coluna)
+
+        Returns:
+            int: peça que estava na posição final (0 se estava vazia)
+        """
+        piece = int(self.game_board[start[0], start[1]])
+        captured = super().move_piece(start, end)
+        start_bit = square_bit(start)
+        end_bit = square_bit(end)
+        side = 0 if piece > 0 else 1
+        self.side_bb[side] ^= start_bit | end_bit
+        self.rank_bb[abs(piece)] ^= start_bit | end_bit
+        if captured != 0:
+            self.side_bb[1 - side] ^= end_bit
+            self.rank_bb[abs(captured)] ^= end_bit
+        return captured
+
+    def undo_move_piece(self, start: tuple, end: tuple, captured: int) -> None:
+        """Desfaz uma jogada feita com move_piece, repondo as máscaras de bits
+
+        Args:
+            start (tuple): posição inicial da jogada (linha, coluna)
+            end (tuple): posição final da jogada (linha, coluna)
+            captured (int): peça devolvida por move_piece
+        """
+        super().undo_move_piece(start, end, captured)
+        piece = int(self.game_board[start[0], start[1]])
+        start_bit = square_bit(start)
+        end_bit = square_bit(end)
+        side = 0 if piece > 0 else 1
+        self.side_bb[side] ^= start_bit | end_bit
+        self.rank_bb[abs(piece)] ^= start_bit | end_bit
+        if captured != 0:
+            self.side_bb[1 - side] ^= end_bit
+            self.rank_bb[abs(captured)] ^= end_bit
+
+    def capturable_mask(self, rank: int, from_bit: int) -> int:
+        """Calcula as peças inimigas que a peça dada pode capturar, independentemente da distância
+
+        Args:
+            rank (int): rank da peça que captura (com sinal)
+            from_bit (int): máscara com a casa onde a peça está
+
+        Returns:
+            int: máscara das peças inimigas que podem ser capturadas
+        """
+        side = 0 if rank > 0 else 1
+        enemy = self.side_bb[1 - side]
+        rank = abs(rank)
+
+        if rank == 1:
+            # O Rato só captura o Rato no mesmo terreno, e o Elefante apenas a partir de terra
+            if from_bit & RIVER:
+                mask = self.rank_bb[1] & RIVER
+            else:
+                mask = (self.rank_bb[1] & ~RIVER) | self.rank_bb[8]
+        elif rank == 8:
+            # O Elefante captura tudo exceto o Rato
+            mask = enemy & ~self.rank_bb[1]
+        else:
+            mask = 0
+            for lower in range(1, rank + 1):
+                mask |= self.rank_bb[lower]
+
+        # Peças inimigas nas nossas armadilhas podem ser capturadas por qualquer peça
+        return (mask & enemy) | (enemy & TRAPS[side])
+
+    def get_possible_moves(self, position):
+        """Retorna os movimentos possíveis de uma peça para uma posição dada
+
+        Args:
+            position (tuple(int, int)): posição dada
+        """
+        rank = int(self.game_board[position[0], position[1]])
+        if rank == 0:
+            return None
+
+        side = 0 if rank > 0 else 1
+        from_bit = square_bit(position)
+        occupied = self.side_bb[0] | self.side_bb[1]
+        targets = ((FULL & ~occupied) | self.capturable_mask(rank, from_bit)) & ~OWN_DEN[side]
+
+        # Só o Rato pode entrar no rio
+        if abs(rank) != 1:
+            targets &= ~RIVER
+
+        moves = []
+        for shift in SHIFTS:
+            target_bit = shift(from_bit)
+            if target_bit & targets:
+                moves.append(divmod(target_bit.bit_length() - 1, COLS))
+
+        # Saltos do Leão, bloqueados por qualquer Rato no rio
+        if abs(rank) == 7:
+            for target_bit, target, path in JUMP_MASKS[position[0] * COLS + position[1]]:
+                if not path & self.rank_bb[1] and target_bit & targets:
+                    moves.append(target)
+
+        return moves
+
+    def generate_moves(self, side: int, buffer) -> int:
+        """Escreve todas as jogadas de um jogador, codificadas como inteiros, num buffer pré-alocado
+
+        As jogadas saem diretamente das máscaras, sem listas de tuplos, pela mesma ordem e com as
+        mesmas flags de Model.generate_moves.
+
+        Args:
+            side (int): jogador, 0 (Azul) ou 1 (Vermelho)
+            buffer (array): buffer array('H') criado com MVC.moves.new_move_buffer
+
+        Returns:
+            int: número de jogadas escritas no buffer
+        """
+        rank_bb = self.rank_bb
+        enemy = self.side_bb[1 - side]
+        occupied = self.side_bb[side] | enemy
+        free = (FULL & ~occupied) | (enemy & TRAPS[side])
+        not_den = ~OWN_DEN[side]
+        target_flags = TARGET_FLAGS[side]
+
+        # Peças inimigas que cada rank captura: todas as de rank menor ou igual (o Elefante não captura o Rato)
+        lower = [0] * 9
+        mask = 0
+        for rank in range(1, 9):
+            mask |= rank_bb[rank]
+            lower[rank] = mask & enemy
+        lower[8] &= ~rank_bb[1]
+
+        count = 0
+        for (row, col), piece in sorted(self.side_pieces[side].items()):
+            from_sq = row * COLS + col
+            rank = piece if piece > 0 else -piece
+            if rank == 1:
+                # O Rato só captura o Rato no mesmo terreno, e o Elefante apenas a partir de terra
+                if (1 << from_sq) & RIVER:
+                    targets = (free | (rank_bb[1] & RIVER & enemy)) & not_den
+                else:
+                    targets = (free | (((rank_bb[1] & ~RIVER) | rank_bb[8]) & enemy)) & not_den
+            else:
+                targets = (free | lower[rank]) & not_den & ~RIVER
+
+            base = from_sq * SQUARES
+            for to_sq, to_bit in STEPS[from_sq]:
+                if to_bit & targets:
+                    move = (base + to_sq) | target_flags[to_sq]
+                    if to_bit & occupied:
+                        move |= CAPTURE_FLAG
+                    buffer[count] = move
+                    count += 1
+
+            # Saltos do Leão, bloqueados por qualquer Rato no rio
+            if rank == 7:
+                for to_sq, to_bit, path in JUMP_SQUARES[from_sq]:
+                    if to_bit & targets and not path & rank_bb[1]:
+                        move = (base + to_sq) | target_flags[to_sq] | JUMP_FLAG
+                        if to_bit & occupied:
+                            move |= CAPTURE_FLAG
+                        buffer[count] = move
+                        count += 1
+        return count
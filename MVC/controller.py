@@ -1,29 +1,46 @@
 from MVC.model import Model, AI, RandomAI, NegamaxAI
+from MVC.mcts import MCTSAI
+from MVC.bitboard import BitboardModel
 from MVC.view import View
 import time
 import pygame as pg
 from assets.consts import Consts
 from MVC.save_manager import SaveManager
+from MVC.ponder import Ponderer
+from MVC.opening_book import OpeningBook
+from MVC.tablebase import Tablebases
 import numpy as np
 
 
 class Controller:
-    def __init__(self, is_pve: bool, ai_type: str = "minimax", depth: int = 4, blue_ai: tuple = None, red_ai: tuple = None, start_loop: bool = True):
+    def __init__(self, is_pve: bool, ai_type: str = "minimax", depth: int = 4, blue_ai: tuple = None, red_ai: tuple = None, start_loop: bool = True, backend: str = "array"):
         """Inicia o componente Controlador
 
         Args:
             is_pve (bool): deve o jogo usar lógica PvE ou PvP
             ai_type (str): tipo de IA a ser usada (default: "minimax")
-            depth (int): profundidade do algoritmo minimax (default: 4)
+            depth (int): profundidade máxima do algoritmo minimax (default: 4)
             blue_ai (tuple): configuração da IA para o jogador azul no modo IAxIA (default: None)
             red_ai (tuple): configuração da IA para o jogador vermelho no modo IAxIA (default: None)
             start_loop (bool): inicia o loop principal automaticamente (default: True)
+            backend (str): representação do tabuleiro no modelo, "array" ou "bitboard" (default: "array")
         """
-        self.model = Model()
+        self.backend = backend
+        self.model = BitboardModel() if backend == "bitboard" else Model()
         self.view = View()
         self.is_pve = is_pve
         self.ai_type = ai_type
         
+        # Livro de aberturas partilhado pelas IAs de pesquisa (None se o ficheiro não existir)
+        self.book = OpeningBook.load(Consts.OPENING_BOOK)
+        
+        # Tabelas de finais partilhadas pelas IAs de pesquisa (None se ainda não tiverem sido geradas)
+        self.tablebase = Tablebases.load(Consts.TABLEBASES)
+        
+        # Pondering: a IA do modo PvE pensa durante o turno do humano
+        self.ponderer = None
+        self.pondered_move = None
+        
         # Inicializa as IAs apropriadas
         if blue_ai is not None and red_ai is not None:  # Modo IAxIA
             self.blue_ai = self._create_ai(blue_ai)
@@ -35,11 +52,16 @@ class Controller:
             self.forbidden_move = None  # Movimento proibido após 3 repetições
         elif is_pve:
             if ai_type == "minimax":
-                self.ai = AI(self.model, depth)
+                self.ai = AI(self.model, depth, time_limit=Consts.AI_TIME_LIMIT, workers=Consts.AI_WORKERS)
             elif ai_type == "negamax":
-                self.ai = NegamaxAI(self.model, depth)
+                self.ai = NegamaxAI(self.model, depth, time_limit=Consts.AI_TIME_LIMIT, workers=Consts.AI_WORKERS)
             else:  # random
                 self.ai = RandomAI(self.model)
+            if not isinstance(self.ai, RandomAI):
+                self.ai.book = self.book
+                self.ai.tablebase = self.tablebase
+                if Consts.AI_PONDER:
+                    self.ponderer = Ponderer(self.ai)
             self.is_aixai = False
         else:
             self.is_aixai = False
@@ -54,22 +76,27 @@ class Controller:
         """Cria uma instância de IA baseada na configuração fornecida
         
         Args:
-            ai_config (tuple/str): Configuração da IA ("random" ou (tipo, profundidade))
+            ai_config (tuple/str): Configuração da IA ("random" ou (tipo, profundidade); no MCTS, ("mcts", segundos por jogada))
             
         Returns:
-            AI/NegamaxAI/RandomAI: Instância da IA criada
+            AI/NegamaxAI/MCTSAI/RandomAI: Instância da IA criada
         """
         if ai_config == "random":
             return RandomAI(self.model, seed=42)  # Usa semente fixa 42 para reprodutibilidade
         else:
             ai_type, depth = ai_config
             if ai_type == "minimax":
-                return AI(self.model, depth)
+                ai = AI(self.model, depth, time_limit=Consts.AI_TIME_LIMIT, workers=Consts.AI_WORKERS)
             elif ai_type == "negamax":
-                return NegamaxAI(self.model, depth)
+                ai = NegamaxAI(self.model, depth, time_limit=Consts.AI_TIME_LIMIT, workers=Consts.AI_WORKERS)
+            elif ai_type == "mcts":
+                ai = MCTSAI(self.model, time_limit=depth, workers=Consts.AI_WORKERS)
             else:
                 # Fallback para RandomAI em caso de tipo desconhecido
                 return RandomAI(self.model, seed=42)
+            ai.book = self.book     # As jogadas do livro são escolhidas ao acaso, pelos pesos, para variar os jogos
+            ai.tablebase = self.tablebase
+            return ai
     
     def main_loop(self):
         """Loop principal do jogo selecionar modo de jogo
@@ -98,7 +125,9 @@ class Controller:
         pg.display.flip()
 
         if turn == 0:
-            # turno para o jogador humano
+            # turno para o jogador humano, enquanto a IA pensa na resposta em segundo plano
+            if self.ponderer is not None:
+                self.ponderer.start()
             for event in pg.event.get():
                 ev_type = event.type
                 # Desenha o tabuleiro após cada evento para garantir que os movimentos possíveis sejam visíveis
@@ -118,8 +147,12 @@ class Controller:
             self.view.draw_board(self.model.game_board, self.model.last_move_coords)
             pg.display.flip()
             
-            # Obtém o melhor movimento da IA
-            best_move = self.ai.get_best_move()
+            # Obtém o melhor movimento da IA (já preparado se o humano fez a jogada prevista)
+            best_move, self.pondered_move = self.pondered_move, None
+            if best_move is None:
+                # A thread do pondering partilha as estruturas da IA: tem de estar parada (turn_logic_human chama stop())
+                assert self.ponderer is None or not self.ponderer.is_running()
+                best_move = self.ai.get_best_move()
             
             # Atualiza o temporizador após o processamento da IA
             self.view.draw_board(self.model.game_board, self.model.last_move_coords)
@@ -139,13 +172,9 @@ class Controller:
                                 if play_again_button.is_over(pg.mouse.get_pos()):
                                     self.reset_game()
                                 elif main_menu_button.is_over(pg.mouse.get_pos()):
-                                    pg.display.quit()
-                                    time.sleep(0.2)
-                                    from screens.main_menu import MainMenu
-                                    main_menu = MainMenu()
-                            if event == pg.QUIT:
-                                pg.quit()
-                                quit()
+                                    self.return_to_main_menu()
+                            if event.type == pg.QUIT:
+                                self.quit_game()
                 else:
                     self.model.switch_turn()
                     self.view.switch_turn(self.model.turn)
@@ -177,6 +206,8 @@ class Controller:
         """
         if self.model.is_choosing_current_move((row, col)):     # Verifica se o movimento selecionado está na lista de movimentos atuais
                         self.model.perform_move(self.model.selected_game_piece, (row, col))     # Executa o movimento no modelo
+                        if self.ponderer is not None:
+                            self.pondered_move = self.ponderer.stop()       # Para o pondering e guarda a resposta, se estiver pronta
                         self.view.draw_board(self.model.game_board, self.model.last_move_coords)     # Desenha o tabuleiro atualizado no ecrã usando o componente view
                         self.model.moves = []       # Reinicia a lista de movimentos atuais
                         self.model.selected_game_piece = None       # Reinicia a peça selecionada
@@ -191,13 +222,9 @@ class Controller:
                                             self.reset_game()
                                             
                                         elif main_menu_button.is_over(pg.mouse.get_pos()):
-                                            pg.display.quit()
-                                            time.sleep(0.2)
-                                            from screens.main_menu import MainMenu
-                                            main_menu = MainMenu()
-                                    if event == pg.QUIT:
-                                        pg.quit()
-                                        quit()
+                                            self.return_to_main_menu()
+                                    if event.type == pg.QUIT:
+                                        self.quit_game()
                         else:       # Se não houver vencedor
                             self.model.switch_turn()        # Muda o turno, de Azul para Vermelho e vice-versa
                             self.view.switch_turn(self.model.turn)      # Muda a mensagem de turno no componente view               
@@ -216,17 +243,13 @@ class Controller:
         """
         if event is pg.QUIT:
             # Processa clique no botão de sair do SO
-            pg.quit()
-            quit()
+            self.quit_game()
         
         elif event == pg.MOUSEBUTTONDOWN:
             mouse_loc = pg.mouse.get_pos() # Obtém posição do rato
             if self.view.close_button.is_over(mouse_loc):
                 # Processa clique no botão de sair do jogo
-                pg.display.quit()
-                time.sleep(0.2)
-                from screens.main_menu import MainMenu
-                main_menu = MainMenu()
+                self.return_to_main_menu()
             elif self.view.save_button.is_over(mouse_loc):
                 # Processa clique no botão Guardar
                 game_state = SaveManager.prepare_game_state(self)
@@ -268,9 +291,38 @@ class Controller:
         # Espera um segundo antes de continuar
         pg.time.wait(1000)
 
+    def shutdown_ais(self):
+        """Para o pondering e termina os processos das IAs (pesquisa paralela e MCTS)
+
+        Deve ser chamado sempre que o jogo deixa de usar as IAs atuais: ao reiniciar, ao voltar ao menu
+        principal e ao sair. Assim não ficam processos nem memória partilhada de jogos anteriores.
+        """
+        if self.ponderer is not None:
+            self.ponderer.stop()
+            self.pondered_move = None
+        for name in ("ai", "blue_ai", "red_ai"):
+            ai = getattr(self, name, None)
+            if hasattr(ai, "shutdown"):
+                ai.shutdown()
+
+    def return_to_main_menu(self):
+        """Termina as IAs, fecha o ecrã do jogo e volta ao menu principal"""
+        self.shutdown_ais()
+        pg.display.quit()
+        time.sleep(0.2)
+        from screens.main_menu import MainMenu
+        main_menu = MainMenu()
+
+    def quit_game(self):
+        """Termina as IAs e fecha o jogo"""
+        self.shutdown_ais()
+        pg.quit()
+        quit()
+
     def reset_game(self):
         """Reinicia o jogo
         """
+        self.shutdown_ais()
         self.model.reset()
         self.view.start_time = pg.time.get_ticks()  # Reinicia o temporizador usando pygame.time.get_ticks()
         self.view.last_update = 0
@@ -296,6 +348,8 @@ class Controller:
                 blue_ai_config = ("minimax", blue_ai_instance.max_depth)
             elif isinstance(blue_ai_instance, NegamaxAI):
                 blue_ai_config = ("negamax", blue_ai_instance.max_depth)
+            elif isinstance(blue_ai_instance, MCTSAI):
+                blue_ai_config = ("mcts", blue_ai_instance.time_limit)
                 
             if isinstance(red_ai_instance, RandomAI):
                 red_ai_config = "random"
@@ -303,10 +357,12 @@ class Controller:
                 red_ai_config = ("minimax", red_ai_instance.max_depth)
             elif isinstance(red_ai_instance, NegamaxAI):
                 red_ai_config = ("negamax", red_ai_instance.max_depth)
+            elif isinstance(red_ai_instance, MCTSAI):
+                red_ai_config = ("mcts", red_ai_instance.time_limit)
                 
             # Cria um novo jogo com as mesmas configurações
             from MVC.controller import Controller
-            new_controller = Controller(True, "aixai", blue_ai=blue_ai_config, red_ai=red_ai_config)
+            new_controller = Controller(True, "aixai", blue_ai=blue_ai_config, red_ai=red_ai_config, backend=self.backend)
         else:
             # Para outros modos, apenas reseta o jogo
             self.model.reset()
@@ -327,15 +383,11 @@ class Controller:
             # Processa eventos do pygame
             for event in pg.event.get():
                 if event.type == pg.QUIT:
-                    pg.quit()
-                    quit()
+                    self.quit_game()
                 elif event.type == pg.MOUSEBUTTONDOWN:
                     mouse_loc = pg.mouse.get_pos()
                     if self.view.close_button.is_over(mouse_loc):
-                        pg.display.quit()
-                        time.sleep(0.2)
-                        from screens.main_menu import MainMenu
-                        main_menu = MainMenu()
+                        self.return_to_main_menu()
                     elif self.view.stop_button.is_over(mouse_loc) and not self.view.is_paused:
                         self.view.is_paused = True
                         self.view.show_resume_button = True  # Mostra o botão resume quando pausa
@@ -358,6 +410,8 @@ class Controller:
             
             # Obtém e executa o melhor movimento
             best_move = current_ai.get_best_move()
+            # Estatísticas da pesquisa, mostradas ao lado do tabuleiro (a RandomAI não as tem)
+            self.view.search_stats[self.model.turn] = getattr(current_ai, 'stats', None)
             
             # Atualiza o temporizador após o processamento da IA
             self.view.draw_board(self.model.game_board, self.model.last_move_coords)
@@ -403,13 +457,9 @@ class Controller:
                                     if play_again_button.is_over(pg.mouse.get_pos()):
                                         self.reset_game()
                                     elif main_menu_button.is_over(pg.mouse.get_pos()):
-                                        pg.display.quit()
-                                        time.sleep(0.2)
-                                        from screens.main_menu import MainMenu
-                                        main_menu = MainMenu()
-                                if event == pg.QUIT:
-                                    pg.quit()
-                                    quit()
+                                        self.return_to_main_menu()
+                                if event.type == pg.QUIT:
+                                    self.quit_game()
                         break
                 
                 # Executa o movimento
@@ -493,7 +543,7 @@ class Controller:
             controller = Controller(False, start_loop=False)
         
         # Atualiza o estado do jogo na nova instância
-        controller.model.game_board = np.array(game_state['game_board'], dtype=int)
+        controller.model.set_board(np.array(game_state['game_board'], dtype=int), game_state['turn'])
         controller.model.turn = game_state['turn']
         controller.model.selected_game_piece = game_state['selected_game_piece']
         controller.model.moves = game_state['moves']
@@ -502,6 +552,11 @@ class Controller:
         controller.model.forbidden_move = game_state['forbidden_move']
         controller.model.move_history = game_state['move_history']
         controller.model.cycle_detected = game_state['cycle_detected']
+
+        # O histórico de repetições só é reposto se foi guardado com as mesmas chaves de Zobrist
+        if game_state.get('zobrist_key') == controller.model.zobrist_key:
+            controller.model.board_states = game_state['board_states']
+            controller.model.repeated_states_count = game_state['repeated_states_count']
         
         # Atualiza o tempo de jogo
         controller.view.elapsed_time = game_state['elapsed_time']
@@ -0,0 +1,832 @@
+from array import array
+import logging
+from assets.consts import Consts
+from MVC.move_ordering import MoveOrdering
+from MVC.transposition import TranspositionTable
+from MVC.tablebase import TABLEBASE_WIN
+from MVC.search_stats import SearchStats, SEARCH, WINNING_MOVE, BOOK, TABLEBASE
+from MVC.moves import (MOVE_MASK, CAPTURE_FLAG, DEN_FLAG, TRAP_FLAG, MAX_PLY, encode_move, decode_move,
+                       new_move_buffer)
+import random
+import time
+
+
+logger = logging.getLogger(__name__)
+
+# Valor de uma vitória para a pesquisa, menos a distância em plies desde a raiz até ao fim do jogo.
+# As vitórias encontradas pela pesquisa e as das tabelas de finais usam a mesma escala
+WIN_SCORE = TABLEBASE_WIN
+WIN_THRESHOLD = WIN_SCORE - 10000       # Valores acima deste limite (em módulo) são vitórias ou derrotas
+
+
+def is_win_score(score: float) -> bool:
+    """Verifica se um valor da pesquisa é uma vitória ou uma derrota"""
+    return abs(score) >= WIN_THRESHOLD
+
+
+class SearchAborted(Exception):
+    """Lançada dentro da pesquisa quando o orçamento de tempo ou de nós da jogada se esgota"""
+
+
+class Evaluator:
+    """Função de avaliação usada pelas IAs de pesquisa
+
+    Avalia posições do ponto de vista do vermelho (positivo = bom para o vermelho) e dá uma pontuação
+    heurística às jogadas para as ordenar na raiz. Guarda as avaliações numa cache indexada pela
+    chave de Zobrist da posição. Outra função de avaliação pode ser usada passando uma subclasse
+    ao construtor da IA.
+    """
+
+    def __init__(self):
+        # Cache para avaliações de posição
+        self.cache = {}
+
+        # Contadores de avaliações e da cache, lidos pelas SearchStats de cada jogada (nunca são zerados)
+        self.evaluations = 0
+        self.hits = 0
+        self.misses = 0
+
+        # Valores das peças (otimizados)
+        self.piece_values = {
+            1: 6,   # Rato
+            2: 3,   # Gato
+            3: 4,   # Cão
+            4: 5,   # Lobo
+            5: 6,   # Leopardo
+            6: 7,   # Tigre
+            7: 8,   # Leão
+            8: 15   # Elefante - Valor aumentado significativamente
+        }
+
+        # Posições das armadilhas
+        self.traps = [
+            (0, 2), (0, 4), (1, 3),  # Armadilhas vermelhas
+            (6, 1), (6, 3), (5, 2)   # Armadilhas azuis
+        ]
+
+        # Posições das tocas
+        self.dens = [(0, 3), (6, 2)]  # (vermelho, azul)
+
+    def clear(self) -> None:
+        """Apaga a cache de avaliações"""
+        self.cache.clear()
+
+    def evaluate_board(self, model) -> float:
+        """Avalia o estado atual do tabuleiro com uma função de avaliação otimizada
+
+        Args:
+            model (Model): modelo na posição a avaliar
+
+        Returns:
+            float: avaliação do ponto de vista do vermelho (inf se o vermelho ganhou, -inf se o azul ganhou)
+        """
+        # Verifica cache
+        self.evaluations += 1
+        board_key = model.zobrist_key
+        if board_key in self.cache:
+            self.hits += 1
+            return self.cache[board_key]
+            
+        self.misses += 1
+        
+        # Verifica se o jogo terminou
+        is_win, winner = model.is_win()
+        if is_win:
+            score = float('inf') if winner == 'Vermelho' else float('-inf')
+            self.cache[board_key] = score
+            return score
+        
+        score = 0
+
+        # 1. Avaliação de material (pesos iguais para ambos jogadores)
+        for side_pieces in model.side_pieces:
+            for (i, j), piece in side_pieces.items():
+                value = self.piece_values[abs(piece)]
+                if piece < 0:  # Peça vermelha
+                    score += value
+                else:  # Peça azul
+                    score -= value
+        
+        # 2. Avaliação de posição (equilibrada para ambos os jogadores)
+        closest_red_to_blue_den = float('inf')  # Distância da peça vermelha mais próxima ao covil azul
+        closest_blue_to_red_den = float('inf')  # Distância da peça azul mais próxima ao covil vermelho
+        
+        # Pontuação por proximidade ao covil adversário - equilibrada para ambos os jogadores
+        for side_pieces in model.side_pieces:
+            for (i, j), piece in side_pieces.items():
+                # Progresso em direção à toca adversária
+                if piece < 0:  # Peça vermelha
+                    dist_to_den = abs(i - self.dens[1][0]) + abs(j - self.dens[1][1])
+                    # Guarda a distância da peça mais próxima ao covil
+                    closest_red_to_blue_den = min(closest_red_to_blue_den, dist_to_den)
+                        
+                    # Pontuação progressiva baseada na proximidade
+                    proximity_score = (8 - dist_to_den) * 6.0
+                    score += proximity_score
+                        
+                    # Bônus adicional para peças muito próximas ao covil
+                    if dist_to_den <= 1:
+                        score += 500
+                    elif dist_to_den <= 2:
+                        score += 200
+                    elif dist_to_den <= 3:
+                        score += 120
+                    elif dist_to_den <= 4:
+                        score += 80
+                else:  # Peça azul
+                    dist_to_den = abs(i - self.dens[0][0]) + abs(j - self.dens[0][1])
+                    # Guarda a distância da peça mais próxima ao covil
+                    closest_blue_to_red_den = min(closest_blue_to_red_den, dist_to_den)
+                        
+                    # Pontuação progressiva baseada na proximidade (mesmo valor que o vermelho)
+                    proximity_score = (8 - dist_to_den) * 6.0
+                    score -= proximity_score
+                        
+                    # Bônus adicional para peças muito próximas ao covil (mesmo valor que o vermelho)
+                    if dist_to_den <= 1:
+                        score -= 500
+                    elif dist_to_den <= 2:
+                        score -= 200
+                    elif dist_to_den <= 3:
+                        score -= 120
+                    elif dist_to_den <= 4:
+                        score -= 80
+        
+        # Bônus para vantagem na corrida para os covis - equilibrado para ambos jogadores
+        if closest_red_to_blue_den < closest_blue_to_red_den:
+            race_advantage = closest_blue_to_red_den - closest_red_to_blue_den
+            score += race_advantage * 80
+        elif closest_blue_to_red_den < closest_red_to_blue_den:
+            race_advantage = closest_red_to_blue_den - closest_blue_to_red_den
+            score -= race_advantage * 80  # Mesmo valor que o vermelho
+            
+        # Armazena em cache e retorna
+        self.cache[board_key] = score
+        return score
+
+    def evaluate_move(self, model, move: int) -> float:
+        """Avalia um movimento específico (codificado) para ordenação (otimizada)
+
+        Args:
+            model (Model): modelo na posição em que a jogada é feita
+            move (int): jogada codificada (MVC.moves)
+
+        Returns:
+            float: pontuação heurística da jogada para quem joga (maior é melhor)
+        """
+        start, end = decode_move(move)
+        score = 0
+        piece = model.game_board[start[0], start[1]]
+        
+        # Movimento para o covil adversário - prioridade máxima absoluta para ambos os jogadores
+        if (model.turn == 0 and end == (0, 3)) or (model.turn == 1 and end == (6, 2)):
+            return float('inf')  # Prioridade igual para ambos
+        
+        # Movimento para uma célula adjacente ao covil adversário - equalizado para ambos jogadores
+        if model.turn == 0:  # Jogador azul
+            if end in [(0, 2), (0, 4), (1, 3)]:  # Células adjacentes ao covil vermelho
+                # Simula o movimento
+                temp_board = model.game_board.copy()
+                temp_board[end[0], end[1]] = temp_board[start[0], start[1]]
+                temp_board[start[0], start[1]] = 0
+                
+                # Verifica se a peça estaria segura nesta posição
+                is_safe = True
+                
+                # Como estamos em uma armadilha adversária, verificamos se há peças inimigas adjacentes
+                for dr, dc in Consts.DIRECTIONS:
+                    nr, nc = end[0] + dr, end[1] + dc
+                    if 0 <= nr < 7 and 0 <= nc < 6 and temp_board[nr, nc] < 0:  # Peça inimiga
+                        # Verifica se a peça inimiga pode capturar nossa peça
+                        if model.is_self_rank_higher(temp_board[nr, nc], temp_board[end[0], end[1]], (nr, nc), end):
+                            is_safe = False
+                            break
+                
+                if is_safe:
+                    return float('inf') * 0.995  # Prioridade extremamente alta
+                else:
+                    # Mesmo valor para ambos jogadores
+                    score += 50
+        else:  # Jogador vermelho
+            if end in [(6, 1), (6, 3), (5, 2)]:  # Células adjacentes ao covil azul
+                # Simula o movimento
+                temp_board = model.game_board.copy()
+                temp_board[end[0], end[1]] = temp_board[start[0], start[1]]
+                temp_board[start[0], start[1]] = 0
+                
+                # Verifica se a peça estaria segura nesta posição
+                is_safe = True
+                
+                # Como estamos em uma armadilha adversária, verificamos se há peças inimigas adjacentes
+                for dr, dc in Consts.DIRECTIONS:
+                    nr, nc = end[0] + dr, end[1] + dc
+                    if 0 <= nr < 7 and 0 <= nc < 6 and temp_board[nr, nc] > 0:  # Peça inimiga
+                        # Verifica se a peça inimiga pode capturar nossa peça
+                        if model.is_self_rank_higher(temp_board[nr, nc], temp_board[end[0], end[1]], (nr, nc), end):
+                            is_safe = False
+                            break
+                
+                if is_safe:
+                    return float('inf') * 0.995  # Prioridade extremamente alta
+                else:
+                    # Mesmo valor para ambos jogadores
+                    score += 50
+        
+        # Células a duas casas de distância do covil - equilibrado para ambos jogadores
+        covil_vermelho_proximidade2 = [(0, 1), (0, 5), (1, 2), (1, 4), (2, 3)]
+        covil_azul_proximidade2 = [(6, 0), (6, 4), (5, 1), (5, 3), (4, 2)]
+        
+        if model.turn == 0 and end in covil_vermelho_proximidade2:  # Jogador azul perto do covil vermelho
+            # Verifica se há um caminho livre até uma célula adjacente ao covil
+            has_path_to_den = False
+            for dr, dc in Consts.DIRECTIONS:
+                nr, nc = end[0] + dr, end[1] + dc
+                if (nr, nc) in [(0, 2), (0, 4), (1, 3)] and model.is_valid_move(end, (nr, nc)):
+                    has_path_to_den = True
+                    break
+            
+            if has_path_to_den:
+                score += 500  # Mesmo valor para ambos jogadores
+        elif model.turn == 1 and end in covil_azul_proximidade2:  # Jogador vermelho perto do covil azul
+            # Verifica se há um caminho livre até uma célula adjacente ao covil
+            has_path_to_den = False
+            for dr, dc in Consts.DIRECTIONS:
+                nr, nc = end[0] + dr, end[1] + dc
+                if (nr, nc) in [(6, 1), (6, 3), (5, 2)] and model.is_valid_move(end, (nr, nc)):
+                    has_path_to_den = True
+                    break
+            
+            if has_path_to_den:
+                score += 500  # Mesmo valor para ambos jogadores
+        
+        # Captura de peça - equilibrada para ambos jogadores
+        if model.game_board[end[0], end[1]] != 0:
+            captured_piece = abs(model.game_board[end[0], end[1]])
+            score += self.piece_values[captured_piece] * 2.0
+        
+        # Movimento em direção à toca adversária - equilibrado para ambos jogadores
+        if piece < 0:  # Peças vermelhas
+            dist_before = abs(start[0] - self.dens[1][0]) + abs(start[1] - self.dens[1][1])
+            dist_after = abs(end[0] - self.dens[1][0]) + abs(end[1] - self.dens[1][1])
+            if dist_after < dist_before:
+                score += 60 * (dist_before - dist_after)
+                # Bônus progressivo baseado na proximidade ao covil
+                score += (7 - dist_after) * 25
+                # Bônus extra para movimentos que aproximam a peça para 2 ou 3 células de distância do covil
+                if dist_after == 1:
+                    score += 250
+                elif dist_after == 2:
+                    score += 150
+                elif dist_after == 3:
+                    score += 100
+                elif dist_after == 4:
+                    score += 70
+            # Penalidade para movimentos que se afastam do covil
+            elif dist_after > dist_before:
+                score -= 50 * (dist_after - dist_before)
+        else:  # Peças azuis - valores iguais ao vermelho
+            dist_before = abs(start[0] - self.dens[0][0]) + abs(start[1] - self.dens[0][1])
+            dist_after = abs(end[0] - self.dens[0][0]) + abs(end[1] - self.dens[0][1])
+            if dist_after < dist_before:
+                score += 60 * (dist_before - dist_after)  # Mesmo valor que o vermelho
+                # Bônus progressivo baseado na proximidade ao covil
+                score += (7 - dist_after) * 25  # Mesmo valor que o vermelho
+                # Bônus extra para movimentos que aproximam a peça para 2 ou 3 células de distância do covil
+                if dist_after == 1:
+                    score += 250  # Mesmo valor que o vermelho
+                elif dist_after == 2:
+                    score += 150  # Mesmo valor que o vermelho
+                elif dist_after == 3:
+                    score += 100  # Mesmo valor que o vermelho
+                elif dist_after == 4:
+                    score += 70  # Mesmo valor que o vermelho
+            # Penalidade para movimentos que se afastam do covil
+            elif dist_after > dist_before:
+                score -= 50 * (dist_after - dist_before)  # Mesmo valor que o vermelho
+        
+        # Movimento para o centro (novo)
+        center_positions = [(3, 2), (3, 3)]
+        if end in center_positions:
+            score += 4  # Ligeiro Aumento
+        
+        # Movimento que protege peças valiosas (novo)
+        if abs(piece) >= 6:  # Tigre, Leão e Elefante
+            if model.is_piece_safe_in_trap(end, piece):
+                if abs(piece) == 8:  # Se for o Elefante
+                    score += 20  # Bônus muito maior para proteger o elefante
+                else:
+                    score += 7  # Mantém o bônus original para outras peças valiosas
+            
+            # Verifica se há aliados próximos para proteção
+            allies_nearby = 0
+            for dr, dc in Consts.DIRECTIONS:
+                nr, nc = end[0] + dr, end[1] + dc
+                if (0 <= nr < 7 and 0 <= nc < 6):
+                    nearby_piece = model.game_board[nr, nc]
+                    if (piece < 0 and nearby_piece < 0) or (piece > 0 and nearby_piece > 0):  # Se for aliado
+                        allies_nearby += 1
+            
+            if abs(piece) == 8:  # Se for o Elefante
+                score += allies_nearby * 15  # Bônus significativo por ter aliados próximos
+            else:
+                score += allies_nearby * 5  # Bônus menor para outras peças valiosas
+            
+            # Penalidade extra para mover o elefante para posições perigosas
+            if abs(piece) == 8:
+                enemies_nearby = 0
+                for dr, dc in Consts.DIRECTIONS:
+                    nr, nc = end[0] + dr, end[1] + dc
+                    if (0 <= nr < 7 and 0 <= nc < 6):
+                        nearby_piece = model.game_board[nr, nc]
+                        if (piece < 0 and nearby_piece > 0) or (piece > 0 and nearby_piece < 0):  # Se for inimigo
+                            if abs(nearby_piece) == 1:  # Se for um rato
+                                enemies_nearby += 3  # Penalidade extra por ratos próximos
+                            else:
+                                enemies_nearby += 1
+                
+                if enemies_nearby > allies_nearby:
+                    score -= (enemies_nearby - allies_nearby) * 25  # Penalidade significativa por ter mais inimigos que aliados
+        
+        # Movimento que ameaça peças valiosas (novo)
+        for dir in Consts.DIRECTIONS:
+            threat_pos = (end[0] + dir[0], end[1] + dir[1])
+            if (0 <= threat_pos[0] < 7 and 0 <= threat_pos[1] < 6):
+                threat_piece = model.game_board[threat_pos[0], threat_pos[1]]
+                if threat_piece != 0 and abs(threat_piece) >= 6:
+                    if (piece < 0 and threat_piece > 0) or (piece > 0 and threat_piece < 0):
+                        if model.is_self_rank_higher(piece, threat_piece, end, threat_pos):
+                            score += 8  # Ligeiro Aumento
+        
+        return score
+
+
+class SearchEngine:
+    """Núcleo comum das IAs de pesquisa (Minimax, Negamax, ...)
+
+    Junta tudo o que não depende do algoritmo: geração e ordenação das jogadas, avaliação (um Evaluator
+    substituível), tabela de transposição, ordenação dinâmica, orçamento de tempo e de nós, aprofundamento
+    iterativo, pesquisa paralela, atalho das jogadas vencedoras e escolha de uma jogada alternativa.
+
+    Cada algoritmo é uma subclasse que implementa search_root e search_root_move. Os valores devolvidos
+    por search_root são do ponto de vista de quem joga, a menos que a subclasse defina
+    side_relative = False (valores do ponto de vista do vermelho, como no Minimax).
+    """
+
+    side_relative = True
+
+    def __init__(self, model, depth: int = 4, time_limit: float = None, node_limit: int = None,
+                 null_move: bool = False, lmr: bool = False, workers: int = 1, evaluator: Evaluator = None):
+        """
+        Args:
+            model (Model): modelo do jogo
+            depth (int): profundidade máxima do aprofundamento iterativo (default: 4)
+            time_limit (float): segundos por jogada (default: None, sem limite)
+            node_limit (int): nós por jogada (default: None, sem limite)
+            null_move (bool): usa null-move pruning (default: False)
+            lmr (bool): usa late-move reductions (default: False)
+            workers (int): processos da pesquisa paralela na raiz, 1 para não a usar (default: 1)
+            evaluator (Evaluator): função de avaliação (default: None, usa a Evaluator)
+        """
+        self.model = model
+        self.max_depth = depth  # Profundidade configurável (máxima do aprofundamento iterativo)
+
+        # Orçamento por jogada: segundos e/ou nós pesquisados (None = sem limite)
+        self.time_limit = time_limit
+        self.node_limit = node_limit
+        self.nodes = 0
+        self.depth_nodes = []
+        self.deadline = None
+        self.completed_depth = 0
+        self.previous_score = None     # Valor da última iteração completa
+        self.stop_event = None         # threading.Event que interrompe a pesquisa (usado pelo pondering)
+
+        # Avaliação das posições e das jogadas, com a sua cache
+        self.evaluator = evaluator if evaluator is not None else Evaluator()
+
+        # Limite de movimentos para poda
+        self.move_limit = 20  # Limita o número de movimentos avaliados por nó
+
+        # Quiescência: nós que cada folha pode expandir com capturas e ameaças (0 desliga)
+        self.quiescence_limit = 64
+        self.quiescence_nodes = 0
+
+        # Janela usada nas pesquisas de teste do null move e das jogadas reduzidas
+        self.null_window = 1e-3
+
+        # Null-move pruning: desligado perto das tocas e quando quem joga tem poucas peças
+        self.null_move = null_move
+        self.null_move_reduction = 2
+        self.null_move_min_pieces = 3
+
+        # Late-move reductions: jogadas calmas ordenadas tarde perdem um nível de profundidade
+        self.lmr = lmr
+        self.lmr_min_depth = 3
+        self.lmr_min_index = 3
+
+        # Um buffer de jogadas pré-alocado por nível da pesquisa
+        self.move_buffers = [new_move_buffer() for _ in range(MAX_PLY)]
+
+        # Resultados da pesquisa (profundidade, valor, limite e melhor jogada), mantidos entre jogadas
+        self.tt = TranspositionTable()
+
+        # Killer moves, histórico e countermoves para ordenar as jogadas fora da raiz
+        self.ordering = MoveOrdering()
+
+        # Livro de aberturas consultado antes de pesquisar (None = sem livro)
+        self.book = None
+        self.book_random = True     # Escolhe as jogadas do livro ao acaso, com probabilidade proporcional ao peso
+
+        # Tabelas de finais (Tablebases) consultadas na raiz e dentro da pesquisa (None = sem tabelas)
+        self.tablebase = None
+
+        # Estatísticas da última chamada a get_best_move, escritas também no log se log_stats for True
+        self.stats = SearchStats()
+        self.log_stats = False
+
+        # Pesquisa paralela na raiz com vários processos (1 = pesquisa num só processo)
+        self.parallel = None
+        if workers > 1:
+            from MVC.parallel_search import ParallelSearch
+            self.parallel = ParallelSearch(self, workers)
+
+    def shutdown(self) -> None:
+        """Termina os processos da pesquisa paralela, se existirem (voltam a ser criados na pesquisa seguinte)"""
+        if self.parallel is not None:
+            self.parallel.shutdown()
+
+    def evaluate_board(self, ply: int = 0) -> float:
+        """Avalia a posição atual do modelo, do ponto de vista do vermelho
+
+        As posições ganhas valem WIN_SCORE - ply (para o vencedor), por isso as vitórias mais
+        rápidas valem mais e são comparáveis com as das tabelas de finais.
+
+        Args:
+            ply (int): distância à raiz da pesquisa (default: 0)
+        """
+        score = self.evaluator.evaluate_board(self.model)
+        if score == float('inf'):
+            return WIN_SCORE - ply
+        if score == float('-inf'):
+            return ply - WIN_SCORE
+        return score
+
+    def probe_tt(self, key: int, ply: int):
+        """Consulta a tabela de transposição, com as vitórias guardadas convertidas para a distância à raiz
+
+        Args:
+            key (int): chave de Zobrist da posição
+            ply (int): distância à raiz da pesquisa
+
+        Returns:
+            tuple | None: entrada da tabela (ver TranspositionTable.probe) ou None se não existir
+        """
+        entry = self.tt.probe(key)
+        if entry is not None and is_win_score(entry[2]):
+            score = entry[2] - ply if entry[2] > 0 else entry[2] + ply
+            entry = entry[:2] + (score,) + entry[3:]
+        return entry
+
+    def store_tt(self, key: int, depth: int, score: float, bound: int, move, ply: int) -> None:
+        """Guarda um resultado na tabela de transposição, com as vitórias contadas a partir da posição
+
+        Assim uma vitória encontrada a uma distância da raiz continua certa quando a mesma posição
+        aparece a outra distância.
+
+        Args:
+            key (int): chave de Zobrist da posição
+            depth (int): profundidade pesquisada a partir da posição
+            score (float): valor encontrado
+            bound (int): EXACT, LOWER ou UPPER
+            move (int | None): melhor jogada codificada
+            ply (int): distância à raiz da pesquisa
+        """
+        if is_win_score(score):
+            score = score + ply if score > 0 else score - ply
+        self.tt.store(key, depth, score, bound, move)
+
+    def evaluate_move(self, move: int) -> float:
+        """Avalia uma jogada codificada da posição atual, para ordenação"""
+        return self.evaluator.evaluate_move(self.model, move)
+
+    def leaf_noise(self) -> float:
+        """Pequeno ruído aleatório somado às folhas quando há ciclos, para quebrar empates e evitar loops"""
+        return random.uniform(-self.model.random_factor, self.model.random_factor) * 100
+
+    def repetition_penalty(self) -> float:
+        """Penalidade de uma jogada que leva a uma posição repetida (proporcional ao fator de aleatoriedade)"""
+        return self.model.random_factor * 50
+
+    def get_all_possible_moves(self, is_ai_turn: bool, ply: int = 0, tt_move: int = None):
+        """Retorna todas as possíveis jogadas (codificadas) para o jogador atual (otimizada)
+
+        As jogadas são geradas e ordenadas no buffer do nível ply da pesquisa, sem criar tuplos.
+        Só a raiz usa o evaluate_move; os outros nós usam a ordenação dinâmica de MoveOrdering.
+
+        Args:
+            is_ai_turn (bool): True para as jogadas do vermelho, False para as do azul
+            ply (int): distância à raiz da pesquisa (default: 0)
+            tt_move (int): jogada da tabela de transposição, ordenada primeiro (default: None)
+
+        Returns:
+            memoryview: as melhores move_limit jogadas codificadas, por ordem
+        """
+        buffer = self.move_buffers[ply]
+        side = 1 if is_ai_turn else 0
+        count = self.model.generate_moves(side, buffer)
+        
+        # Ordena e limita o número de movimentos
+        if ply == 0:
+            moves = sorted(buffer[:count], key=self.evaluate_move, reverse=is_ai_turn)
+            if tt_move in moves:
+                moves.remove(tt_move)
+                moves.insert(0, tt_move)
+            buffer[:count] = array('H', moves)
+        else:
+            self.ordering.sort(buffer, count, ply, side, self.model, tt_move)
+        return memoryview(buffer)[:min(count, self.move_limit)]  # Retorna apenas os melhores movimentos
+
+    def get_best_move(self) -> tuple:
+        """Retorna a melhor jogada para a IA
+
+        As estatísticas da chamada ficam depois em self.stats (e no log, se log_stats for True).
+        """
+        self.stats = SearchStats()
+        evaluator = self.evaluator
+        evaluations, hits, misses = evaluator.evaluations, evaluator.hits, evaluator.misses
+        start_time = time.perf_counter()
+
+        best_move = self.choose_move()
+
+        stats = self.stats
+        stats.elapsed = time.perf_counter() - start_time
+        stats.evaluations = evaluator.evaluations - evaluations
+        stats.cache_hits = evaluator.hits - hits
+        stats.cache_misses = evaluator.misses - misses
+        if stats.source == SEARCH:
+            stats.nodes = self.nodes
+            stats.completed_depth = self.completed_depth
+        if self.log_stats:
+            logger.info("%s %s: %s", type(self).__name__, best_move, stats)
+        return best_move
+
+    def choose_move(self) -> tuple:
+        """Escolhe a jogada: jogada vencedora, livro, tabelas de finais ou pesquisa (usado por get_best_move)"""
+        # Verifica primeiro se há um movimento vitorioso direto
+        all_moves = self.get_all_possible_moves(self.model.turn == 1)
+
+        # Remove o movimento proibido da lista, se existir
+        if self.model.forbidden_move and self.model.cycle_detected:
+            forbidden = encode_move(*self.model.forbidden_move)
+            all_moves = [move for move in all_moves if move & MOVE_MASK != forbidden]
+
+        # Se depois de remover o movimento proibido não sobrar nenhum movimento,
+        # retornamos todos os movimentos novamente
+        if not all_moves:
+            all_moves = self.get_all_possible_moves(self.model.turn == 1)
+
+        for move in all_moves:
+            start, end = decode_move(move)
+            # Verifica se pode entrar no covil adversário, ou se o movimento é vitorioso
+            if move & DEN_FLAG or self.model.is_winning_move(start, end):
+                self.stats.source = WINNING_MOVE
+                return (start, end)
+
+        # Nas posições do livro de aberturas, joga a jogada do livro sem pesquisar
+        if self.book is not None:
+            book_move = self.book.choose(self.model.zobrist_key, self.book_random)
+            if book_move is not None:
+                start, end = decode_move(book_move)
+                if (start in self.model.side_pieces[self.model.turn] and self.model.is_valid_move(start, end)
+                        and (start, end) != self.model.forbidden_move):
+                    self.stats.source = BOOK
+                    return (start, end)
+
+        # Nos finais ganhos ou perdidos das tabelas, joga a jogada perfeita sem pesquisar
+        if self.tablebase is not None:
+            tablebase_move = self.get_tablebase_move()
+            if tablebase_move is not None:
+                self.stats.source = TABLEBASE
+                return tablebase_move
+
+        # Se não houver movimento vitorioso, continua com a lógica normal
+        self.evaluator.clear()
+        self.tt.new_search()
+        self.ordering.new_search()
+
+        # Adiciona um pouco de aleatoriedade para evitar ficar preso em padrões
+        add_noise = self.model.cycle_detected
+
+        def search(depth):
+            if self.parallel is not None and depth >= self.parallel.min_depth:
+                score, move = self.parallel.search(depth, add_noise)
+                # A pesquisa paralela devolve sempre valores do ponto de vista de quem joga
+                if not self.side_relative and self.model.turn == 0:
+                    score = -score
+                return score, move
+            return self.search_root(depth, add_noise)
+
+        if self.parallel is not None:
+            self.parallel.new_search()
+        best_move = self.iterative_deepening(search)
+        if best_move is not None:
+            best_move = decode_move(best_move)  # Formato usado pela View e pelo SaveManager
+
+        # Se o melhor movimento for o movimento proibido, escolhe um alternativo
+        if self.model.forbidden_move and best_move == self.model.forbidden_move and self.model.cycle_detected:
+            return self.get_alternative_move()
+
+        return best_move
+
+    def search_root(self, depth: int, add_noise: bool) -> tuple:
+        """Pesquisa a raiz com a profundidade dada (implementado por cada algoritmo)
+
+        Args:
+            depth (int): profundidade da iteração
+            add_noise (bool): adiciona ruído às avaliações das folhas
+
+        Returns:
+            tuple: (valor, melhor jogada codificada)
+        """
+        raise NotImplementedError
+
+    def search_root_move(self, move: int, depth: int, alpha: float, add_noise: bool = False) -> float:
+        """Pesquisa uma única jogada da raiz, usado pela pesquisa paralela (implementado por cada algoritmo)
+
+        Args:
+            move (int): jogada codificada
+            depth (int): profundidade da iteração
+            alpha (float): melhor valor já conhecido na raiz, do ponto de vista de quem joga
+            add_noise (bool): adiciona ruído às avaliações das folhas (default: False)
+
+        Returns:
+            float: valor da jogada do ponto de vista de quem joga (um limite superior se não passar alfa)
+        """
+        raise NotImplementedError
+
+    def tablebase_score(self, side: int, ply: int):
+        """Valor exato da posição atual nas tabelas de finais, para a pesquisa
+
+        Só as vitórias e as derrotas são usadas; nos empates das tabelas a pesquisa continua com a
+        avaliação normal, que ainda pode aproveitar os erros do adversário.
+
+        Args:
+            side (int): jogador a jogar, 0 (Azul) ou 1 (Vermelho)
+            ply (int): distância à raiz, somada à distância ao fim para preferir as vitórias mais rápidas
+
+        Returns:
+            float | None: valor do ponto de vista do vermelho, ou None fora das tabelas ou num empate
+        """
+        if self.tablebase is None:
+            return None
+        distance = self.tablebase.probe(self.model, side)
+        if not distance:
+            return None
+        score = WIN_SCORE - ply - distance
+        if distance % 2 == 0:
+            score = -score      # Quem joga perde
+        return score if side == 1 else -score
+
+    def get_tablebase_move(self):
+        """Escolhe a jogada da posição atual pelas tabelas de finais
+
+        Numa posição ganha escolhe a vitória mais rápida e numa perdida a derrota mais longa.
+
+        Returns:
+            tuple | None: jogada ((linha, coluna), (linha, coluna)), ou None se a posição não estiver
+            nas tabelas ou for um empate
+        """
+        side = self.model.turn
+        if not self.tablebase.probe(self.model, side):
+            return None
+
+        forbidden = None
+        if self.model.forbidden_move and self.model.cycle_detected:
+            forbidden = encode_move(*self.model.forbidden_move)
+        buffer = self.move_buffers[0]
+        count = self.model.generate_moves(side, buffer)
+
+        best_move, best_rank = None, None
+        for move in buffer[:count]:
+            if move & MOVE_MASK == forbidden:
+                continue
+            start, end = decode_move(move)
+            self.model.make_move(start, end)
+            finished = self.model.is_win()[0]
+            distance = None if finished else self.tablebase.probe(self.model, 1 - side)
+            self.model.unmake_move()
+
+            # Primeiro as vitórias imediatas, depois as posições perdidas do adversário (as mais curtas),
+            # os empates (ou posições fora das tabelas) e por fim as posições ganhas do adversário (as mais longas)
+            if finished:
+                rank = (3, 0)
+            elif not distance:
+                rank = (1, 0)
+            elif distance % 2 == 0:
+                rank = (2, -distance)
+            else:
+                rank = (0, distance)
+            if best_rank is None or rank > best_rank:
+                best_move, best_rank = (start, end), rank
+        return best_move
+
+    def can_try_null_move(self, side: int, depth: int, ply: int) -> bool:
+        """Verifica se o null-move pruning pode ser usado neste nó
+
+        Nunca na raiz, nem logo a seguir a outro null move, nem com poucas peças ou com
+        alguma peça perto de uma toca, onde passar a vez pode ser mesmo a pior jogada.
+        """
+        return (self.null_move and ply > 0 and depth > self.null_move_reduction
+                and self.ordering.played[ply - 1] != 0
+                and len(self.model.side_pieces[side]) >= self.null_move_min_pieces
+                and not self.model.is_den_threatened())
+
+    def is_reducible(self, move: int, index: int, depth: int, bound: float) -> bool:
+        """Verifica se uma jogada pode ser pesquisada com profundidade reduzida (late-move reduction)
+
+        Args:
+            move (int): jogada codificada
+            index (int): posição da jogada na lista ordenada
+            depth (int): profundidade restante do nó
+            bound (float): limite da janela usado no teste (tem de ser finito)
+        """
+        return (self.lmr and depth >= self.lmr_min_depth and index >= self.lmr_min_index
+                and not move & (CAPTURE_FLAG | DEN_FLAG | TRAP_FLAG)
+                and bound not in (float('inf'), float('-inf')))
+
+    def is_out_of_budget(self) -> bool:
+        """Verifica se a pesquisa atual já gastou o orçamento de nós ou de tempo, ou se foi mandada parar"""
+        if self.node_limit is not None and self.nodes >= self.node_limit:
+            return True
+        # O relógio e o pedido de paragem só são consultados de 256 em 256 nós
+        if self.nodes & 255:
+            return False
+        if self.stop_event is not None and self.stop_event.is_set():
+            return True
+        return self.deadline is not None and time.perf_counter() >= self.deadline
+
+    def iterative_deepening(self, search):
+        """Pesquisa com profundidade crescente, até max_depth ou até se esgotar o orçamento da jogada
+
+        A tabela de transposição guarda a variante principal de cada iteração, que é pesquisada
+        primeiro na iteração seguinte.
+
+        Args:
+            search (callable): pesquisa a raiz com a profundidade dada e devolve (valor, jogada)
+
+        Returns:
+            int | None: melhor jogada codificada da iteração completa mais profunda
+        """
+        self.nodes = 0
+        self.depth_nodes = []   # Nós pesquisados em cada iteração completa
+        self.completed_depth = 0
+        self.deadline = time.perf_counter() + self.time_limit if self.time_limit is not None else None
+        undo_depth = len(self.model.undo_stack)
+        
+        best_move = None
+        for depth in range(1, self.max_depth + 1):
+            nodes_before = self.nodes
+            iteration_start = time.perf_counter()
+            try:
+                score, move = search(depth)
+            except SearchAborted:
+                # Desfaz as jogadas que ficaram a meio da pesquisa interrompida
+                while len(self.model.undo_stack) > undo_depth:
+                    self.model.unmake_move()
+                break
+            best_move = move
+            self.completed_depth = depth
+            self.depth_nodes.append(self.nodes - nodes_before)
+            self.stats.iteration_times.append(time.perf_counter() - iteration_start)
+            self.previous_score = score
+            if self.deadline is not None and time.perf_counter() >= self.deadline:
+                break
+        return best_move
+
+    def get_alternative_move(self) -> tuple:
+        """Retorna um movimento alternativo quando o melhor movimento está proibido, priorizando movimentos em direção ao covil"""
+        # Obtém todas as jogadas possíveis
+        possible_moves = []
+        for pos in sorted(self.model.side_pieces[self.model.turn]):
+            for move in self.model.get_possible_moves(pos):
+                possible_moves.append((pos, move))
+        
+        # Remove o movimento proibido da lista
+        if self.model.forbidden_move:
+            if self.model.forbidden_move in possible_moves:
+                possible_moves.remove(self.model.forbidden_move)
+        
+        # Se não houver movimentos alternativos, retorna None
+        if not possible_moves:
+            return None
+        
+        # Verifica se algum movimento leva diretamente ao covil
+        for start, end in possible_moves:
+            if (self.model.turn == 0 and end == (0, 3)) or (self.model.turn == 1 and end == (6, 2)):
+                return (start, end)
+        
+        # Avalia e ordena os movimentos
+        scored_moves = [(self.evaluate_move(encode_move(start, end)), (start, end)) for start, end in possible_moves]
+        scored_moves.sort(reverse=True)  # Ordena por pontuação, do maior para o menor
+        
+        # Retorna o melhor movimento alternativo
+        return scored_moves[0][1]
@@ -0,0 +1,322 @@
+import math
+import time
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from MVC.tables import SQUARES
+from MVC.engine import SearchEngine, Evaluator
+from MVC.batch_movegen import sample_moves_batch
+from MVC.moves import MOVE_MASK, CAPTURE_FLAG, DEN_FLAG, ENEMY_DEN, encode_move, decode_move
+
+
+DEFAULT_ITERATIONS = 1000   # Iterações por jogada quando não é dado nenhum orçamento
+
+# Opções da IA copiadas para as IAs dos processos
+MCTS_OPTIONS = ("exploration", "rollout_batch", "leaf_batch", "rollout_depth", "capture_weight")
+
+
+def _search_tree(model, options: dict, iterations: int, deadline: float, seed: int) -> dict:
+    """Constrói uma árvore independente num processo da pool (paralelização na raiz)
+
+    Args:
+        model (Model): cópia do modelo na posição da raiz
+        options (dict): opções da IA principal (MCTS_OPTIONS)
+        iterations (int | None): iterações deste processo
+        deadline (float | None): fim do orçamento de tempo, em time.time()
+        seed (int): semente dos rollouts deste processo
+
+    Returns:
+        dict: jogada codificada -> (visitas, soma dos resultados) dos filhos da raiz
+    """
+    engine = MCTSAI(model, iterations=iterations, seed=seed)
+    for name, value in options.items():
+        setattr(engine, name, value)
+    # O relógio perf_counter de cada processo tem uma origem diferente; o prazo viaja em time.time()
+    engine.deadline = time.perf_counter() + deadline - time.time() if deadline is not None else None
+    return engine.search_tree()
+
+
+class Node:
+    """Nó da árvore do MCTS: a posição a que se chega com a jogada move a partir do nó pai"""
+
+    __slots__ = ("move", "parent", "children", "untried", "visits", "reward")
+
+    def __init__(self, move: int = None, parent=None):
+        self.move = move
+        self.parent = parent
+        self.children = []
+        self.untried = None     # Jogadas ainda sem nó filho (None = posição ainda não expandida)
+        self.visits = 0
+        self.reward = 0.0       # Soma dos resultados, do ponto de vista de quem fez a jogada move
+
+
+class MCTSAI(SearchEngine):
+    """IA Monte Carlo Tree Search (UCT) com rollouts em lote
+
+    Cada iteração desce a árvore pela fórmula UCT, acrescenta um nó e joga rollout_batch jogos
+    aleatórios a partir dele de uma só vez, com a geração de jogadas vetorizada de batch_movegen.
+    Os rollouts preferem capturas e entram sempre na toca quando podem; os que passam de
+    rollout_depth jogadas são decididos pelo material. No fim joga a jogada mais visitada da raiz.
+
+    O orçamento é em segundos (time_limit) e/ou em iterações. Com workers > 1, cada processo
+    constrói a sua árvore e as visitas dos filhos da raiz são somadas (paralelização na raiz).
+    O atalho das jogadas vencedoras, o livro de aberturas e as tabelas de finais são os de SearchEngine.
+    """
+
+    def __init__(self, model, time_limit: float = None, iterations: int = None, workers: int = 1,
+                 seed: int = None, evaluator: Evaluator = None):
+        """
+        Args:
+            model (Model): modelo do jogo
+            time_limit (float): segundos por jogada (default: None, sem limite)
+            iterations (int): iterações por jogada (default: None, sem limite; DEFAULT_ITERATIONS se
+                também não houver limite de tempo)
+            workers (int): processos que constroem árvores em paralelo (default: 1)
+            seed (int): semente dos rollouts, para reprodutibilidade (default: None)
+            evaluator (Evaluator): dá os valores das peças usados nos rollouts interrompidos (default: None)
+        """
+        super().__init__(model, 1, time_limit, evaluator=evaluator)
+        self.iterations = iterations
+        self.workers = workers
+        self.executor = None
+        self.rng = np.random.default_rng(seed)
+
+        self.exploration = 1.4          # Constante de exploração da fórmula UCT
+        self.rollout_batch = 8          # Jogos aleatórios por iteração
+        self.leaf_batch = 16            # Folhas cujos rollouts são jogados no mesmo lote
+        self.rollout_depth = 40         # Jogadas de cada rollout antes de decidir pelo material
+        self.capture_weight = 4.0       # Peso das capturas na escolha das jogadas dos rollouts
+
+        # Valores das peças do Evaluator, indexados pelo rank, para decidir os rollouts interrompidos
+        self.piece_values = np.zeros(9)
+        for rank, value in self.evaluator.piece_values.items():
+            self.piece_values[rank] = value
+
+        self.root_stats = {}            # Jogada da raiz -> (visitas, soma dos resultados) da última pesquisa
+
+    def shutdown(self) -> None:
+        """Termina os processos da pool, se existirem"""
+        super().shutdown()
+        if self.executor is not None:
+            self.executor.shutdown(wait=True, cancel_futures=True)
+            self.executor = None
+
+    def iterative_deepening(self, search):
+        """Substitui o aprofundamento iterativo: corre o MCTS dentro do orçamento da jogada
+
+        Args:
+            search (callable): ignorado (o MCTS não pesquisa por profundidades)
+
+        Returns:
+            int | None: jogada codificada mais visitada da raiz
+        """
+        self.nodes = 0
+        self.depth_nodes = []
+        self.completed_depth = 0
+        self.deadline = time.perf_counter() + self.time_limit if self.time_limit is not None else None
+        iterations = self.iterations
+        if iterations is None and self.time_limit is None:
+            iterations = DEFAULT_ITERATIONS
+
+        if self.workers > 1:
+            if self.executor is None:
+                self.executor = ProcessPoolExecutor(self.workers)
+            options = {name: getattr(self, name) for name in MCTS_OPTIONS}
+            share = -(-iterations // self.workers) if iterations is not None else None
+            deadline = time.time() + self.time_limit if self.time_limit is not None else None
+            seeds = self.rng.integers(1 << 31, size=self.workers)
+            futures = [self.executor.submit(_search_tree, self.model, options, share, deadline, int(seed))
+                       for seed in seeds]
+            self.root_stats = {}
+            for future in futures:
+                for move, (visits, reward) in future.result().items():
+                    total = self.root_stats.get(move, (0, 0.0))
+                    self.root_stats[move] = (total[0] + visits, total[1] + reward)
+        else:
+            saved_iterations = self.iterations
+            self.iterations = iterations
+            try:
+                self.root_stats = self.search_tree()
+            finally:
+                self.iterations = saved_iterations
+
+        if not self.root_stats:
+            return None
+        self.completed_depth = 1
+        best_move = max(self.root_stats, key=lambda move: self.root_stats[move])
+        visits, reward = self.root_stats[best_move]
+        self.previous_score = reward / visits
+        return best_move
+
+    def search_tree(self) -> dict:
+        """Constrói a árvore a partir da posição atual do modelo até se esgotar o orçamento
+
+        Em cada passo desce leaf_batch vezes pela árvore e joga os rollouts de todas as folhas num
+        só lote. As visitas são contadas logo na descida (virtual loss), por isso as descidas do
+        mesmo passo espalham-se por folhas diferentes.
+
+        Returns:
+            dict: jogada codificada -> (visitas, soma dos resultados) dos filhos da raiz
+        """
+        model = self.model
+        root_side = model.turn
+        root = Node()
+        batch = self.rollout_batch
+        iterations = 0
+        while True:
+            if self.iterations is not None and iterations >= self.iterations:
+                break
+            if iterations > 0 and self.is_out_of_time():
+                break
+            leaves = self.leaf_batch
+            if self.iterations is not None:
+                leaves = min(leaves, self.iterations - iterations)
+            iterations += leaves
+
+            paths, rewards, boards, sides = [], [], [], []
+            for _ in range(leaves):
+                path, side, winner = self.descend(root, root_side)
+                paths.append(path)
+                if winner is None:
+                    rewards.append(None)
+                    boards.append(model.game_board.flatten())
+                    sides.append(side)
+                else:
+                    rewards.append(float(batch) if winner == 'Vermelho' else 0.0)
+                for _ in range(len(path) - 1):
+                    model.unmake_move()
+
+            # Simulação: os rollouts de todas as folhas do passo são jogados de uma só vez
+            if boards:
+                results = self.rollouts(np.repeat(np.array(boards, dtype=np.int64), batch, axis=0),
+                                        np.repeat(np.array(sides), batch))
+                played = iter(results.reshape(-1, batch).sum(axis=1))
+                rewards = [next(played) if reward is None else reward for reward in rewards]
+
+            # Retropropagação (os nós de índice ímpar são jogadas de quem joga na raiz)
+            for path, red_reward in zip(paths, rewards):
+                for depth, node in enumerate(path):
+                    mover = root_side if depth % 2 == 1 else 1 - root_side
+                    node.reward += red_reward if mover == 1 else batch - red_reward
+            self.nodes += leaves
+
+        return {child.move: (child.visits, child.reward) for child in root.children}
+
+    def descend(self, root: Node, root_side: int) -> tuple:
+        """Seleção e expansão: desce pela árvore, faz as jogadas no modelo e acrescenta um nó
+
+        As visitas dos nós do caminho são somadas logo aqui; os resultados só depois dos rollouts.
+
+        Args:
+            root (Node): raiz da árvore
+            root_side (int): jogador a jogar na raiz
+
+        Returns:
+            tuple: (caminho desde a raiz, jogador a jogar na folha, vencedor na folha ou None)
+        """
+        model = self.model
+        node, side, path = root, root_side, [root]
+        while node.untried is not None and not node.untried and node.children:
+            node = self.select_child(node)
+            model.make_move(*decode_move(node.move))
+            side = 1 - side
+            path.append(node)
+
+        # Expansão: acrescenta um filho, se o jogo não tiver acabado
+        is_win, winner = model.is_win()
+        if not is_win:
+            if node.untried is None:
+                node.untried = self.get_untried_moves(side, node is root)
+            if node.untried:
+                move = node.untried.pop()
+                model.make_move(*decode_move(move))
+                side = 1 - side
+                child = Node(move, node)
+                node.children.append(child)
+                path.append(child)
+                is_win, winner = model.is_win()
+
+        if len(path) - 1 > self.stats.max_depth:
+            self.stats.max_depth = len(path) - 1
+        for node in path:
+            node.visits += self.rollout_batch
+        return path, side, winner if is_win else None
+
+    def is_out_of_time(self) -> bool:
+        """Verifica se o tempo da jogada acabou ou se a pesquisa foi mandada parar"""
+        if self.stop_event is not None and self.stop_event.is_set():
+            return True
+        return self.deadline is not None and time.perf_counter() >= self.deadline
+
+    def select_child(self, node: Node) -> Node:
+        """Escolhe o filho com o maior valor UCT (média dos resultados mais o bónus de exploração)"""
+        log_visits = math.log(node.visits)
+        exploration = self.exploration
+        return max(node.children, key=lambda child: child.reward / child.visits
+                   + exploration * math.sqrt(log_visits / child.visits))
+
+    def get_untried_moves(self, side: int, is_root: bool) -> list:
+        """Jogadas de um nó novo, por ordem de expansão (retiradas do fim da lista)
+
+        As capturas e as entradas na toca ficam no fim, para serem experimentadas primeiro.
+
+        Args:
+            side (int): jogador a jogar, 0 (Azul) ou 1 (Vermelho)
+            is_root (bool): na raiz, o movimento proibido pelas repetições fica de fora
+        """
+        buffer = self.move_buffers[0]
+        count = self.model.generate_moves(side, buffer)
+        moves = list(buffer[:count])
+        if is_root and self.model.forbidden_move and self.model.cycle_detected:
+            forbidden = encode_move(*self.model.forbidden_move)
+            moves = [move for move in moves if move & MOVE_MASK != forbidden] or moves
+        self.rng.shuffle(moves)
+        moves.sort(key=lambda move: move & (CAPTURE_FLAG | DEN_FLAG) != 0)
+        return moves
+
+    def rollouts(self, boards: np.ndarray, sides: np.ndarray) -> np.ndarray:
+        """Joga um jogo aleatório a partir de cada tabuleiro, todos ao mesmo tempo
+
+        Args:
+            boards (ndarray): tabuleiros planos (N, 42) em int64, alterados durante os jogos
+            sides (ndarray): jogador a jogar em cada tabuleiro (N,)
+
+        Returns:
+            ndarray: resultado de cada jogo do ponto de vista do vermelho (1 vitória, 0 derrota, 0.5 empate;
+            os jogos interrompidos valem entre 0 e 1, pela proporção do material)
+        """
+        results = np.full(len(boards), 0.5)
+        games = np.arange(len(boards))          # Jogos ainda a decorrer (índices em results)
+
+        for _ in range(self.rollout_depth):
+            from_sq, to_sq, has_moves = sample_moves_batch(boards, sides, self.rng, self.capture_weight)
+
+            # Sem jogadas não há vencedor
+            if not has_moves.all():
+                games, boards, sides = games[has_moves], boards[has_moves], sides[has_moves]
+                from_sq, to_sq = from_sq[has_moves], to_sq[has_moves]
+                if games.size == 0:
+                    return results
+
+            rows = np.arange(games.size)
+            boards[rows, to_sq] = boards[rows, from_sq]
+            boards[rows, from_sq] = 0
+
+            blue_won = (boards[:, ENEMY_DEN[0]] > 0) | ~(boards < 0).any(axis=1)
+            red_won = (boards[:, ENEMY_DEN[1]] < 0) | ~(boards > 0).any(axis=1)
+            results[games[blue_won]] = 0.0
+            results[games[red_won]] = 1.0
+
+            # Só os jogos que continuam passam ao passo seguinte
+            playing = ~(blue_won | red_won)
+            if not playing.all():
+                games, boards, sides = games[playing], boards[playing], sides[playing]
+                if games.size == 0:
+                    return results
+            sides = 1 - sides
+
+        # Jogos interrompidos: proporção do material vermelho
+        values = self.piece_values[np.abs(boards)]
+        red = (values * (boards < 0)).sum(axis=1)
+        blue = (values * (boards > 0)).sum(axis=1)
+        results[games] = 0.5 + 0.5 * (red - blue) / np.maximum(red + blue, 1)
+        return results
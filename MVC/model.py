@@ -1,5 +1,11 @@
 import numpy as np
-from assets.consts import Consts
+from MVC.tables import COLS, SQUARES, NEIGHBOURS, LAND_NEIGHBOURS, JUMPS, TERRAIN, CAPTURES
+from MVC.zobrist import PIECE_KEYS, SIDE_KEY, board_key
+from MVC.repetition import RepetitionHistory
+from MVC.transposition import EXACT, LOWER, UPPER
+from MVC.engine import SearchEngine, SearchAborted, Evaluator, is_win_score
+from MVC.moves import (MOVE_MASK, CAPTURE_FLAG, DEN_FLAG, TRAP_FLAG, JUMP_FLAG, MAX_PLY, TARGET_FLAGS,
+                       encode_move, decode_move)
 import random
 
 
@@ -12,7 +18,7 @@ class Model:
                  [8, 0, 0, 0, 0, 1],
                  [0, 2, 0, 0, 4, 0],
                  [5, 0, 0, 0, 0, 7]]
-        self.game_board = np.asarray(board, dtype=int)    # Converte a variável do tabuleiro num array numpy
+        self.set_board(board)    # Converte a variável do tabuleiro num array numpy
         self.moves = []
         self.selected_game_piece = None
         self.turn = 0
@@ -24,9 +30,10 @@ class Model:
         self.move_history = []  # Lista para armazenar o histórico de movimentos
         self.cycle_detected = False  # Flag para indicar se um ciclo foi detectado
         # Adiciona histórico de estados do tabuleiro e controle de repetições
-        self.board_states = []  # Lista para armazenar estados anteriores do tabuleiro
+        self.repetitions = RepetitionHistory()  # Últimas posições do tabuleiro (chaves de Zobrist), com contagem por chave
         self.repeated_states_count = {}  # Contador de estados repetidos
         self.random_factor = 0.1  # Fator de aleatoriedade inicial
+        self.undo_stack = []  # Registos para desfazer as jogadas feitas com make_move
     
     def is_outside_r_edge(self, pos_x: int) -> bool:
         """Verifica se a posição X está fora da borda direita do tabuleiro
@@ -87,12 +94,14 @@ class Model:
         
         return False
     
-    def is_self_rank_higher(self, rank_a: int, rank_b: int) -> bool:
+    def is_self_rank_higher(self, rank_a: int, rank_b: int, pos_a=None, pos_b=None) -> bool:
         """Compara rank e other_rank para determinar se a peça rank_a pode comer a peça rank_b
 
         Args:
             rank_a (int): Rank da possível peça que come
             rank_b (int): Rank da peça a ser comida
+            pos_a (tuple(int, int), optional): Posição da peça rank_a. Se omitida, é obtida do índice de peças
+            pos_b (tuple(int, int), optional): Posição da peça rank_b. Se omitida, é obtida do índice de peças
 
         Returns:
             bool: rank pode comer other_rank
@@ -101,87 +110,25 @@ class Model:
         if (rank_a > 0 and rank_b > 0) or (rank_a < 0 and rank_b < 0):
             return False
 
-        # Encontra a posição da peça a ser comida (rank_b)
-        pos_b = None
-        for i in range(7):
-            for j in range(6):
-                if self.game_board[i, j] == rank_b:
-                    pos_b = (i, j)
-                    break
-            if pos_b:
-                break
+        # Qualquer peça pode avançar para uma casa vazia
+        if rank_b == 0:
+            return True
 
-        # Encontra a posição da peça que come (rank_a)
-        pos_a = None
-        for i in range(7):
-            for j in range(6):
-                if self.game_board[i, j] == rank_a:
-                    pos_a = (i, j)
-                    break
-            if pos_a:
-                break
+        # Obtém as posições das peças a partir do índice, em vez de procurar no tabuleiro
+        if pos_a is None:
+            pos_a = self.piece_positions.get(rank_a)
+        if pos_b is None:
+            pos_b = self.piece_positions.get(rank_b)
 
         # Se não encontrar uma das posições, retorna False
         if pos_a is None or pos_b is None:
             return False
 
-        # Verifica se a peça está em uma armadilha do adversário
-        if rank_b > 0:  # Peça azul
-            if pos_b in [(0, 2), (0, 4), (1, 3)]:  # Armadilhas vermelhas
-                return True
-        else:  # Peça vermelha
-            if pos_b in [(6, 1), (6, 3), (5, 2)]:  # Armadilhas azuis
-                return True
-
-        # Se não estiver em armadilha, continua com as regras normais
-        rank_a = abs(rank_a)
-        rank_b = abs(rank_b)
-
-        # Regra especial para Ratos (rank 1)
-        if rank_a == 1 and rank_b == 1:
-            # Verifica se ambos estão no rio ou ambos em terra
-            is_a_in_river = (pos_a[1] in (1, 4) and 2 < pos_a[0] < 5) or \
-                          (pos_a[1] in (1, 4) and pos_a[0] == 2)
-            is_b_in_river = (pos_b[1] in (1, 4) and 2 < pos_b[0] < 5) or \
-                          (pos_b[1] in (1, 4) and pos_b[0] == 2)
-            
-            return is_a_in_river == is_b_in_river
-
-        # Regra especial para Rato vs Elefante
-        if rank_a == 1 and rank_b == 8:
-            # Verifica se o rato está no rio
-            is_a_in_river = (pos_a[1] in (1, 4) and 2 < pos_a[0] < 5) or \
-                          (pos_a[1] in (1, 4) and pos_a[0] == 2)
-            
-            # O rato só pode capturar o elefante se não estiver no rio
-            return not is_a_in_river
-
-        # Regras normais para outras peças...
-        if rank_a == 1 and rank_b in (0, 1, 8):
-            return True
-        
-        if rank_a == 2 and rank_b <= 2:
-            return True
-        
-        if rank_a == 3 and rank_b <= 3:
-            return True
-        
-        if rank_a == 4 and rank_b <= 4:
-            return True
-        
-        if rank_a == 5 and rank_b <= 5:
-            return True
-        
-        if rank_a == 6 and rank_b <= 6:
-            return True
-        
-        if rank_a == 7 and rank_b <= 7:
-            return True
-        
-        if rank_a == 8 and rank_b in (0, 2, 3, 4, 5, 6, 7, 8):
-            return True
-        
-        return False
+        # Consulta a tabela de capturas, indexada pelos ranks e pelo terreno de cada peça
+        side_a = 0 if rank_a > 0 else 1
+        terrain_a = TERRAIN[side_a][pos_a[0] * COLS + pos_a[1]]
+        terrain_b = TERRAIN[1 - side_a][pos_b[0] * COLS + pos_b[1]]
+        return CAPTURES[((abs(rank_a) * 9 + abs(rank_b)) * 3 + terrain_a) * 3 + terrain_b]
             
     def get_directions_to_river(self, pos):
         """Gera uma lista de direções adjacentes aos rios para uma peça dada
@@ -219,40 +166,12 @@ class Model:
             pos (tuple(int, int)): posição atual da peça
             rank (int): rank da peça atual
         """
-
-        directions_to_river = self.get_directions_to_river(pos)
         moves = []
-        if len(directions_to_river) == 0:
-            for dir in Consts.DIRECTIONS:
-                if not self.is_outside_r_edge(pos[1] + dir[1]): 
-                    if not self. is_outside_l_edge(pos[1] + dir[1]):
-                        if not self.is_outside_u_edge(pos[0] + dir[0]):
-                            if not self.is_outside_d_edge(pos[0] + dir[0]):
-                                # Verifica se a posição de destino é rio
-                                new_pos = (pos[0] + dir[0], pos[1] + dir[1])
-                                if not ((new_pos[1] in (1, 4) and 2 < new_pos[0] < 5) or \
-                                      (new_pos[1] in (1, 4) and new_pos[0] == 2)):
-                                    if self.is_self_rank_higher(rank, self.game_board[new_pos[0], new_pos[1]]):
-                                        if not self.is_overlapping_own_den(new_pos, rank):
-                                            moves.append(new_pos)
-        
-        else:
-            DIR = Consts.DIRECTIONS.copy()
-            for direction in directions_to_river:
-                DIR.remove(direction)
-            
-            for dir in DIR:
-                if not self.is_outside_r_edge(pos[1] + dir[1]): 
-                    if not self. is_outside_l_edge(pos[1] + dir[1]):
-                        if not self.is_outside_u_edge(pos[0] + dir[0]):
-                            if not self.is_outside_d_edge(pos[0] + dir[0]):
-                                # Verifica se a posição de destino é rio
-                                new_pos = (pos[0] + dir[0], pos[1] + dir[1])
-                                if not ((new_pos[1] in (1, 4) and 2 < new_pos[0] < 5) or \
-                                      (new_pos[1] in (1, 4) and new_pos[0] == 2)):
-                                    if self.is_self_rank_higher(rank, self.game_board[new_pos[0], new_pos[1]]):
-                                        if not self.is_overlapping_own_den(new_pos, rank):
-                                            moves.append(new_pos)
+        # As casas adjacentes que não são rio vêm já calculadas em MVC.tables
+        for new_pos in LAND_NEIGHBOURS[pos[0] * COLS + pos[1]]:
+            if self.is_self_rank_higher(rank, self.game_board[new_pos[0], new_pos[1]], pos, new_pos):
+                if not self.is_overlapping_own_den(new_pos, rank):
+                    moves.append(new_pos)
         
         return moves
     
@@ -264,14 +183,10 @@ class Model:
             rank (int): rank da peça atual
         """
         moves = []
-        for dir in Consts.DIRECTIONS:
-            if not self.is_outside_r_edge(pos[1] + dir[1]): 
-                    if not self. is_outside_l_edge(pos[1] + dir[1]):
-                        if not self.is_outside_u_edge(pos[0] + dir[0]):
-                            if not self.is_outside_d_edge(pos[0] + dir[0]):
-                                if self.is_self_rank_higher(rank, self.game_board[pos[0] + dir[0], pos[1] + dir[1]]):
-                                    if not self.is_overlapping_own_den((pos[0] + dir[0], pos[1] + dir[1]), rank):
-                                        moves.append((pos[0] + dir[0], pos[1] + dir[1]))
+        for new_pos in NEIGHBOURS[pos[0] * COLS + pos[1]]:
+            if self.is_self_rank_higher(rank, self.game_board[new_pos[0], new_pos[1]], pos, new_pos):
+                if not self.is_overlapping_own_den(new_pos, rank):
+                    moves.append(new_pos)
         
         return moves
 
@@ -295,82 +210,19 @@ class Model:
             pos (tuple(int, int)): posição atual da peça
             rank (int): rank da peça atual
         """
-        moves = []
-        row, col = pos
-        
         # Movimentos normais (sem rio)
-        for dir in Consts.DIRECTIONS:
-            new_row, new_col = row + dir[0], col + dir[1]
-            if (0 <= new_row < 7 and 0 <= new_col < 6):  # Dentro do tabuleiro
-                new_pos = (new_row, new_col)
-                if not self.is_river(new_pos):
-                    if self.is_self_rank_higher(rank, self.game_board[new_row, new_col]):
-                        if not self.is_overlapping_own_den(new_pos, rank):
-                            moves.append(new_pos)
-
-        # Lógica especial para o Leão (rank 7)
+        moves = self.land_logic(pos, rank)
+
+        # Lógica especial para o Leão (rank 7): saltos sobre o rio, bloqueados por qualquer Rato no caminho
         if abs(rank) == 7:
-            # Saltos horizontais sobre o rio
-            if 2 <= row <= 4:  # Entre as linhas 2 e 4 (inclusive)
-                # Salto para a esquerda
-                if col == 2:  # Se estiver à direita da coluna 1
-                    target_pos = (row, 0)
-                    path_clear = True
-                    # Verifica se há ratos no caminho
-                    if abs(self.game_board[row, 1]) == 1:  # Se for um rato
-                        path_clear = False
-                    if path_clear and self.is_self_rank_higher(rank, self.game_board[target_pos[0], target_pos[1]]):
-                        moves.append(target_pos)
-                elif col == 5:  # Se estiver à direita da coluna 4
-                    target_pos = (row, 3)
-                    path_clear = True
-                    # Verifica se há ratos no caminho
-                    if abs(self.game_board[row, 4]) == 1:  # Se for um rato
-                        path_clear = False
-                    if path_clear and self.is_self_rank_higher(rank, self.game_board[target_pos[0], target_pos[1]]):
-                        moves.append(target_pos)
-                
-                # Salto para a direita
-                if col == 0:  # Se estiver à esquerda da coluna 1
-                    target_pos = (row, 2)
-                    path_clear = True
-                    # Verifica se há ratos no caminho
-                    if abs(self.game_board[row, 1]) == 1:  # Se for um rato
-                        path_clear = False
-                    if path_clear and self.is_self_rank_higher(rank, self.game_board[target_pos[0], target_pos[1]]):
-                        moves.append(target_pos)
-                elif col == 3:  # Se estiver à esquerda da coluna 4
-                    target_pos = (row, 5)
-                    path_clear = True
-                    # Verifica se há ratos no caminho
-                    if abs(self.game_board[row, 4]) == 1:  # Se for um rato
+            for target_pos, river_path in JUMPS[pos[0] * COLS + pos[1]]:
+                path_clear = True
+                for river_pos in river_path:
+                    if abs(self.game_board[river_pos[0], river_pos[1]]) == 1:  # Se for um rato
                         path_clear = False
-                    if path_clear and self.is_self_rank_higher(rank, self.game_board[target_pos[0], target_pos[1]]):
-                        moves.append(target_pos)
-            
-            # Saltos verticais sobre o rio
-            if col in (1, 4):  # Nas colunas do rio
-                # Salto para cima
-                if row == 5:  # Na linha 5
-                    target_pos = (1, col)
-                    path_clear = True
-                    # Verifica se há ratos no caminho
-                    for r in range(2, 5):
-                        if abs(self.game_board[r, col]) == 1:  # Se for um rato
-                            path_clear = False                        
-                    if path_clear and self.is_self_rank_higher(rank, self.game_board[target_pos[0], target_pos[1]]):
-                        moves.append(target_pos)
-                
-                # Salto para baixo
-                if row == 1:  # Na linha 2
-                    target_pos = (5, col)
-                    path_clear = True
-                    # Verifica se há ratos no caminho
-                    for r in range(2, 5):
-                        if abs(self.game_board[r, col]) == 1:  # Se for um rato
-                            path_clear = False                        
-                    if path_clear and self.is_self_rank_higher(rank, self.game_board[target_pos[0], target_pos[1]]):
-                        moves.append(target_pos)
+                        break
+                if path_clear and self.is_self_rank_higher(rank, self.game_board[target_pos[0], target_pos[1]], pos, target_pos):
+                    moves.append(target_pos)
         
         return moves
 
@@ -407,6 +259,33 @@ class Model:
         
         return moves
 
+    def generate_moves(self, side: int, buffer) -> int:
+        """Escreve todas as jogadas de um jogador, codificadas como inteiros, num buffer pré-alocado
+
+        As peças são percorridas pela ordem do tabuleiro (linha a linha), como nas listas de jogadas em tuplos.
+
+        Args:
+            side (int): jogador, 0 (Azul) ou 1 (Vermelho)
+            buffer (array): buffer array('H') criado com MVC.moves.new_move_buffer
+
+        Returns:
+            int: número de jogadas escritas no buffer
+        """
+        count = 0
+        target_flags = TARGET_FLAGS[side]
+        for pos in sorted(self.side_pieces[side]):
+            from_sq = pos[0] * COLS + pos[1]
+            for end in self.get_possible_moves(pos):
+                to_sq = end[0] * COLS + end[1]
+                move = (from_sq * SQUARES + to_sq) | target_flags[to_sq]
+                if self.game_board[end[0], end[1]] != 0:
+                    move |= CAPTURE_FLAG
+                if abs(from_sq - to_sq) not in (1, COLS):
+                    move |= JUMP_FLAG
+                buffer[count] = move
+                count += 1
+        return count
+
     def is_choosing_current_move(self, pos) -> bool:
         """Verifica se a posição selecionada está na lista de movimentos atuais
 
@@ -436,24 +315,37 @@ class Model:
             game_piece (tuple(int, int)): posição da peça a mover
             selected_move (tuple(int, int)): posição selecionada
         """
-        self.game_board[selected_move[0], selected_move[1]] = self.game_board[start_place[0], start_place[1]]
-        self.game_board[start_place[0], start_place[1]] = 0
-        self.last_move_coords = (start_place, selected_move) # Regista a última jogada
+        self.make_move(start_place, selected_move)
+
+    def make_move(self, start: tuple, end: tuple) -> None:
+        """Executa uma jogada com todo o registo de repetições, guardando o necessário para a desfazer
+
+        É o mesmo caminho usado pelas jogadas reais (perform_move) e pela pesquisa das IAs,
+        que desfaz cada jogada com unmake_move.
+
+        Args:
+            start (tuple): posição inicial (linha, coluna)
+            end (tuple): posição final (linha, coluna)
+        """
+        captured = self.move_piece(start, end)
+
+        # Registo compacto do estado que a jogada vai alterar
+        undo = [start, end, captured, self.last_move_coords, None, None,
+                self.random_factor, self.cycle_detected, self.forbidden_move]
+
+        self.last_move_coords = (start, end) # Regista a última jogada
         
         # Adiciona o movimento ao histórico para controle de repetições
-        self.last_moves.append((start_place, selected_move))
+        self.last_moves.append((start, end))
         
         # Mantém apenas os últimos 12 movimentos (6 pares de jogadas)
         if len(self.last_moves) > 12:
-            self.last_moves.pop(0)
-        
-        # Armazena o estado atual do tabuleiro para detectar repetições
-        current_state = self.game_board.tobytes()
-        self.board_states.append(current_state)
+            undo[4] = self.last_moves.pop(0)
         
-        # Mantém apenas os últimos 20 estados do tabuleiro
-        if len(self.board_states) > 20:
-            self.board_states.pop(0)
+        # Armazena o estado atual do tabuleiro (a sua chave de Zobrist) para detectar repetições,
+        # mantendo apenas os últimos 20 estados (o que sai da janela fica no registo de undo)
+        current_state = self.zobrist_key
+        undo[5] = self.repetitions.push(current_state)
         
         # Conta ocorrências de cada estado
         if current_state in self.repeated_states_count:
@@ -472,6 +364,123 @@ class Model:
         # Verifica se ocorreu uma repetição de movimentos (ciclo)
         self.check_move_repetition()
 
+        self.undo_stack.append(undo)
+
+    def make_null_move(self) -> None:
+        """Passa a vez sem mover nenhuma peça (usado pelo null-move pruning das IAs)
+
+        Só muda o jogador na chave de Zobrist. Fica registado na pilha de undo como None,
+        para que unmake_move o desfaça como qualquer outra jogada.
+        """
+        self.zobrist_key ^= SIDE_KEY
+        self.undo_stack.append(None)
+
+    def unmake_move(self) -> None:
+        """Desfaz a última jogada feita com make_move (ou make_null_move), repondo exatamente o estado anterior"""
+        undo = self.undo_stack.pop()
+        if undo is None:
+            self.zobrist_key ^= SIDE_KEY
+            return
+        start, end, captured, last_move_coords, dropped_move, dropped_state, \
+            random_factor, cycle_detected, forbidden_move = undo
+
+        # Retira o estado do tabuleiro do histórico e da contagem de repetições
+        current_state = self.repetitions.pop(dropped_state)
+        if self.repeated_states_count[current_state] == 1:
+            del self.repeated_states_count[current_state]
+        else:
+            self.repeated_states_count[current_state] -= 1
+
+        self.last_moves.pop()
+        if dropped_move is not None:
+            self.last_moves.insert(0, dropped_move)
+
+        self.last_move_coords = last_move_coords
+        self.random_factor = random_factor
+        self.cycle_detected = cycle_detected
+        self.forbidden_move = forbidden_move
+
+        self.undo_move_piece(start, end, captured)
+
+    def is_repeated_position(self) -> bool:
+        """Verifica se a posição atual já tinha ocorrido nos últimos estados do tabuleiro guardados
+
+        Returns:
+            bool: True se a posição atual é uma repetição
+        """
+        return self.repetitions.is_repeated()
+
+    @property
+    def board_states(self) -> list:
+        """Chaves de Zobrist das últimas posições, da mais antiga para a mais recente (usado pelos jogos salvos)"""
+        return self.repetitions.to_list()
+
+    @board_states.setter
+    def board_states(self, states: list) -> None:
+        self.repetitions.load(states)
+
+    def move_piece(self, start: tuple, end: tuple) -> int:
+        """Move uma peça no tabuleiro sem registar a jogada no histórico
+
+        Usado pela pesquisa das IAs, que desfaz a jogada logo a seguir com undo_move_piece.
+
+        Args:
+            start (tuple): posição inicial (linha, coluna)
+            end (tuple): posição final (linha, coluna)
+
+        Returns:
+            int: peça que estava na posição final (0 se estava vazia)
+        """
+        piece = int(self.game_board[start[0], start[1]])
+        captured = int(self.game_board[end[0], end[1]])
+        self.game_board[end[0], end[1]] = piece
+        self.game_board[start[0], start[1]] = 0
+
+        # Atualiza o índice de peças e as listas de peças de cada lado
+        side = 0 if piece > 0 else 1
+        self.piece_positions[piece] = end
+        del self.side_pieces[side][start]
+        self.side_pieces[side][end] = piece
+        if captured != 0:
+            del self.piece_positions[captured]
+            del self.side_pieces[1 - side][end]
+
+        # Atualiza a chave de Zobrist (peça movida, peça capturada e jogador a jogar)
+        start_sq = start[0] * COLS + start[1]
+        end_sq = end[0] * COLS + end[1]
+        self.zobrist_key ^= PIECE_KEYS[piece + 8][start_sq] ^ PIECE_KEYS[piece + 8][end_sq] ^ SIDE_KEY
+        if captured != 0:
+            self.zobrist_key ^= PIECE_KEYS[captured + 8][end_sq]
+        return captured
+
+    def undo_move_piece(self, start: tuple, end: tuple, captured: int) -> None:
+        """Desfaz uma jogada feita com move_piece
+
+        Args:
+            start (tuple): posição inicial da jogada (linha, coluna)
+            end (tuple): posição final da jogada (linha, coluna)
+            captured (int): peça devolvida por move_piece
+        """
+        piece = int(self.game_board[end[0], end[1]])
+        self.game_board[start[0], start[1]] = piece
+        self.game_board[end[0], end[1]] = captured
+
+        # Repõe o índice de peças e as listas de peças de cada lado
+        side = 0 if piece > 0 else 1
+        self.piece_positions[piece] = start
+        del self.side_pieces[side][end]
+        self.side_pieces[side][start] = piece
+        if captured != 0:
+            self.piece_positions[captured] = end
+            self.side_pieces[1 - side][end] = captured
+
+        # Repõe a chave de Zobrist
+        start_sq = start[0] * COLS + start[1]
+        end_sq = end[0] * COLS + end[1]
+        self.zobrist_key ^= PIECE_KEYS[piece + 8][start_sq] ^ PIECE_KEYS[piece + 8][end_sq] ^ SIDE_KEY
+        if captured != 0:
+            self.zobrist_key ^= PIECE_KEYS[captured + 8][end_sq]
+
     def check_move_repetition(self) -> None:
         """Verifica se há repetição de movimentos e define um movimento proibido se necessário"""
         # Precisamos de pelo menos 6 movimentos para detectar ciclos de 3 pares de jogadas
@@ -516,11 +525,10 @@ class Model:
         
         # Se não detectou ciclos específicos, mas temos estados repetidos, mantém o ciclo detectado
         if not self.cycle_detected:
-            # Verifica se algum estado se repete mais de uma vez
-            for state in self.board_states:
-                if self.board_states.count(state) >= 3:
-                    self.cycle_detected = True
-                    return
+            # Verifica se algum estado se repete três vezes (contagem mantida pelo histórico de repetições)
+            if self.repetitions.has_threefold():
+                self.cycle_detected = True
+                return
         
         # Se não detectou ciclos, limpa o movimento proibido
         self.forbidden_move = None
@@ -549,20 +557,44 @@ class Model:
         winning_player = ''
         is_win = False
         # Verifica vitória para o jogador azul
-        if self.game_board[0, 3] > 0 or (self.game_board >= 0).all():
+        if self.game_board[0, 3] > 0 or not self.side_pieces[1]:
             # print('blue win') # REMOVIDO
             is_win = True
             winning_player = 'Azul'
             
         
         # Verifica vitória para o jogador vermelho
-        if self.game_board[6, 2] < 0 or (self.game_board <= 0).all():
+        if self.game_board[6, 2] < 0 or not self.side_pieces[0]:
             # print('red win') # REMOVIDO
             is_win = True
             winning_player = 'Vermelho'
         
         return (is_win, winning_player)
     
+    def set_board(self, board, turn: int = 0) -> None:
+        """Substitui o tabuleiro atual e reconstrói as estruturas derivadas dele
+
+        Args:
+            board (list | ndarray): tabuleiro 7x6 com os ranks das peças
+            turn (int): jogador a jogar nesta posição, usado na chave de Zobrist (default: 0)
+        """
+        self.game_board = np.asarray(board, dtype=int)
+
+        # Chave de Zobrist da posição, atualizada depois de forma incremental em cada jogada
+        self.zobrist_key = board_key(self.game_board, turn)
+
+        # Índice rank -> posição, para não ter de procurar as peças no tabuleiro
+        # (cada rank existe no máximo uma vez por jogador)
+        self.piece_positions = {}
+        # Peças vivas de cada lado (0 azul, 1 vermelho), posição -> rank, para não percorrer as 42 casas
+        self.side_pieces = ({}, {})
+        for i in range(7):
+            for j in range(6):
+                piece = int(self.game_board[i, j])
+                if piece != 0:
+                    self.piece_positions[piece] = (i, j)
+                    self.side_pieces[0 if piece > 0 else 1][(i, j)] = piece
+
     def reset(self) -> None:
         """Reinicia o modelo para o seu estado inicial
         """
@@ -573,7 +605,7 @@ class Model:
                  [8, 0, 0, 0, 0, 1],
                  [0, 2, 0, 0, 4, 0],
                  [5, 0, 0, 0, 0, 7]]
-        self.game_board = np.asarray(board, dtype=int)    # Converte a variável do tabuleiro num array numpy
+        self.set_board(board)    # Converte a variável do tabuleiro num array numpy
         self.moves = []
         self.selected_game_piece = None
         self.turn = 0
@@ -584,9 +616,25 @@ class Model:
         self.move_history = []
         self.cycle_detected = False
         # Reseta o histórico de estados do tabuleiro
-        self.board_states = []
+        self.repetitions.clear()
         self.repeated_states_count = {}
         self.random_factor = 0.1
+        self.undo_stack = []
+
+    def is_den_threatened(self, distance: int = 2) -> bool:
+        """Verifica se alguma peça está perto da toca adversária
+
+        Args:
+            distance (int): distância de Manhattan máxima à toca (default: 2)
+
+        Returns:
+            bool: True se alguma das tocas tem uma peça inimiga a essa distância ou menos
+        """
+        for side, den in ((0, (0, 3)), (1, (6, 2))):
+            for row, col in self.side_pieces[side]:
+                if abs(row - den[0]) + abs(col - den[1]) <= distance:
+                    return True
+        return False
 
     def is_piece_safe_in_trap(self, pos: tuple, piece: int) -> bool:
         """Verifica se uma peça está segura em uma armadilha (não pode ser capturada)
@@ -599,18 +647,13 @@ class Model:
             bool: True se a peça está segura, False caso contrário
         """
         # Verifica todas as peças adjacentes
-        for dir in Consts.DIRECTIONS:
-            new_pos = (pos[0] + dir[0], pos[1] + dir[1])
-            if not (self.is_outside_r_edge(new_pos[1]) or 
-                   self.is_outside_l_edge(new_pos[1]) or 
-                   self.is_outside_u_edge(new_pos[0]) or 
-                   self.is_outside_d_edge(new_pos[0])):
-                adjacent_piece = self.game_board[new_pos[0], new_pos[1]]
-                if adjacent_piece != 0:
-                    # Se a peça adjacente for do oponente e puder capturar
-                    if (piece < 0 and adjacent_piece > 0) or (piece > 0 and adjacent_piece < 0):
-                        if self.is_self_rank_higher(adjacent_piece, piece):
-                            return False
+        for new_pos in NEIGHBOURS[pos[0] * COLS + pos[1]]:
+            adjacent_piece = self.game_board[new_pos[0], new_pos[1]]
+            if adjacent_piece != 0:
+                # Se a peça adjacente for do oponente e puder capturar
+                if (piece < 0 and adjacent_piece > 0) or (piece > 0 and adjacent_piece < 0):
+                    if self.is_self_rank_higher(adjacent_piece, piece, new_pos, pos):
+                        return False
         return True
 
     def is_winning_move(self, start: tuple, end: tuple) -> bool:
@@ -653,157 +696,80 @@ class Model:
         return end in possible_moves
 
 
-class AI:
-    def __init__(self, model: Model, depth: int = 4):
-        self.model = model
-        self.max_depth = depth  # Profundidade configurável
-        
-        # Cache para avaliações de posição
-        self.position_cache = {}
-        
-        # Valores das peças (otimizados)
-        self.piece_values = {
-            1: 6,   # Rato
-            2: 3,   # Gato
-            3: 4,   # Cão
-            4: 5,   # Lobo
-            5: 6,   # Leopardo
-            6: 7,   # Tigre
-            7: 8,   # Leão
-            8: 15   # Elefante - Valor aumentado significativamente
-        }
-        
-        # Posições das armadilhas
-        self.traps = [
-            (0, 2), (0, 4), (1, 3),  # Armadilhas vermelhas
-            (6, 1), (6, 3), (5, 2)   # Armadilhas azuis
-        ]
-        
-        # Posições das tocas
-        self.dens = [(0, 3), (6, 2)]  # (vermelho, azul)
-        
-        # Limite de movimentos para poda
-        self.move_limit = 20  # Limita o número de movimentos avaliados por nó
-        
-    def evaluate_board(self) -> float:
-        """Avalia o estado atual do tabuleiro com uma função de avaliação otimizada"""
-        # Verifica cache
-        board_key = hash(self.model.game_board.tobytes())
-        if board_key in self.position_cache:
-            return self.position_cache[board_key]
-            
-        score = 0
-        
-        # Verifica se o jogo terminou
-        if self.model.is_win()[0]:
-            if self.model.is_win()[1] == 'Vermelho':
-                return float('inf')
-            else:
-                return float('-inf')
+class AI(SearchEngine):
+    """IA Minimax com cortes alfa-beta; os valores são sempre do ponto de vista do vermelho"""
 
-        # 1. Avaliação de material (pesos iguais para ambos jogadores)
-        for i in range(7):
-            for j in range(6):
-                piece = self.model.game_board[i, j]
-                if piece != 0:
-                    value = self.piece_values[abs(piece)]
-                    if piece < 0:  # Peça vermelha
-                        score += value
-                    else:  # Peça azul
-                        score -= value
-        
-        # 2. Avaliação de posição (equilibrada para ambos os jogadores)
-        closest_red_to_blue_den = float('inf')  # Distância da peça vermelha mais próxima ao covil azul
-        closest_blue_to_red_den = float('inf')  # Distância da peça azul mais próxima ao covil vermelho
-        
-        # Pontuação por proximidade ao covil adversário - equilibrada para ambos os jogadores
-        for i in range(7):
-            for j in range(6):
-                piece = self.model.game_board[i, j]
-                if piece != 0:
-                    # Progresso em direção à toca adversária
-                    if piece < 0:  # Peça vermelha
-                        dist_to_den = abs(i - self.dens[1][0]) + abs(j - self.dens[1][1])
-                        # Guarda a distância da peça mais próxima ao covil
-                        closest_red_to_blue_den = min(closest_red_to_blue_den, dist_to_den)
-                        
-                        # Pontuação progressiva baseada na proximidade
-                        proximity_score = (8 - dist_to_den) * 6.0
-                        score += proximity_score
-                        
-                        # Bônus adicional para peças muito próximas ao covil
-                        if dist_to_den <= 1:
-                            score += 500
-                        elif dist_to_den <= 2:
-                            score += 200
-                        elif dist_to_den <= 3:
-                            score += 120
-                        elif dist_to_den <= 4:
-                            score += 80
-                    else:  # Peça azul
-                        dist_to_den = abs(i - self.dens[0][0]) + abs(j - self.dens[0][1])
-                        # Guarda a distância da peça mais próxima ao covil
-                        closest_blue_to_red_den = min(closest_blue_to_red_den, dist_to_den)
-                        
-                        # Pontuação progressiva baseada na proximidade (mesmo valor que o vermelho)
-                        proximity_score = (8 - dist_to_den) * 6.0
-                        score -= proximity_score
-                        
-                        # Bônus adicional para peças muito próximas ao covil (mesmo valor que o vermelho)
-                        if dist_to_den <= 1:
-                            score -= 500
-                        elif dist_to_den <= 2:
-                            score -= 200
-                        elif dist_to_den <= 3:
-                            score -= 120
-                        elif dist_to_den <= 4:
-                            score -= 80
-        
-        # Bônus para vantagem na corrida para os covis - equilibrado para ambos jogadores
-        if closest_red_to_blue_den < closest_blue_to_red_den:
-            race_advantage = closest_blue_to_red_den - closest_red_to_blue_den
-            score += race_advantage * 80
-        elif closest_blue_to_red_den < closest_red_to_blue_den:
-            race_advantage = closest_red_to_blue_den - closest_blue_to_red_den
-            score -= race_advantage * 80  # Mesmo valor que o vermelho
-            
-        # Armazena em cache e retorna
-        self.position_cache[board_key] = score
-        return score
-    
-    def get_all_possible_moves(self, is_ai_turn: bool) -> list:
-        """Retorna todas as possíveis jogadas para o jogador atual (otimizada)"""
-        moves = []
-        for i in range(7):
-            for j in range(6):
-                piece = self.model.game_board[i, j]
-                # Verifica se a peça pertence ao jogador atual
-                if (is_ai_turn and piece < 0) or (not is_ai_turn and piece > 0):
-                    possible_moves = self.model.get_possible_moves((i, j))
-                    if possible_moves:
-                        moves.extend(((i, j), move) for move in possible_moves)
-        
-        # Ordena e limita o número de movimentos
-        moves.sort(key=lambda x: self.evaluate_move(x), reverse=is_ai_turn)
-        return moves[:self.move_limit]  # Retorna apenas os melhores movimentos
-    
-    def minimax(self, depth: int, alpha: float, beta: float, is_maximizing: bool, add_noise: bool = False) -> tuple:
+    side_relative = False
+
+    def __init__(self, model: Model, depth: int = 4, time_limit: float = None, node_limit: int = None,
+                 null_move: bool = False, lmr: bool = False, workers: int = 1, evaluator: Evaluator = None):
+        super().__init__(model, depth, time_limit, node_limit, null_move, lmr, workers, evaluator)
+
+    def minimax(self, depth: int, alpha: float, beta: float, is_maximizing: bool, add_noise: bool = False,
+                ply: int = 0) -> tuple:
         """Implementa o algoritmo Minimax com cortes alfa-beta"""
+        # Conta o nó e aborta se o orçamento acabou (nunca durante a primeira iteração)
+        self.nodes += 1
+        if ply > self.stats.max_depth:
+            self.stats.max_depth = ply
+        if self.completed_depth > 0 and self.is_out_of_budget():
+            raise SearchAborted()
+        
         if depth == 0 or self.model.is_win()[0]:
-            result = self.evaluate_board()
+            if depth == 0 and self.quiescence_limit > 0:
+                # Resolve as capturas e ameaças pendentes antes de avaliar
+                self.quiescence_nodes = 0
+                result = self.quiescence(alpha, beta, is_maximizing, ply)
+            else:
+                result = self.evaluate_board(ply)
             # Adiciona um pequeno ruído aleatório para quebrar empates e evitar loops
             if add_noise and depth == 0:
-                result += random.uniform(-self.model.random_factor, self.model.random_factor) * 100
+                result += self.leaf_noise()
             return result, None
         
-        moves = self.get_all_possible_moves(is_maximizing)
+        # Nas posições das tabelas de finais o valor é exato e não é preciso pesquisar
+        if ply > 0 and self.tablebase is not None:
+            score = self.tablebase_score(1 if is_maximizing else 0, ply)
+            if score is not None:
+                return score, None
+        
+        # Consulta a tabela de transposição: corte direto ou melhor jogada para pesquisar primeiro
+        key = self.model.zobrist_key
+        alpha_orig, beta_orig = alpha, beta
+        entry = self.probe_tt(key, ply)
+        tt_move = None
+        if entry is not None:
+            if ply > 0 and self.tt.cutoff(entry, depth, alpha, beta):
+                return entry[2], entry[4]
+            tt_move = entry[4]
+        
+        # Null move: se mesmo passando a vez o adversário não consegue sair da janela, corta já
+        if self.can_try_null_move(1 if is_maximizing else 0, depth, ply):
+            self.model.make_null_move()
+            self.ordering.played[ply] = 0
+            reduced_depth = depth - 1 - self.null_move_reduction
+            if is_maximizing and beta != float('inf'):
+                value, _ = self.minimax(reduced_depth, beta - self.null_window, beta, False, add_noise, ply + 1)
+                self.model.unmake_move()
+                if value >= beta:
+                    return value, None
+            elif not is_maximizing and alpha != float('-inf'):
+                value, _ = self.minimax(reduced_depth, alpha, alpha + self.null_window, True, add_noise, ply + 1)
+                self.model.unmake_move()
+                if value <= alpha:
+                    return value, None
+            else:
+                self.model.unmake_move()
+        
+        moves = self.get_all_possible_moves(is_maximizing, ply, tt_move)
         
         # Remove o movimento proibido da lista, se existir
         if self.model.forbidden_move and self.model.cycle_detected:
-            moves = [move for move in moves if move != self.model.forbidden_move]
+            forbidden = encode_move(*self.model.forbidden_move)
+            moves = [move for move in moves if move & MOVE_MASK != forbidden]
             
         if not moves:  # Se não houver movimentos possíveis
-            return self.evaluate_board(), None
+            return self.evaluate_board(ply), None
             
         if is_maximizing:
             max_eval = float('-inf')
@@ -813,31 +779,38 @@ class AI:
             if self.model.cycle_detected:
                 random.shuffle(moves)
             
-            for start, end in moves:
+            for index, move in enumerate(moves):
+                start, end = decode_move(move)
                 # Faz a jogada
-                piece_value = self.model.game_board[end[0], end[1]]
-                self.model.game_board[end[0], end[1]] = self.model.game_board[start[0], start[1]]
-                self.model.game_board[start[0], start[1]] = 0
+                self.model.make_move(start, end)
+                self.ordering.played[ply] = move
                 
-                # Avalia a jogada
-                eval, _ = self.minimax(depth - 1, alpha, beta, False, add_noise)
+                # Avalia a jogada (as jogadas tardias primeiro com profundidade reduzida)
+                if self.is_reducible(move, index, depth, alpha):
+                    eval, _ = self.minimax(depth - 2, alpha, alpha + self.null_window, False, add_noise, ply + 1)
+                    if eval > alpha:
+                        eval, _ = self.minimax(depth - 1, alpha, beta, False, add_noise, ply + 1)
+                else:
+                    eval, _ = self.minimax(depth - 1, alpha, beta, False, add_noise, ply + 1)
                 
                 # Penaliza movimentos que levam a estados repetidos
-                current_state = self.model.game_board.tobytes()
-                if current_state in self.model.board_states:
-                    eval -= self.model.random_factor * 50  # Penalidade proporcional ao fator de aleatoriedade
+                if self.model.is_repeated_position():
+                    eval -= self.repetition_penalty()
                 
                 # Desfaz a jogada
-                self.model.game_board[start[0], start[1]] = self.model.game_board[end[0], end[1]]
-                self.model.game_board[end[0], end[1]] = piece_value
+                self.model.unmake_move()
                 
                 if eval > max_eval:
                     max_eval = eval
-                    best_move = (start, end)
+                    best_move = move
                 alpha = max(alpha, eval)
                 if beta <= alpha:
+                    self.ordering.record_cutoff(move, ply, 1, depth)
+                    self.stats.record_cutoff(index)
                     break
-                    
+            
+            bound = UPPER if max_eval <= alpha_orig else LOWER if max_eval >= beta else EXACT
+            self.store_tt(key, depth, max_eval, bound, best_move, ply)
             return max_eval, best_move
         else:
             min_eval = float('inf')
@@ -847,297 +820,141 @@ class AI:
             if self.model.cycle_detected:
                 random.shuffle(moves)
             
-            for start, end in moves:
+            for index, move in enumerate(moves):
+                start, end = decode_move(move)
                 # Faz a jogada
-                piece_value = self.model.game_board[end[0], end[1]]
-                self.model.game_board[end[0], end[1]] = self.model.game_board[start[0], start[1]]
-                self.model.game_board[start[0], start[1]] = 0
+                self.model.make_move(start, end)
+                self.ordering.played[ply] = move
                 
-                # Avalia a jogada
-                eval, _ = self.minimax(depth - 1, alpha, beta, True, add_noise)
+                # Avalia a jogada (as jogadas tardias primeiro com profundidade reduzida)
+                if self.is_reducible(move, index, depth, beta):
+                    eval, _ = self.minimax(depth - 2, beta - self.null_window, beta, True, add_noise, ply + 1)
+                    if eval < beta:
+                        eval, _ = self.minimax(depth - 1, alpha, beta, True, add_noise, ply + 1)
+                else:
+                    eval, _ = self.minimax(depth - 1, alpha, beta, True, add_noise, ply + 1)
                 
                 # Penaliza movimentos que levam a estados repetidos
-                current_state = self.model.game_board.tobytes()
-                if current_state in self.model.board_states:
-                    eval += self.model.random_factor * 50  # Penalidade proporcional ao fator de aleatoriedade
+                if self.model.is_repeated_position():
+                    eval += self.repetition_penalty()
                 
                 # Desfaz a jogada
-                self.model.game_board[start[0], start[1]] = self.model.game_board[end[0], end[1]]
-                self.model.game_board[end[0], end[1]] = piece_value
+                self.model.unmake_move()
                 
                 if eval < min_eval:
                     min_eval = eval
-                    best_move = (start, end)
+                    best_move = move
                 beta = min(beta, eval)
                 if beta <= alpha:
+                    self.ordering.record_cutoff(move, ply, 0, depth)
+                    self.stats.record_cutoff(index)
                     break
-                    
+            
+            bound = LOWER if min_eval >= beta_orig else UPPER if min_eval <= alpha else EXACT
+            self.store_tt(key, depth, min_eval, bound, best_move, ply)
             return min_eval, best_move
 
-    def get_best_move(self) -> tuple:
-        """Retorna a melhor jogada para a IA"""
-        # Verifica primeiro se há um movimento vitorioso direto
-        all_moves = self.get_all_possible_moves(self.model.turn == 1)
-        
-        # Remove o movimento proibido da lista, se existir
-        if self.model.forbidden_move and self.model.cycle_detected:
-            all_moves = [move for move in all_moves if move != self.model.forbidden_move]
-        
-        # Se depois de remover o movimento proibido não sobrar nenhum movimento, 
-        # retornamos todos os movimentos novamente
-        if not all_moves:
-            all_moves = self.get_all_possible_moves(self.model.turn == 1)
-        
-        for start, end in all_moves:
-            # Verifica se pode entrar no covil adversário
-            if (self.model.turn == 0 and end == (0, 3)) or (self.model.turn == 1 and end == (6, 2)):
-                return (start, end)
-            
-            # Ou verifica se o movimento é vitorioso usando o método is_winning_move
-            if self.model.is_winning_move(start, end):
-                return (start, end)
-                
-        # Se não houver movimento vitorioso, continua com a lógica normal
-        self.position_cache.clear()
-        # Determina se é o turno da IA baseado no turno atual
-        is_ai_turn = self.model.turn == 1  # Se turn == 1, é o turno da IA vermelha
-        
-        # Adiciona um pouco de aleatoriedade para evitar ficar preso em padrões
-        if self.model.cycle_detected:
-            # Adiciona uma pequena perturbação aleatória à avaliação
-            add_noise = True
+
+    def quiescence(self, alpha: float, beta: float, is_maximizing: bool, ply: int) -> float:
+        """Continua a pesquisa nas folhas só com capturas e entradas em tocas ou armadilhas inimigas
+
+        O jogador a jogar pode sempre ficar com a avaliação estática (stand-pat). A expansão de cada
+        folha está limitada a quiescence_limit nós.
+
+        Args:
+            alpha (float): limite inferior da janela
+            beta (float): limite superior da janela
+            is_maximizing (bool): True se joga o vermelho
+            ply (int): distância à raiz
+
+        Returns:
+            float: avaliação da posição, do ponto de vista do vermelho
+        """
+        self.nodes += 1
+        if ply > self.stats.max_depth:
+            self.stats.max_depth = ply
+        if self.completed_depth > 0 and self.is_out_of_budget():
+            raise SearchAborted()
+        
+        stand_pat = self.evaluate_board(ply)
+        if (self.model.is_win()[0] or self.quiescence_nodes >= self.quiescence_limit
+                or ply >= MAX_PLY - 1):
+            return stand_pat
+        if is_maximizing:
+            if stand_pat >= beta:
+                return stand_pat
+            alpha = max(alpha, stand_pat)
         else:
-            add_noise = False
-        
-        # Corrigido: usando is_ai_turn, não 1 ou -1 para o parâmetro is_maximizing
-        _, best_move = self.minimax(self.max_depth, float('-inf'), float('inf'), is_ai_turn, add_noise)
-        
-        # Se o melhor movimento for o movimento proibido, escolhe um alternativo
-        if self.model.forbidden_move and best_move == self.model.forbidden_move and self.model.cycle_detected:
-            return self.get_alternative_move()
+            if stand_pat <= alpha:
+                return stand_pat
+            beta = min(beta, stand_pat)
+        self.quiescence_nodes += 1
+        
+        side = 1 if is_maximizing else 0
+        buffer = self.move_buffers[ply]
+        count = self.model.generate_moves(side, buffer)
+        self.ordering.sort(buffer, count, ply, side, self.model)
+        
+        best = stand_pat
+        for move in memoryview(buffer)[:count]:
+            if not move & (CAPTURE_FLAG | DEN_FLAG | TRAP_FLAG):
+                continue
+            start, end = decode_move(move)
+            self.model.make_move(start, end)
+            value = self.quiescence(alpha, beta, not is_maximizing, ply + 1)
+            self.model.unmake_move()
             
-        return best_move
-    
-    def evaluate_move(self, move: tuple) -> float:
-        """Avalia um movimento específico para ordenação (otimizada)"""
-        start, end = move
-        score = 0
-        piece = self.model.game_board[start[0], start[1]]
-        
-        # Movimento para o covil adversário - prioridade máxima absoluta para ambos os jogadores
-        if (self.model.turn == 0 and end == (0, 3)) or (self.model.turn == 1 and end == (6, 2)):
-            return float('inf')  # Prioridade igual para ambos
-        
-        # Movimento para uma célula adjacente ao covil adversário - equalizado para ambos jogadores
-        if self.model.turn == 0:  # Jogador azul
-            if end in [(0, 2), (0, 4), (1, 3)]:  # Células adjacentes ao covil vermelho
-                # Simula o movimento
-                temp_board = self.model.game_board.copy()
-                temp_board[end[0], end[1]] = temp_board[start[0], start[1]]
-                temp_board[start[0], start[1]] = 0
-                
-                # Verifica se a peça estaria segura nesta posição
-                is_safe = True
-                
-                # Como estamos em uma armadilha adversária, verificamos se há peças inimigas adjacentes
-                for dr, dc in Consts.DIRECTIONS:
-                    nr, nc = end[0] + dr, end[1] + dc
-                    if 0 <= nr < 7 and 0 <= nc < 6 and temp_board[nr, nc] < 0:  # Peça inimiga
-                        # Verifica se a peça inimiga pode capturar nossa peça
-                        if self.model.is_self_rank_higher(temp_board[nr, nc], temp_board[end[0], end[1]]):
-                            is_safe = False
-                            break
-                
-                if is_safe:
-                    return float('inf') * 0.995  # Prioridade extremamente alta
-                else:
-                    # Mesmo valor para ambos jogadores
-                    score += 50
-        else:  # Jogador vermelho
-            if end in [(6, 1), (6, 3), (5, 2)]:  # Células adjacentes ao covil azul
-                # Simula o movimento
-                temp_board = self.model.game_board.copy()
-                temp_board[end[0], end[1]] = temp_board[start[0], start[1]]
-                temp_board[start[0], start[1]] = 0
-                
-                # Verifica se a peça estaria segura nesta posição
-                is_safe = True
-                
-                # Como estamos em uma armadilha adversária, verificamos se há peças inimigas adjacentes
-                for dr, dc in Consts.DIRECTIONS:
-                    nr, nc = end[0] + dr, end[1] + dc
-                    if 0 <= nr < 7 and 0 <= nc < 6 and temp_board[nr, nc] > 0:  # Peça inimiga
-                        # Verifica se a peça inimiga pode capturar nossa peça
-                        if self.model.is_self_rank_higher(temp_board[nr, nc], temp_board[end[0], end[1]]):
-                            is_safe = False
-                            break
-                
-                if is_safe:
-                    return float('inf') * 0.995  # Prioridade extremamente alta
-                else:
-                    # Mesmo valor para ambos jogadores
-                    score += 50
-        
-        # Células a duas casas de distância do covil - equilibrado para ambos jogadores
-        covil_vermelho_proximidade2 = [(0, 1), (0, 5), (1, 2), (1, 4), (2, 3)]
-        covil_azul_proximidade2 = [(6, 0), (6, 4), (5, 1), (5, 3), (4, 2)]
-        
-        if self.model.turn == 0 and end in covil_vermelho_proximidade2:  # Jogador azul perto do covil vermelho
-            # Verifica se há um caminho livre até uma célula adjacente ao covil
-            has_path_to_den = False
-            for dr, dc in Consts.DIRECTIONS:
-                nr, nc = end[0] + dr, end[1] + dc
-                if (nr, nc) in [(0, 2), (0, 4), (1, 3)] and self.model.is_valid_move(end, (nr, nc)):
-                    has_path_to_den = True
-                    break
-            
-            if has_path_to_den:
-                score += 500  # Mesmo valor para ambos jogadores
-        elif self.model.turn == 1 and end in covil_azul_proximidade2:  # Jogador vermelho perto do covil azul
-            # Verifica se há um caminho livre até uma célula adjacente ao covil
-            has_path_to_den = False
-            for dr, dc in Consts.DIRECTIONS:
-                nr, nc = end[0] + dr, end[1] + dc
-                if (nr, nc) in [(6, 1), (6, 3), (5, 2)] and self.model.is_valid_move(end, (nr, nc)):
-                    has_path_to_den = True
-                    break
-            
-            if has_path_to_den:
-                score += 500  # Mesmo valor para ambos jogadores
-        
-        # Captura de peça - equilibrada para ambos jogadores
-        if self.model.game_board[end[0], end[1]] != 0:
-            captured_piece = abs(self.model.game_board[end[0], end[1]])
-            score += self.piece_values[captured_piece] * 2.0
-        
-        # Movimento em direção à toca adversária - equilibrado para ambos jogadores
-        if piece < 0:  # Peças vermelhas
-            dist_before = abs(start[0] - self.dens[1][0]) + abs(start[1] - self.dens[1][1])
-            dist_after = abs(end[0] - self.dens[1][0]) + abs(end[1] - self.dens[1][1])
-            if dist_after < dist_before:
-                score += 60 * (dist_before - dist_after)
-                # Bônus progressivo baseado na proximidade ao covil
-                score += (7 - dist_after) * 25
-                # Bônus extra para movimentos que aproximam a peça para 2 ou 3 células de distância do covil
-                if dist_after == 1:
-                    score += 250
-                elif dist_after == 2:
-                    score += 150
-                elif dist_after == 3:
-                    score += 100
-                elif dist_after == 4:
-                    score += 70
-            # Penalidade para movimentos que se afastam do covil
-            elif dist_after > dist_before:
-                score -= 50 * (dist_after - dist_before)
-        else:  # Peças azuis - valores iguais ao vermelho
-            dist_before = abs(start[0] - self.dens[0][0]) + abs(start[1] - self.dens[0][1])
-            dist_after = abs(end[0] - self.dens[0][0]) + abs(end[1] - self.dens[0][1])
-            if dist_after < dist_before:
-                score += 60 * (dist_before - dist_after)  # Mesmo valor que o vermelho
-                # Bônus progressivo baseado na proximidade ao covil
-                score += (7 - dist_after) * 25  # Mesmo valor que o vermelho
-                # Bônus extra para movimentos que aproximam a peça para 2 ou 3 células de distância do covil
-                if dist_after == 1:
-                    score += 250  # Mesmo valor que o vermelho
-                elif dist_after == 2:
-                    score += 150  # Mesmo valor que o vermelho
-                elif dist_after == 3:
-                    score += 100  # Mesmo valor que o vermelho
-                elif dist_after == 4:
-                    score += 70  # Mesmo valor que o vermelho
-            # Penalidade para movimentos que se afastam do covil
-            elif dist_after > dist_before:
-                score -= 50 * (dist_after - dist_before)  # Mesmo valor que o vermelho
-        
-        # Movimento para o centro (novo)
-        center_positions = [(3, 2), (3, 3)]
-        if end in center_positions:
-            score += 4  # Ligeiro Aumento
-        
-        # Movimento que protege peças valiosas (novo)
-        if abs(piece) >= 6:  # Tigre, Leão e Elefante
-            if self.model.is_piece_safe_in_trap(end, piece):
-                if abs(piece) == 8:  # Se for o Elefante
-                    score += 20  # Bônus muito maior para proteger o elefante
-                else:
-                    score += 7  # Mantém o bônus original para outras peças valiosas
-            
-            # Verifica se há aliados próximos para proteção
-            allies_nearby = 0
-            for dr, dc in Consts.DIRECTIONS:
-                nr, nc = end[0] + dr, end[1] + dc
-                if (0 <= nr < 7 and 0 <= nc < 6):
-                    nearby_piece = self.model.game_board[nr, nc]
-                    if (piece < 0 and nearby_piece < 0) or (piece > 0 and nearby_piece > 0):  # Se for aliado
-                        allies_nearby += 1
-            
-            if abs(piece) == 8:  # Se for o Elefante
-                score += allies_nearby * 15  # Bônus significativo por ter aliados próximos
+            if is_maximizing:
+                best = max(best, value)
+                alpha = max(alpha, value)
             else:
-                score += allies_nearby * 5  # Bônus menor para outras peças valiosas
-            
-            # Penalidade extra para mover o elefante para posições perigosas
-            if abs(piece) == 8:
-                enemies_nearby = 0
-                for dr, dc in Consts.DIRECTIONS:
-                    nr, nc = end[0] + dr, end[1] + dc
-                    if (0 <= nr < 7 and 0 <= nc < 6):
-                        nearby_piece = self.model.game_board[nr, nc]
-                        if (piece < 0 and nearby_piece > 0) or (piece > 0 and nearby_piece < 0):  # Se for inimigo
-                            if abs(nearby_piece) == 1:  # Se for um rato
-                                enemies_nearby += 3  # Penalidade extra por ratos próximos
-                            else:
-                                enemies_nearby += 1
-                
-                if enemies_nearby > allies_nearby:
-                    score -= (enemies_nearby - allies_nearby) * 25  # Penalidade significativa por ter mais inimigos que aliados
-        
-        # Movimento que ameaça peças valiosas (novo)
-        for dir in Consts.DIRECTIONS:
-            threat_pos = (end[0] + dir[0], end[1] + dir[1])
-            if (0 <= threat_pos[0] < 7 and 0 <= threat_pos[1] < 6):
-                threat_piece = self.model.game_board[threat_pos[0], threat_pos[1]]
-                if threat_piece != 0 and abs(threat_piece) >= 6:
-                    if (piece < 0 and threat_piece > 0) or (piece > 0 and threat_piece < 0):
-                        if self.model.is_self_rank_higher(piece, threat_piece):
-                            score += 8  # Ligeiro Aumento
-        
-        return score
+                best = min(best, value)
+                beta = min(beta, value)
+            if beta <= alpha:
+                break
+        return best
 
-    def get_alternative_move(self) -> tuple:
-        """Retorna um movimento alternativo quando o melhor movimento está proibido, priorizando movimentos em direção ao covil"""
-        # Obtém todas as jogadas possíveis
-        possible_moves = []
-        for i in range(7):
-            for j in range(6):
-                piece = self.model.game_board[i, j]
-                if (piece < 0 and self.model.turn == 1) or (piece > 0 and self.model.turn == 0):
-                    moves = self.model.get_possible_moves((i, j))
-                    if moves:
-                        for move in moves:
-                            possible_moves.append(((i, j), move))
-        
-        # Remove o movimento proibido da lista
-        if self.model.forbidden_move:
-            if self.model.forbidden_move in possible_moves:
-                possible_moves.remove(self.model.forbidden_move)
-        
-        # Se não houver movimentos alternativos, retorna None
-        if not possible_moves:
-            return None
-        
-        # Verifica se algum movimento leva diretamente ao covil
-        for start, end in possible_moves:
-            if (self.model.turn == 0 and end == (0, 3)) or (self.model.turn == 1 and end == (6, 2)):
-                return (start, end)
+    def search_root(self, depth: int, add_noise: bool) -> tuple:
+        """Pesquisa a raiz com a janela completa
+
+        Args:
+            depth (int): profundidade da iteração
+            add_noise (bool): adiciona ruído às avaliações das folhas
+
+        Returns:
+            tuple: (valor do ponto de vista do vermelho, melhor jogada codificada)
+        """
+        # O vermelho (turn == 1) maximiza, o azul minimiza
+        return self.minimax(depth, float('-inf'), float('inf'), self.model.turn == 1, add_noise)
+
+    def search_root_move(self, move: int, depth: int, alpha: float, add_noise: bool = False) -> float:
+        """Pesquisa uma única jogada da raiz (usado pela pesquisa paralela)
+
+        Args:
+            move (int): jogada codificada
+            depth (int): profundidade da iteração
+            alpha (float): melhor valor já conhecido na raiz, do ponto de vista de quem joga
+            add_noise (bool): adiciona ruído às avaliações das folhas (default: False)
+
+        Returns:
+            float: valor da jogada do ponto de vista de quem joga (um limite superior se não passar alfa)
+        """
+        is_maximizing = self.model.turn == 1
+        start, end = decode_move(move)
+        self.model.make_move(start, end)
+        self.ordering.played[0] = move
+        if is_maximizing:
+            value, _ = self.minimax(depth - 1, alpha, float('inf'), False, add_noise, 1)
+        else:
+            value, _ = self.minimax(depth - 1, float('-inf'), -alpha, True, add_noise, 1)
+            value = -value
         
-        # Avalia e ordena os movimentos
-        scored_moves = [(self.evaluate_move((start, end)), (start, end)) for start, end in possible_moves]
-        scored_moves.sort(reverse=True)  # Ordena por pontuação, do maior para o menor
+        # Penaliza movimentos que levam a estados repetidos
+        if self.model.is_repeated_position():
+            value -= self.repetition_penalty()
         
-        # Retorna o melhor movimento alternativo
-        return scored_moves[0][1]
+        self.model.unmake_move()
+        return value
 
 
 class RandomAI:
@@ -1152,15 +969,9 @@ class RandomAI:
         """Retorna uma jogada aleatória válida"""
         # Obtém todas as jogadas possíveis para a IA
         possible_moves = []
-        for i in range(7):
-            for j in range(6):
-                piece = self.model.game_board[i, j]
-                # Verifica se a peça pertence ao jogador atual
-                if (piece < 0 and self.model.turn == 1) or (piece > 0 and self.model.turn == 0):
-                    moves = self.model.get_possible_moves((i, j))
-                    if moves:
-                        for move in moves:
-                            possible_moves.append(((i, j), move))
+        for pos in sorted(self.model.side_pieces[self.model.turn]):
+            for move in self.model.get_possible_moves(pos):
+                possible_moves.append((pos, move))
         
         # Se não houver movimentos possíveis, retorna None
         if not possible_moves:
@@ -1173,14 +984,9 @@ class RandomAI:
         """Retorna um movimento alternativo quando o melhor movimento está proibido"""
         # Obtém todas as jogadas possíveis
         possible_moves = []
-        for i in range(7):
-            for j in range(6):
-                piece = self.model.game_board[i, j]
-                if (piece < 0 and self.model.turn == 1) or (piece > 0 and self.model.turn == 0):
-                    moves = self.model.get_possible_moves((i, j))
-                    if moves:
-                        for move in moves:
-                            possible_moves.append(((i, j), move))
+        for pos in sorted(self.model.side_pieces[self.model.turn]):
+            for move in self.model.get_possible_moves(pos):
+                possible_moves.append((pos, move))
         
         # Remove o movimento proibido da lista
         if self.model.forbidden_move:
@@ -1195,152 +1001,79 @@ class RandomAI:
         return random.choice(possible_moves)
 
 
-class NegamaxAI:
-    def __init__(self, model: Model, depth: int = 4):
-        self.model = model
-        self.max_depth = depth
-        self.position_cache = {}
-        
-        # Valores das peças (otimizados)
-        self.piece_values = {
-            1: 6,   # Rato
-            2: 3,   # Gato
-            3: 4,   # Cão
-            4: 5,   # Lobo
-            5: 6,   # Leopardo
-            6: 7,   # Tigre
-            7: 8,   # Leão
-            8: 15   # Elefante - Valor aumentado significativamente
-        }
-        
-        # Posições das armadilhas
-        self.traps = [
-            (0, 2), (0, 4), (1, 3),  # Armadilhas vermelhas
-            (6, 1), (6, 3), (5, 2)   # Armadilhas azuis
-        ]
-        
-        # Posições das tocas
-        self.dens = [(0, 3), (6, 2)]  # (vermelho, azul)
-        
-        # Limite de movimentos para poda
-        self.move_limit = 20
-
-    def evaluate_board(self) -> float:
-        """Avalia o estado atual do tabuleiro"""
-        board_key = hash(self.model.game_board.tobytes())
-        if board_key in self.position_cache:
-            return self.position_cache[board_key]
-            
-        score = 0
-        
-        # Verifica se o jogo terminou
-        if self.model.is_win()[0]:
-            if self.model.is_win()[1] == 'Vermelho':
-                return float('inf')
-            else:
-                return float('-inf')
+class NegamaxAI(SearchEngine):
+    """IA Negamax com cortes alfa-beta, PVS e janelas de aspiração opcionais; os valores são do ponto de vista de quem joga"""
 
-        # Avaliação de material
-        for i in range(7):
-            for j in range(6):
-                piece = self.model.game_board[i, j]
-                if piece != 0:
-                    value = self.piece_values[abs(piece)]
-                    if piece < 0:  # Peça vermelha (AI)
-                        score += value  # Mesmo peso para ambos jogadores
-                    else:  # Peça azul
-                        score -= value
-        
-        # Avaliação de posição (melhorada para priorizar o covil)
-        closest_red_to_blue_den = float('inf')  # Distância da peça vermelha mais próxima ao covil azul
-        closest_blue_to_red_den = float('inf')  # Distância da peça azul mais próxima ao covil vermelho
-        
-        # Pontuação por proximidade ao covil adversário
-        for i in range(7):
-            for j in range(6):
-                piece = self.model.game_board[i, j]
-                if piece != 0:
-                    if piece < 0:  # Peça vermelha (AI)
-                        dist_to_den = abs(i - self.dens[1][0]) + abs(j - self.dens[1][1])
-                        # Guarda a distância da peça mais próxima ao covil
-                        closest_red_to_blue_den = min(closest_red_to_blue_den, dist_to_den)
-                        
-                        # Pontuação progressiva baseada na proximidade
-                        proximity_score = (8 - dist_to_den) * 6.0
-                        score += proximity_score
-                        
-                        # Bônus adicional para peças muito próximas ao covil
-                        if dist_to_den <= 1:
-                            score += 500
-                        elif dist_to_den <= 2:
-                            score += 200
-                        elif dist_to_den <= 3:
-                            score += 120
-                        elif dist_to_den <= 4:
-                            score += 80
-                    else:  # Peça azul
-                        dist_to_den = abs(i - self.dens[0][0]) + abs(j - self.dens[0][1])
-                        # Guarda a distância da peça mais próxima ao covil
-                        closest_blue_to_red_den = min(closest_blue_to_red_den, dist_to_den)
-                        
-                        # Pontuação progressiva baseada na proximidade (mesmo valor que o vermelho)
-                        proximity_score = (8 - dist_to_den) * 6.0
-                        score -= proximity_score
-                        
-                        # Bônus adicional para peças muito próximas ao covil (mesmo valor que o vermelho)
-                        if dist_to_den <= 1:
-                            score -= 500
-                        elif dist_to_den <= 2:
-                            score -= 200
-                        elif dist_to_den <= 3:
-                            score -= 120
-                        elif dist_to_den <= 4:
-                            score -= 80
+    def __init__(self, model: Model, depth: int = 4, time_limit: float = None, node_limit: int = None,
+                 pvs: bool = True, aspiration: bool = False, null_move: bool = False, lmr: bool = False,
+                 workers: int = 1, evaluator: Evaluator = None):
+        super().__init__(model, depth, time_limit, node_limit, null_move, lmr, workers, evaluator)
         
-        # Bônus para vantagem na corrida para os covis - equilibrado para ambos jogadores
-        if closest_red_to_blue_den < closest_blue_to_red_den:
-            race_advantage = closest_blue_to_red_den - closest_red_to_blue_den
-            score += race_advantage * 80
-        elif closest_blue_to_red_den < closest_red_to_blue_den:
-            race_advantage = closest_red_to_blue_den - closest_blue_to_red_den
-            score -= race_advantage * 80  # Mesmo valor que o vermelho
-            
-        # Armazena em cache e retorna
-        self.position_cache[board_key] = score
-        return score
-
-    def get_all_possible_moves(self, is_ai_turn: bool) -> list:
-        """Retorna todas as possíveis jogadas para o jogador atual"""
-        moves = []
-        for i in range(7):
-            for j in range(6):
-                piece = self.model.game_board[i, j]
-                # Verifica se a peça pertence ao jogador atual
-                if (is_ai_turn and piece < 0) or (not is_ai_turn and piece > 0):
-                    possible_moves = self.model.get_possible_moves((i, j))
-                    if possible_moves:
-                        moves.extend(((i, j), move) for move in possible_moves)
+        # Principal variation search: janela nula para todas as jogadas exceto a primeira
+        self.pvs = pvs
         
-        moves.sort(key=lambda x: self.evaluate_move(x), reverse=is_ai_turn)
-        return moves[:self.move_limit]
+        # Janelas de aspiração na raiz, centradas no valor da iteração anterior
+        self.aspiration = aspiration
+        self.aspiration_window = 50
 
-    def negamax(self, depth: int, alpha: float, beta: float, color: int, add_noise: bool = False) -> tuple:
+    def negamax(self, depth: int, alpha: float, beta: float, color: int, add_noise: bool = False,
+                ply: int = 0) -> tuple:
         """Implementa o algoritmo Negamax com cortes alfa-beta"""
+        # Conta o nó e aborta se o orçamento acabou (nunca durante a primeira iteração)
+        self.nodes += 1
+        if ply > self.stats.max_depth:
+            self.stats.max_depth = ply
+        if self.completed_depth > 0 and self.is_out_of_budget():
+            raise SearchAborted()
+        
         if depth == 0 or self.model.is_win()[0]:
-            result = color * self.evaluate_board()
+            if depth == 0 and self.quiescence_limit > 0:
+                # Resolve as capturas e ameaças pendentes antes de avaliar
+                self.quiescence_nodes = 0
+                result = self.quiescence(alpha, beta, color, ply)
+            else:
+                result = color * self.evaluate_board(ply)
             # Adiciona um pequeno ruído aleatório para quebrar empates e evitar loops
             if add_noise and depth == 0:
-                result += random.uniform(-self.model.random_factor, self.model.random_factor) * 100 * abs(color)
+                result += self.leaf_noise()
             return result, None
         
-        moves = self.get_all_possible_moves(color > 0)
+        # Nas posições das tabelas de finais o valor é exato e não é preciso pesquisar
+        if ply > 0 and self.tablebase is not None:
+            score = self.tablebase_score(1 if color > 0 else 0, ply)
+            if score is not None:
+                return color * score, None
+        
+        # Consulta a tabela de transposição: corte direto ou melhor jogada para pesquisar primeiro
+        key = self.model.zobrist_key
+        alpha_orig = alpha
+        entry = self.probe_tt(key, ply)
+        tt_move = None
+        if entry is not None:
+            if ply > 0 and self.tt.cutoff(entry, depth, alpha, beta):
+                return entry[2], entry[4]
+            tt_move = entry[4]
+        
+        # Null move: se mesmo passando a vez o adversário não consegue baixar de beta, corta já
+        if beta != float('inf') and self.can_try_null_move(1 if color > 0 else 0, depth, ply):
+            self.model.make_null_move()
+            self.ordering.played[ply] = 0
+            value, _ = self.negamax(depth - 1 - self.null_move_reduction, -beta, -beta + self.null_window, -color,
+                                    add_noise, ply + 1)
+            value = -value
+            self.model.unmake_move()
+            if value >= beta:
+                return value, None
+        
+        moves = self.get_all_possible_moves(color > 0, ply, tt_move)
         
         # Remove o movimento proibido da lista, se existir
         if self.model.forbidden_move and self.model.cycle_detected:
-            moves = [move for move in moves if move != self.model.forbidden_move]
+            forbidden = encode_move(*self.model.forbidden_move)
+            moves = [move for move in moves if move & MOVE_MASK != forbidden]
             
         if not moves:
-            return color * self.evaluate_board(), None
+            return color * self.evaluate_board(ply), None
             
         best_value = float('-inf')
         best_move = moves[0] if moves else None
@@ -1349,297 +1082,150 @@ class NegamaxAI:
         if self.model.cycle_detected:
             random.shuffle(moves)
         
-        for start, end in moves:
+        for index, move in enumerate(moves):
+            start, end = decode_move(move)
             # Faz a jogada
-            piece_value = self.model.game_board[end[0], end[1]]
-            self.model.game_board[end[0], end[1]] = self.model.game_board[start[0], start[1]]
-            self.model.game_board[start[0], start[1]] = 0
+            self.model.make_move(start, end)
+            self.ordering.played[ply] = move
             
-            # Avalia a jogada
-            value, _ = self.negamax(depth - 1, -beta, -alpha, -color, add_noise)
-            value = -value
+            # Avalia a jogada: com PVS, só a primeira usa a janela completa; as restantes são testadas
+            # com uma janela nula e só voltam a ser pesquisadas se forem melhores do que alfa.
+            # As jogadas calmas tardias são testadas primeiro com menos um nível de profundidade.
+            reduction = 1 if self.is_reducible(move, index, depth, alpha) else 0
+            if (self.pvs or reduction) and index > 0 and alpha != float('-inf'):
+                value, _ = self.negamax(depth - 1 - reduction, -alpha - self.null_window, -alpha, -color,
+                                        add_noise, ply + 1)
+                value = -value
+                if reduction and value > alpha:
+                    value, _ = self.negamax(depth - 1, -alpha - self.null_window, -alpha, -color, add_noise, ply + 1)
+                    value = -value
+                if alpha < value < beta:
+                    value, _ = self.negamax(depth - 1, -beta, -alpha, -color, add_noise, ply + 1)
+                    value = -value
+            else:
+                value, _ = self.negamax(depth - 1, -beta, -alpha, -color, add_noise, ply + 1)
+                value = -value
             
             # Penaliza movimentos que levam a estados repetidos
-            current_state = self.model.game_board.tobytes()
-            if current_state in self.model.board_states:
-                value -= self.model.random_factor * 50 * abs(color)  # Penalidade proporcional ao fator de aleatoriedade
+            if self.model.is_repeated_position():
+                value -= self.repetition_penalty()
             
             # Desfaz a jogada
-            self.model.game_board[start[0], start[1]] = self.model.game_board[end[0], end[1]]
-            self.model.game_board[end[0], end[1]] = piece_value
+            self.model.unmake_move()
             
             if value > best_value:
                 best_value = value
-                best_move = (start, end)
+                best_move = move
             
             alpha = max(alpha, value)
             if alpha >= beta:
+                self.ordering.record_cutoff(move, ply, 1 if color > 0 else 0, depth)
+                self.stats.record_cutoff(index)
                 break
-                
+        
+        bound = UPPER if best_value <= alpha_orig else LOWER if best_value >= beta else EXACT
+        self.store_tt(key, depth, best_value, bound, best_move, ply)
         return best_value, best_move
 
-    def evaluate_move(self, move: tuple) -> float:
-        """Avalia um movimento específico para ordenação (otimizada)"""
-        start, end = move
-        score = 0
-        piece = self.model.game_board[start[0], start[1]]
-        
-        # Movimento para o covil adversário - prioridade máxima absoluta para ambos os jogadores
-        if (self.model.turn == 0 and end == (0, 3)) or (self.model.turn == 1 and end == (6, 2)):
-            return float('inf')  # Prioridade igual para ambos
-        
-        # Movimento para uma célula adjacente ao covil adversário - equalizado para ambos jogadores
-        if self.model.turn == 0:  # Jogador azul
-            if end in [(0, 2), (0, 4), (1, 3)]:  # Células adjacentes ao covil vermelho
-                # Simula o movimento
-                temp_board = self.model.game_board.copy()
-                temp_board[end[0], end[1]] = temp_board[start[0], start[1]]
-                temp_board[start[0], start[1]] = 0
-                
-                # Verifica se a peça estaria segura nesta posição
-                is_safe = True
-                
-                # Como estamos em uma armadilha adversária, verificamos se há peças inimigas adjacentes
-                for dr, dc in Consts.DIRECTIONS:
-                    nr, nc = end[0] + dr, end[1] + dc
-                    if 0 <= nr < 7 and 0 <= nc < 6 and temp_board[nr, nc] < 0:  # Peça inimiga
-                        # Verifica se a peça inimiga pode capturar nossa peça
-                        if self.model.is_self_rank_higher(temp_board[nr, nc], temp_board[end[0], end[1]]):
-                            is_safe = False
-                            break
-                
-                if is_safe:
-                    return float('inf') * 0.995  # Prioridade extremamente alta
-                else:
-                    # Mesmo valor para ambos jogadores
-                    score += 50
-        else:  # Jogador vermelho
-            if end in [(6, 1), (6, 3), (5, 2)]:  # Células adjacentes ao covil azul
-                # Simula o movimento
-                temp_board = self.model.game_board.copy()
-                temp_board[end[0], end[1]] = temp_board[start[0], start[1]]
-                temp_board[start[0], start[1]] = 0
-                
-                # Verifica se a peça estaria segura nesta posição
-                is_safe = True
-                
-                # Como estamos em uma armadilha adversária, verificamos se há peças inimigas adjacentes
-                for dr, dc in Consts.DIRECTIONS:
-                    nr, nc = end[0] + dr, end[1] + dc
-                    if 0 <= nr < 7 and 0 <= nc < 6 and temp_board[nr, nc] > 0:  # Peça inimiga
-                        # Verifica se a peça inimiga pode capturar nossa peça
-                        if self.model.is_self_rank_higher(temp_board[nr, nc], temp_board[end[0], end[1]]):
-                            is_safe = False
-                            break
-                
-                if is_safe:
-                    return float('inf') * 0.995  # Prioridade extremamente alta
-                else:
-                    # Mesmo valor para ambos jogadores
-                    score += 50
-        
-        # Células a duas casas de distância do covil - equilibrado para ambos jogadores
-        covil_vermelho_proximidade2 = [(0, 1), (0, 5), (1, 2), (1, 4), (2, 3)]
-        covil_azul_proximidade2 = [(6, 0), (6, 4), (5, 1), (5, 3), (4, 2)]
-        
-        if self.model.turn == 0 and end in covil_vermelho_proximidade2:  # Jogador azul perto do covil vermelho
-            # Verifica se há um caminho livre até uma célula adjacente ao covil
-            has_path_to_den = False
-            for dr, dc in Consts.DIRECTIONS:
-                nr, nc = end[0] + dr, end[1] + dc
-                if (nr, nc) in [(0, 2), (0, 4), (1, 3)] and self.model.is_valid_move(end, (nr, nc)):
-                    has_path_to_den = True
-                    break
-            
-            if has_path_to_den:
-                score += 500  # Mesmo valor para ambos jogadores
-        elif self.model.turn == 1 and end in covil_azul_proximidade2:  # Jogador vermelho perto do covil azul
-            # Verifica se há um caminho livre até uma célula adjacente ao covil
-            has_path_to_den = False
-            for dr, dc in Consts.DIRECTIONS:
-                nr, nc = end[0] + dr, end[1] + dc
-                if (nr, nc) in [(6, 1), (6, 3), (5, 2)] and self.model.is_valid_move(end, (nr, nc)):
-                    has_path_to_den = True
-                    break
-            
-            if has_path_to_den:
-                score += 500  # Mesmo valor para ambos jogadores
-        
-        # Captura de peça - equilibrada para ambos jogadores
-        if self.model.game_board[end[0], end[1]] != 0:
-            captured_piece = abs(self.model.game_board[end[0], end[1]])
-            score += self.piece_values[captured_piece] * 2.0
-        
-        # Movimento em direção à toca adversária - equilibrado para ambos jogadores
-        if piece < 0:  # Peças vermelhas
-            dist_before = abs(start[0] - self.dens[1][0]) + abs(start[1] - self.dens[1][1])
-            dist_after = abs(end[0] - self.dens[1][0]) + abs(end[1] - self.dens[1][1])
-            if dist_after < dist_before:
-                score += 60 * (dist_before - dist_after)
-                # Bônus progressivo baseado na proximidade ao covil
-                score += (7 - dist_after) * 25
-                # Bônus extra para movimentos que aproximam a peça para 2 ou 3 células de distância do covil
-                if dist_after == 1:
-                    score += 250
-                elif dist_after == 2:
-                    score += 150
-                elif dist_after == 3:
-                    score += 100
-                elif dist_after == 4:
-                    score += 70
-            # Penalidade para movimentos que se afastam do covil
-            elif dist_after > dist_before:
-                score -= 50 * (dist_after - dist_before)
-        else:  # Peças azuis - valores iguais ao vermelho
-            dist_before = abs(start[0] - self.dens[0][0]) + abs(start[1] - self.dens[0][1])
-            dist_after = abs(end[0] - self.dens[0][0]) + abs(end[1] - self.dens[0][1])
-            if dist_after < dist_before:
-                score += 60 * (dist_before - dist_after)  # Mesmo valor que o vermelho
-                # Bônus progressivo baseado na proximidade ao covil
-                score += (7 - dist_after) * 25  # Mesmo valor que o vermelho
-                # Bônus extra para movimentos que aproximam a peça para 2 ou 3 células de distância do covil
-                if dist_after == 1:
-                    score += 250  # Mesmo valor que o vermelho
-                elif dist_after == 2:
-                    score += 150  # Mesmo valor que o vermelho
-                elif dist_after == 3:
-                    score += 100  # Mesmo valor que o vermelho
-                elif dist_after == 4:
-                    score += 70  # Mesmo valor que o vermelho
-            # Penalidade para movimentos que se afastam do covil
-            elif dist_after > dist_before:
-                score -= 50 * (dist_after - dist_before)  # Mesmo valor que o vermelho
-        
-        # Movimento para o centro (novo)
-        center_positions = [(3, 2), (3, 3)]
-        if end in center_positions:
-            score += 4  # Ligeiro Aumento
-        
-        # Movimento que protege peças valiosas (novo)
-        if abs(piece) >= 6:  # Tigre, Leão e Elefante
-            if self.model.is_piece_safe_in_trap(end, piece):
-                if abs(piece) == 8:  # Se for o Elefante
-                    score += 20  # Bônus muito maior para proteger o elefante
-                else:
-                    score += 7  # Mantém o bônus original para outras peças valiosas
-            
-            # Verifica se há aliados próximos para proteção
-            allies_nearby = 0
-            for dr, dc in Consts.DIRECTIONS:
-                nr, nc = end[0] + dr, end[1] + dc
-                if (0 <= nr < 7 and 0 <= nc < 6):
-                    nearby_piece = self.model.game_board[nr, nc]
-                    if (piece < 0 and nearby_piece < 0) or (piece > 0 and nearby_piece > 0):  # Se for aliado
-                        allies_nearby += 1
-            
-            if abs(piece) == 8:  # Se for o Elefante
-                score += allies_nearby * 15  # Bônus significativo por ter aliados próximos
-            else:
-                score += allies_nearby * 5  # Bônus menor para outras peças valiosas
-            
-            # Penalidade extra para mover o elefante para posições perigosas
-            if abs(piece) == 8:
-                enemies_nearby = 0
-                for dr, dc in Consts.DIRECTIONS:
-                    nr, nc = end[0] + dr, end[1] + dc
-                    if (0 <= nr < 7 and 0 <= nc < 6):
-                        nearby_piece = self.model.game_board[nr, nc]
-                        if (piece < 0 and nearby_piece > 0) or (piece > 0 and nearby_piece < 0):  # Se for inimigo
-                            if abs(nearby_piece) == 1:  # Se for um rato
-                                enemies_nearby += 3  # Penalidade extra por ratos próximos
-                            else:
-                                enemies_nearby += 1
-                
-                if enemies_nearby > allies_nearby:
-                    score -= (enemies_nearby - allies_nearby) * 25  # Penalidade significativa por ter mais inimigos que aliados
-        
-        # Movimento que ameaça peças valiosas (novo)
-        for dir in Consts.DIRECTIONS:
-            threat_pos = (end[0] + dir[0], end[1] + dir[1])
-            if (0 <= threat_pos[0] < 7 and 0 <= threat_pos[1] < 6):
-                threat_piece = self.model.game_board[threat_pos[0], threat_pos[1]]
-                if threat_piece != 0 and abs(threat_piece) >= 6:
-                    if (piece < 0 and threat_piece > 0) or (piece > 0 and threat_piece < 0):
-                        if self.model.is_self_rank_higher(piece, threat_piece):
-                            score += 8  # Ligeiro Aumento
-        
-        return score
 
-    def get_best_move(self) -> tuple:
-        """Retorna a melhor jogada para a IA"""
-        # Verifica primeiro se há um movimento vitorioso direto
-        all_moves = self.get_all_possible_moves(self.model.turn == 1)
-        
-        # Remove o movimento proibido da lista, se existir
-        if self.model.forbidden_move and self.model.cycle_detected:
-            all_moves = [move for move in all_moves if move != self.model.forbidden_move]
-        
-        # Se depois de remover o movimento proibido não sobrar nenhum movimento, 
-        # retornamos todos os movimentos novamente
-        if not all_moves:
-            all_moves = self.get_all_possible_moves(self.model.turn == 1)
-        
-        for start, end in all_moves:
-            # Verifica se pode entrar no covil adversário
-            if (self.model.turn == 0 and end == (0, 3)) or (self.model.turn == 1 and end == (6, 2)):
-                return (start, end)
-            
-            # Ou verifica se o movimento é vitorioso usando o método is_winning_move
-            if self.model.is_winning_move(start, end):
-                return (start, end)
-                
-        # Se não houver movimento vitorioso, continua com a lógica normal
-        self.position_cache.clear()
-        # Determina se é o turno da IA baseado no turno atual
-        is_ai_turn = self.model.turn == 1  # Se turn == 1, é o turno da IA vermelha
-        
-        # Adiciona um pouco de aleatoriedade para evitar ficar preso em padrões
-        if self.model.cycle_detected:
-            # Adiciona uma pequena perturbação aleatória à avaliação
-            add_noise = True
-        else:
-            add_noise = False
-            
-        # Corrigido: usando o color adequado para o negamax com base no turno atual
-        color = 1 if is_ai_turn else -1
-        _, best_move = self.negamax(self.max_depth, float('-inf'), float('inf'), color, add_noise)
-        
-        # Se o melhor movimento for o movimento proibido, escolhe um alternativo
-        if self.model.forbidden_move and best_move == self.model.forbidden_move and self.model.cycle_detected:
-            return self.get_alternative_move()
+    def quiescence(self, alpha: float, beta: float, color: int, ply: int) -> float:
+        """Continua a pesquisa nas folhas só com capturas e entradas em tocas ou armadilhas inimigas
+
+        Args:
+            alpha (float): limite inferior da janela
+            beta (float): limite superior da janela
+            color (int): 1 se joga o vermelho, -1 se joga o azul
+            ply (int): distância à raiz
+
+        Returns:
+            float: avaliação da posição do ponto de vista de quem joga
+        """
+        self.nodes += 1
+        if ply > self.stats.max_depth:
+            self.stats.max_depth = ply
+        if self.completed_depth > 0 and self.is_out_of_budget():
+            raise SearchAborted()
+        
+        # Stand-pat: quem joga pode ficar com a avaliação estática
+        stand_pat = color * self.evaluate_board(ply)
+        if (self.model.is_win()[0] or stand_pat >= beta or self.quiescence_nodes >= self.quiescence_limit
+                or ply >= MAX_PLY - 1):
+            return stand_pat
+        alpha = max(alpha, stand_pat)
+        self.quiescence_nodes += 1
+        
+        side = 1 if color > 0 else 0
+        buffer = self.move_buffers[ply]
+        count = self.model.generate_moves(side, buffer)
+        self.ordering.sort(buffer, count, ply, side, self.model)
+        
+        best = stand_pat
+        for move in memoryview(buffer)[:count]:
+            if not move & (CAPTURE_FLAG | DEN_FLAG | TRAP_FLAG):
+                continue
+            start, end = decode_move(move)
+            self.model.make_move(start, end)
+            value = -self.quiescence(-beta, -alpha, -color, ply + 1)
+            self.model.unmake_move()
             
-        return best_move
+            best = max(best, value)
+            alpha = max(alpha, value)
+            if alpha >= beta:
+                break
+        return best
 
-    def get_alternative_move(self) -> tuple:
-        """Retorna um movimento alternativo quando o melhor movimento está proibido, priorizando movimentos em direção ao covil"""
-        # Obtém todas as jogadas possíveis
-        possible_moves = []
-        for i in range(7):
-            for j in range(6):
-                piece = self.model.game_board[i, j]
-                if (piece < 0 and self.model.turn == 1) or (piece > 0 and self.model.turn == 0):
-                    moves = self.model.get_possible_moves((i, j))
-                    if moves:
-                        for move in moves:
-                            possible_moves.append(((i, j), move))
-        
-        # Remove o movimento proibido da lista
-        if self.model.forbidden_move:
-            if self.model.forbidden_move in possible_moves:
-                possible_moves.remove(self.model.forbidden_move)
-        
-        # Se não houver movimentos alternativos, retorna None
-        if not possible_moves:
-            return None
-        
-        # Verifica se algum movimento leva diretamente ao covil
-        for start, end in possible_moves:
-            if (self.model.turn == 0 and end == (0, 3)) or (self.model.turn == 1 and end == (6, 2)):
-                return (start, end)
+    def search_root(self, depth: int, add_noise: bool) -> tuple:
+        """Pesquisa a raiz com uma janela de aspiração centrada no valor da iteração anterior
+
+        Se o valor cair fora da janela, a raiz é pesquisada de novo com a janela completa.
+
+        Args:
+            depth (int): profundidade da iteração
+            add_noise (bool): adiciona ruído às avaliações das folhas
+
+        Returns:
+            tuple: (valor do ponto de vista de quem joga, melhor jogada codificada)
+        """
+        color = 1 if self.model.turn == 1 else -1
+        if (self.aspiration and depth > 1 and self.previous_score is not None
+                and not is_win_score(self.previous_score)):
+            alpha = self.previous_score - self.aspiration_window
+            beta = self.previous_score + self.aspiration_window
+            value, move = self.negamax(depth, alpha, beta, color, add_noise)
+            if alpha < value < beta:
+                return value, move
+        return self.negamax(depth, float('-inf'), float('inf'), color, add_noise)
+
+    def search_root_move(self, move: int, depth: int, alpha: float, add_noise: bool = False) -> float:
+        """Pesquisa uma única jogada da raiz (usado pela pesquisa paralela)
+
+        Com PVS, a jogada é testada primeiro com uma janela nula e só é pesquisada com a janela
+        completa se passar alfa.
+
+        Args:
+            move (int): jogada codificada
+            depth (int): profundidade da iteração
+            alpha (float): melhor valor já conhecido na raiz, do ponto de vista de quem joga
+            add_noise (bool): adiciona ruído às avaliações das folhas (default: False)
+
+        Returns:
+            float: valor da jogada do ponto de vista de quem joga (um limite superior se não passar alfa)
+        """
+        color = 1 if self.model.turn == 1 else -1
+        start, end = decode_move(move)
+        self.model.make_move(start, end)
+        self.ordering.played[0] = move
+        value = None
+        if self.pvs and alpha != float('-inf'):
+            value, _ = self.negamax(depth - 1, -alpha - self.null_window, -alpha, -color, add_noise, 1)
+            value = -value
+        if value is None or value > alpha:
+            value, _ = self.negamax(depth - 1, float('-inf'), -alpha, -color, add_noise, 1)
+            value = -value
         
-        # Avalia e ordena os movimentos
-        scored_moves = [(self.evaluate_move((start, end)), (start, end)) for start, end in possible_moves]
-        scored_moves.sort(reverse=True)  # Ordena por pontuação, do maior para o menor
+        # Penaliza movimentos que levam a estados repetidos
+        if self.model.is_repeated_position():
+            value -= self.repetition_penalty()
         
-        # Retorna o melhor movimento alternativo
-        return scored_moves[0][1]
\ No newline at end of file
+        self.model.unmake_move()
+        return value
@@ -0,0 +1,94 @@
+from array import array
+from MVC.tables import SQUARES
+from MVC.moves import MOVE_MASK, CAPTURE_FLAG, DEN_FLAG, MAX_PLY, POSITIONS
+
+
+# Prioridades de cada tipo de jogada (o histórico fica sempre abaixo de COUNTER_SCORE)
+TT_SCORE = 1 << 40          # Melhor jogada guardada na tabela de transposição
+DEN_SCORE = 1 << 39         # Entrada na toca adversária (vitória imediata)
+CAPTURE_SCORE = 1 << 38     # Capturas, ordenadas por vítima mais valiosa / atacante menos valioso
+KILLER_SCORE = 1 << 37      # Jogadas que causaram cortes noutros nós da mesma profundidade
+COUNTER_SCORE = 1 << 36     # Resposta que já refutou a jogada anterior
+
+MOVE_COUNT = SQUARES * SQUARES      # Jogadas distintas (origem, destino), índice = move & MOVE_MASK
+
+
+class MoveOrdering:
+    """Ordenação dinâmica e barata das jogadas dentro da pesquisa
+
+    Substitui o evaluate_move (que copia o tabuleiro e volta a gerar jogadas) em todos os nós
+    exceto a raiz. A ordem é: jogada da tabela de transposição, entradas na toca, capturas por
+    MVV/LVA, killer moves do nível, countermove da jogada anterior e, por fim, o histórico de cortes.
+    """
+
+    def __init__(self, max_ply: int = MAX_PLY):
+        self.killers = [[0, 0] for _ in range(max_ply)]
+        self.history = [[0] * MOVE_COUNT, [0] * MOVE_COUNT]             # Por lado (0 azul, 1 vermelho)
+        self.countermoves = [[0] * MOVE_COUNT, [0] * MOVE_COUNT]        # Por lado, indexado pela jogada anterior
+        self.played = [0] * max_ply         # Jogada feita em cada nível da pesquisa atual
+
+    def new_search(self) -> None:
+        """Prepara uma nova pesquisa: apaga as killer moves e reduz o histórico para metade"""
+        for killers in self.killers:
+            killers[0] = killers[1] = 0
+        for history in self.history:
+            for i in range(MOVE_COUNT):
+                history[i] >>= 1
+
+    def sort(self, buffer, count: int, ply: int, side: int, model, tt_move=None) -> None:
+        """Ordena as jogadas de um nó, no próprio buffer
+
+        Args:
+            buffer (array): buffer com as jogadas codificadas
+            count (int): número de jogadas no buffer
+            ply (int): distância à raiz
+            side (int): jogador a jogar, 0 (Azul) ou 1 (Vermelho)
+            model (Model): modelo com as listas de peças de cada lado
+            tt_move (int | None): jogada da tabela de transposição (default: None)
+        """
+        killer_1, killer_2 = self.killers[ply]
+        history = self.history[side]
+        previous = self.played[ply - 1] if ply > 0 else 0
+        counter = self.countermoves[side][previous & MOVE_MASK] if previous else 0
+        own = model.side_pieces[side]
+        enemy = model.side_pieces[1 - side]
+
+        def score(move):
+            if move == tt_move:
+                return TT_SCORE
+            if move & DEN_FLAG:
+                return DEN_SCORE
+            if move & CAPTURE_FLAG:
+                from_sq, to_sq = divmod(move & MOVE_MASK, SQUARES)
+                return CAPTURE_SCORE + abs(enemy[POSITIONS[to_sq]]) * 16 - abs(own[POSITIONS[from_sq]])
+            if move == killer_1:
+                return KILLER_SCORE + 1
+            if move == killer_2:
+                return KILLER_SCORE
+            if move == counter:
+                return COUNTER_SCORE
+            return history[move & MOVE_MASK]
+
+        buffer[:count] = array('H', sorted(buffer[:count], key=score, reverse=True))
+
+    def record_cutoff(self, move: int, ply: int, side: int, depth: int) -> None:
+        """Regista uma jogada que causou um corte beta
+
+        As capturas e as entradas na toca já são ordenadas primeiro, por isso só as jogadas
+        calmas atualizam as killer moves, o histórico e as countermoves.
+
+        Args:
+            move (int): jogada codificada que causou o corte
+            ply (int): distância à raiz
+            side (int): jogador que fez a jogada
+            depth (int): profundidade restante no nó do corte
+        """
+        if move & (CAPTURE_FLAG | DEN_FLAG):
+            return
+        killers = self.killers[ply]
+        if killers[0] != move:
+            killers[1] = killers[0]
+            killers[0] = move
+        self.history[side][move & MOVE_MASK] += depth * depth
+        if ply > 0 and self.played[ply - 1]:
+            self.countermoves[side][self.played[ply - 1] & MOVE_MASK] = move
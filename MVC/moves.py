@@ -0,0 +1,65 @@
+from array import array
+from MVC.tables import ROWS, COLS, SQUARES, TERRAIN, ENEMY_TRAP
+
+
+# Codificação compacta das jogadas num inteiro de 16 bits:
+#   bits 0-10  casa de origem * 42 + casa de destino
+#   bit 11     captura
+#   bit 12     entrada na toca adversária
+#   bit 13     entrada numa armadilha adversária
+#   bit 14     salto do Leão sobre o rio
+MOVE_MASK = 0x7FF
+CAPTURE_FLAG = 1 << 11
+DEN_FLAG = 1 << 12
+TRAP_FLAG = 1 << 13
+JUMP_FLAG = 1 << 14
+
+MAX_MOVES = 64      # Mais do que as jogadas possíveis de um lado numa posição
+MAX_PLY = 64        # Profundidade máxima dos buffers de jogadas da pesquisa
+
+# Posições (linha, coluna) de cada casa, para descodificar sem criar tuplos novos
+POSITIONS = tuple((row, col) for row in range(ROWS) for col in range(COLS))
+
+ENEMY_DEN = (3, 6 * COLS + 2)       # Casa da toca adversária para o azul (lado 0) e para o vermelho (lado 1)
+
+# TARGET_FLAGS[lado][casa] - flags de uma jogada do lado dado que termina na casa dada
+TARGET_FLAGS = tuple(tuple(DEN_FLAG if sq == ENEMY_DEN[side] else TRAP_FLAG if TERRAIN[side][sq] == ENEMY_TRAP else 0
+                           for sq in range(SQUARES))
+                     for side in (0, 1))
+
+
+def encode_move(start, end, flags: int = 0) -> int:
+    """Codifica uma jogada ((linha, coluna), (linha, coluna)) num inteiro
+
+    Args:
+        start (tuple): posição inicial
+        end (tuple): posição final
+        flags (int): flags da jogada (captura, toca, armadilha, salto)
+
+    Returns:
+        int: jogada codificada
+    """
+    return ((start[0] * COLS + start[1]) * SQUARES + end[0] * COLS + end[1]) | flags
+
+
+def decode_move(move: int) -> tuple:
+    """Converte uma jogada codificada de volta para o formato ((linha, coluna), (linha, coluna))
+
+    Args:
+        move (int): jogada codificada
+
+    Returns:
+        tuple: (posição inicial, posição final), o formato usado pela View e pelo SaveManager
+    """
+    from_sq, to_sq = divmod(move & MOVE_MASK, SQUARES)
+    return POSITIONS[from_sq], POSITIONS[to_sq]
+
+
+def move_squares(move: int) -> tuple:
+    """Devolve as casas (índices 0 a 41) de origem e de destino de uma jogada codificada"""
+    return divmod(move & MOVE_MASK, SQUARES)
+
+
+def new_move_buffer() -> array:
+    """Cria um buffer pré-alocado para as jogadas de uma posição"""
+    return array('H', bytes(2 * MAX_MOVES))
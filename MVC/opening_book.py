@@ -0,0 +1,115 @@
+import os
+import random
+import numpy as np
+
+
+# Formato do ficheiro: cabeçalho (BOOK_MAGIC + número de entradas em uint64), seguido de três arrays
+# contíguos com uma entrada por jogada, ordenados pela chave: chaves de Zobrist (uint64),
+# jogadas codificadas sem flags (uint16) e pesos (uint16). Todos os valores são little-endian.
+BOOK_MAGIC = b'JCBOOK01'
+HEADER_SIZE = len(BOOK_MAGIC) + 8
+MAX_WEIGHT = 0xFFFF
+
+
+def write_book(path: str, entries: dict) -> int:
+    """Grava um livro de aberturas
+
+    Args:
+        path (str): caminho do ficheiro
+        entries (dict): chave de Zobrist -> lista de (jogada codificada, peso)
+
+    Returns:
+        int: número de jogadas gravadas
+    """
+    rows = sorted((key, move, min(max(int(weight), 1), MAX_WEIGHT))
+                  for key, moves in entries.items() for move, weight in moves)
+    keys = np.array([row[0] for row in rows], dtype='<u8')
+    moves = np.array([row[1] for row in rows], dtype='<u2')
+    weights = np.array([row[2] for row in rows], dtype='<u2')
+    with open(path, 'wb') as file:
+        file.write(BOOK_MAGIC)
+        file.write(np.array([len(rows)], dtype='<u8').tobytes())
+        file.write(keys.tobytes())
+        file.write(moves.tobytes())
+        file.write(weights.tobytes())
+    return len(rows)
+
+
+class OpeningBook:
+    """Livro de aberturas: jogadas com pesos para as posições do início do jogo
+
+    O ficheiro é mapeado em memória (numpy.memmap), por isso abrir o livro não lê o ficheiro todo
+    e cada consulta é uma pesquisa binária nas chaves ordenadas.
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path (str): caminho de um ficheiro gravado com write_book
+
+        Raises:
+            ValueError: se o ficheiro não for um livro de aberturas
+        """
+        with open(path, 'rb') as file:
+            header = file.read(HEADER_SIZE)
+        if len(header) != HEADER_SIZE or header[:len(BOOK_MAGIC)] != BOOK_MAGIC:
+            raise ValueError(f"{path} não é um livro de aberturas")
+        count = int(np.frombuffer(header, dtype='<u8', offset=len(BOOK_MAGIC))[0])
+
+        self.size = count
+        if count == 0:
+            self.keys = np.zeros(0, dtype='<u8')
+            self.moves = self.weights = np.zeros(0, dtype='<u2')
+            return
+        self.keys = np.memmap(path, dtype='<u8', mode='r', offset=HEADER_SIZE, shape=(count,))
+        self.moves = np.memmap(path, dtype='<u2', mode='r', offset=HEADER_SIZE + 8 * count, shape=(count,))
+        self.weights = np.memmap(path, dtype='<u2', mode='r', offset=HEADER_SIZE + 10 * count, shape=(count,))
+
+    @staticmethod
+    def load(path: str):
+        """Abre um livro de aberturas, se o ficheiro existir
+
+        Args:
+            path (str): caminho do ficheiro
+
+        Returns:
+            OpeningBook | None: o livro, ou None se o ficheiro não existir ou não for válido
+        """
+        if not os.path.exists(path):
+            return None
+        try:
+            return OpeningBook(path)
+        except (OSError, ValueError):
+            return None
+
+    def probe(self, key: int) -> list:
+        """Procura as jogadas de uma posição
+
+        Args:
+            key (int): chave de Zobrist da posição
+
+        Returns:
+            list: pares (jogada codificada, peso), vazia se a posição não estiver no livro
+        """
+        key = np.uint64(key)
+        first = int(np.searchsorted(self.keys, key, side='left'))
+        last = int(np.searchsorted(self.keys, key, side='right'))
+        return [(int(self.moves[i]), int(self.weights[i])) for i in range(first, last)]
+
+    def choose(self, key: int, randomize: bool = True):
+        """Escolhe uma jogada do livro para uma posição
+
+        Args:
+            key (int): chave de Zobrist da posição
+            randomize (bool): escolhe ao acaso com probabilidade proporcional ao peso; senão,
+                escolhe sempre a jogada com maior peso (default: True)
+
+        Returns:
+            int | None: jogada codificada sem flags, ou None se a posição não estiver no livro
+        """
+        entries = self.probe(key)
+        if not entries:
+            return None
+        if randomize:
+            return random.choices([move for move, _ in entries], weights=[weight for _, weight in entries])[0]
+        return max(entries, key=lambda entry: entry[1])[0]
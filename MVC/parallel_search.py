@@ -0,0 +1,199 @@
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from MVC.model import Model, SearchAborted
+from MVC.moves import MOVE_MASK, encode_move
+from MVC.transposition import TranspositionTable, SharedTranspositionTable
+
+
+# Opções da IA copiadas para as IAs dos processos (só as que existem em cada classe)
+ENGINE_OPTIONS = ("move_limit", "quiescence_limit", "null_window", "null_move", "null_move_reduction",
+                  "null_move_min_pieces", "lmr", "lmr_min_depth", "lmr_min_index", "pvs", "tablebase")
+
+# Estado de cada processo da pool, criado uma vez por _init_worker
+_engine = None          # IA usada pelo processo (mantém a ordenação das jogadas entre tarefas)
+_best = None            # Melhor valor da iteração atual, partilhado por todos os processos
+_search_id = None       # Pesquisa (jogada real) a que pertencem as últimas tarefas
+
+
+def _init_worker(engine_class, options: dict, evaluator, best, tt: SharedTranspositionTable) -> None:
+    """Cria a IA do processo com as mesmas opções e a mesma função de avaliação da IA principal
+
+    Args:
+        engine_class (type): AI ou NegamaxAI
+        options (dict): opções da IA principal (ENGINE_OPTIONS)
+        evaluator (Evaluator): cópia da função de avaliação da IA principal (a cache é limpa em cada pesquisa)
+        best (Value): melhor valor partilhado da iteração atual
+        tt (SharedTranspositionTable): tabela de transposição partilhada por todos os processos
+    """
+    global _engine, _best
+    _engine = engine_class(Model(), 1, evaluator=evaluator)
+    for name, value in options.items():
+        setattr(_engine, name, value)
+    _engine.tt = tt
+    _best = best
+
+
+def _search_move(search_id: int, model: Model, move: int, depth: int, add_noise: bool, completed_depth: int,
+                 deadline: float, node_limit: int) -> tuple:
+    """Pesquisa uma jogada da raiz num processo da pool
+
+    A janela começa no melhor valor já encontrado pelos outros processos e o valor final é
+    publicado no valor partilhado, para que as tarefas seguintes pesquisem com uma janela mais estreita.
+
+    Args:
+        search_id (int): identificador da pesquisa; quando muda, a ordenação do processo envelhece
+        model (Model): cópia do modelo na posição da raiz
+        move (int): jogada codificada a pesquisar
+        depth (int): profundidade da iteração
+        add_noise (bool): adiciona ruído às avaliações das folhas
+        completed_depth (int): última iteração completa da IA principal (0 impede a interrupção)
+        deadline (float | None): fim do orçamento de tempo, em time.time()
+        node_limit (int | None): nós que esta tarefa pode pesquisar
+
+    Returns:
+        tuple: (jogada, valor do ponto de vista de quem joga ou None se foi interrompida, nós pesquisados)
+    """
+    global _search_id
+    engine = _engine
+    if search_id != _search_id:
+        _search_id = search_id
+        engine.evaluator.clear()
+        engine.tt.new_search()
+        engine.ordering.new_search()
+
+    engine.model = model
+    engine.nodes = 0
+    engine.completed_depth = completed_depth
+    engine.node_limit = node_limit
+    # O relógio perf_counter de cada processo tem uma origem diferente; o prazo viaja em time.time()
+    engine.deadline = time.perf_counter() + deadline - time.time() if deadline is not None else None
+    try:
+        score = engine.search_root_move(move, depth, _best.value, add_noise)
+    except SearchAborted:
+        return move, None, engine.nodes
+
+    with _best.get_lock():
+        if score > _best.value:
+            _best.value = score
+    return move, score, engine.nodes
+
+
+class ParallelSearch:
+    """Pesquisa paralela na raiz (root splitting) para AI e NegamaxAI
+
+    Em cada iteração a primeira jogada da raiz é pesquisada sozinha, para obter um bom limite
+    alfa, e as restantes são distribuídas por uma ProcessPoolExecutor. Cada tarefa recebe uma cópia
+    serializada do Model e começa com o melhor valor partilhado entre processos, que é atualizado
+    sempre que uma tarefa termina. As iterações pouco profundas continuam a ser feitas em série
+    pela IA principal, porque o custo de enviar as tarefas seria maior do que a pesquisa.
+
+    Todos os processos, incluindo a IA principal, usam a mesma SharedTranspositionTable: o que
+    um processo descobre numa subárvore fica logo disponível para os outros (como no Lazy SMP).
+    """
+
+    def __init__(self, ai, workers: int = None, min_depth: int = 3):
+        """
+        Args:
+            ai (AI | NegamaxAI): IA principal, que gera as jogadas da raiz e conta os nós
+            workers (int): número de processos (default: número de CPUs)
+            min_depth (int): profundidade a partir da qual a raiz é dividida (default: 3)
+        """
+        self.ai = ai
+        self.workers = workers or os.cpu_count() or 1
+        self.min_depth = min_depth
+        self.best = multiprocessing.Value('d', float('-inf'))
+        self.executor = None
+        self.tt = None
+        self.search_id = 0
+        self.root_moves = None
+
+    def start(self) -> None:
+        """Cria a tabela de transposição partilhada e a pool de processos, se ainda não existirem"""
+        if self.executor is None:
+            self.tt = SharedTranspositionTable(self.ai.tt.size)
+            self.tt.new_search()
+            self.ai.tt = self.tt
+            options = {name: getattr(self.ai, name) for name in ENGINE_OPTIONS if hasattr(self.ai, name)}
+            self.executor = ProcessPoolExecutor(self.workers, initializer=_init_worker,
+                                                initargs=(type(self.ai), options, self.ai.evaluator, self.best,
+                                                          self.tt))
+
+    def shutdown(self) -> None:
+        """Termina os processos da pool e liberta a tabela partilhada (a IA volta a ter uma tabela própria)"""
+        if self.executor is not None:
+            self.executor.shutdown(wait=True, cancel_futures=True)
+            self.executor = None
+            self.ai.tt = TranspositionTable(self.tt.size)
+            self.tt.close()
+            self.tt = None
+
+    def new_search(self) -> None:
+        """Prepara a pesquisa de uma nova jogada real"""
+        self.search_id += 1
+        self.root_moves = None
+
+    def get_root_moves(self) -> list:
+        """Gera as jogadas da raiz, ordenadas pela IA principal e sem o movimento proibido"""
+        model = self.ai.model
+        entry = self.ai.tt.probe(model.zobrist_key)
+        moves = list(self.ai.get_all_possible_moves(model.turn == 1, 0, entry[4] if entry is not None else None))
+        if model.forbidden_move and model.cycle_detected:
+            forbidden = encode_move(*model.forbidden_move)
+            moves = [move for move in moves if move & MOVE_MASK != forbidden] or moves
+        return moves
+
+    def search(self, depth: int, add_noise: bool) -> tuple:
+        """Pesquisa a raiz com a profundidade dada, dividindo as jogadas pelos processos
+
+        Args:
+            depth (int): profundidade da iteração
+            add_noise (bool): adiciona ruído às avaliações das folhas
+
+        Returns:
+            tuple: (valor do ponto de vista de quem joga, melhor jogada codificada)
+
+        Raises:
+            SearchAborted: se alguma tarefa ficou sem orçamento de tempo ou de nós
+        """
+        ai = self.ai
+        self.start()
+        if self.root_moves is None:
+            self.root_moves = self.get_root_moves()
+        if not self.root_moves:
+            return float('-inf'), None
+
+        deadline = time.time() + ai.deadline - time.perf_counter() if ai.deadline is not None else None
+        self.best.value = float('-inf')
+        scores = {}
+
+        def submit(move, tasks):
+            # O orçamento de nós que resta é dividido pelas tarefas que vão correr ao mesmo tempo
+            node_limit = max((ai.node_limit - ai.nodes) // tasks, 1) if ai.node_limit is not None else None
+            return self.executor.submit(_search_move, self.search_id, ai.model, move, depth, add_noise,
+                                        ai.completed_depth, deadline, node_limit)
+
+        def collect(future):
+            move, score, nodes = future.result()
+            ai.nodes += nodes
+            if score is None:
+                raise SearchAborted()
+            scores[move] = score
+
+        # A primeira jogada (a melhor da iteração anterior) define o limite das restantes
+        collect(submit(self.root_moves[0], 1))
+        tasks = len(self.root_moves) - 1
+        futures = [submit(move, tasks) for move in self.root_moves[1:]]
+        try:
+            for future in as_completed(futures):
+                collect(future)
+        except SearchAborted:
+            for future in futures:
+                future.cancel()
+            raise
+
+        # A iteração seguinte começa pelas jogadas com melhor valor (a ordenação é estável)
+        self.root_moves.sort(key=lambda move: scores[move], reverse=True)
+        best_move = self.root_moves[0]
+        return scores[best_move], best_move
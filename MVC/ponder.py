@@ -0,0 +1,119 @@
+import copy
+import threading
+import time
+from MVC.moves import MAX_PLY, new_move_buffer
+
+
+class Ponderer:
+    """Pensa durante o turno do jogador humano, numa thread, para a IA responder mais depressa
+
+    Enquanto o humano pensa, a thread usa uma cópia do modelo para prever a jogada do humano
+    (com a mesma IA, do ponto de vista do azul) e depois pesquisa a resposta da IA a essa jogada.
+    As duas pesquisas partilham a tabela de transposição, a ordenação e a cache da IA, por isso
+    mesmo quando o humano joga outra coisa a pesquisa seguinte aproveita o trabalho feito.
+
+    Se o humano fizer a jogada prevista e a resposta já tiver sido pesquisada tanto quanto a IA
+    pesquisaria no seu turno, a resposta é devolvida logo, sem nova pesquisa.
+
+    A tabela de transposição, a ordenação e a cache não são protegidas entre threads: a IA real
+    nunca pode pesquisar enquanto a thread está viva. Quem usa o Ponderer tem de chamar stop()
+    (que espera pelo fim da thread) antes de ai.get_best_move().
+    """
+
+    def __init__(self, ai):
+        """
+        Args:
+            ai (AI | NegamaxAI): IA que joga no turno seguinte ao do humano
+        """
+        self.ai = ai
+        self.thread = None
+        self.stop_event = threading.Event()
+        self.position = None            # Posição (chave de Zobrist) em que a pesquisa atual começou
+        self.expected_state = None      # Estado esperado depois da jogada prevista do humano
+        self.reply = None               # Resposta da IA à jogada prevista
+        self.reply_depth = 0
+        self.reply_time = 0.0
+
+    def start(self) -> None:
+        """Começa a pensar na posição atual do modelo, se ainda não estiver a pensar nela"""
+        model = self.ai.model
+        if self.position == model.zobrist_key:
+            return
+        self.stop()
+        self.position = model.zobrist_key
+        self.expected_state = self.reply = None
+        self.reply_depth = 0
+        self.reply_time = 0.0
+
+        # A pesquisa corre sobre cópias: o modelo real continua a ser usado pela interface, e os buffers
+        # de jogadas de cada nível são só da thread
+        engine = copy.copy(self.ai)
+        engine.model = copy.deepcopy(model)
+        engine.move_buffers = [new_move_buffer() for _ in range(MAX_PLY)]
+        engine.parallel = None
+        engine.time_limit = None
+        engine.node_limit = None
+        engine.stop_event = self.stop_event
+
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self.run, args=(engine,), daemon=True)
+        self.thread.start()
+
+    def run(self, engine) -> None:
+        """Pesquisa da thread: prevê a jogada do humano e pesquisa a resposta da IA
+
+        Args:
+            engine (AI | NegamaxAI): cópia da IA, com uma cópia própria do modelo
+        """
+        model = engine.model
+        # A previsão não precisa de ser tão profunda como a resposta
+        engine.max_depth = max(1, self.ai.max_depth - 1)
+        predicted = engine.get_best_move()
+        if predicted is None or self.stop_event.is_set():
+            return
+
+        model.perform_move(*predicted)
+        if model.is_win()[0]:
+            return
+        model.switch_turn()
+        self.expected_state = self.get_state(model)
+
+        engine.max_depth = self.ai.max_depth
+        start_time = time.perf_counter()
+        reply = engine.get_best_move()
+        self.reply_time = time.perf_counter() - start_time
+        self.reply_depth = engine.completed_depth
+        self.reply = reply
+
+    def is_running(self) -> bool:
+        """Verifica se a thread do pondering ainda está viva (e a IA real não pode pesquisar)"""
+        return self.thread is not None and self.thread.is_alive()
+
+    def stop(self):
+        """Para a pesquisa em curso e devolve a resposta preparada, se ainda servir
+
+        Deve ser chamado depois da jogada do humano e sempre antes de a IA real pesquisar, porque
+        a thread partilha com ela a tabela de transposição, a ordenação e a cache.
+
+        Returns:
+            tuple | None: jogada da IA ((linha, coluna), (linha, coluna)) se o humano fez a jogada prevista
+            e a resposta foi pesquisada até à profundidade máxima ou durante o tempo de uma jogada normal
+        """
+        if self.thread is None:
+            return None
+        self.stop_event.set()
+        self.thread.join()
+        self.thread = None
+        self.position = None
+
+        if self.reply is None or self.expected_state != self.get_state(self.ai.model):
+            return None
+        time_limit = self.ai.time_limit
+        if self.reply_depth >= self.ai.max_depth or (time_limit is not None and self.reply_time >= time_limit):
+            return self.reply
+        return None
+
+    @staticmethod
+    def get_state(model) -> tuple:
+        """Resume o estado do modelo que influencia a escolha da IA (posição e controlo de repetições)"""
+        return model.zobrist_key, model.turn, model.forbidden_move, model.cycle_detected
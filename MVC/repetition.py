@@ -0,0 +1,111 @@
+REPETITION_WINDOW = 20      # Número de posições recentes em que se procuram repetições
+THREEFOLD = 3               # Ocorrências de uma posição que indicam um ciclo
+
+
+class RepetitionHistory:
+    """Últimas posições do jogo (chaves de Zobrist) com o número de ocorrências de cada uma
+
+    As chaves ficam num buffer circular de tamanho fixo e cada chave tem um contador num dicionário,
+    por isso acrescentar, retirar e verificar repetições custa sempre o mesmo, seja qual for o tamanho
+    da janela. A pesquisa das IAs acrescenta a chave de cada posição em make_move e retira-a em
+    unmake_move, tal como o jogo real.
+    """
+
+    def __init__(self, window: int = REPETITION_WINDOW):
+        """
+        Args:
+            window (int): número de posições guardadas; as mais antigas saem do buffer (default: REPETITION_WINDOW)
+        """
+        self.window = window
+        self.clear()
+
+    def clear(self) -> None:
+        """Esquece todas as posições"""
+        self.keys = [0] * self.window
+        self.counts = {}
+        self.start = 0          # Índice da posição mais antiga
+        self.length = 0
+        self.threefold = 0      # Número de chaves com pelo menos THREEFOLD ocorrências na janela
+
+    def push(self, key: int):
+        """Acrescenta uma posição, retirando a mais antiga se a janela estiver cheia
+
+        Args:
+            key (int): chave de Zobrist da posição
+
+        Returns:
+            int | None: chave que saiu da janela, que tem de ser devolvida a pop para desfazer
+        """
+        dropped = None
+        if self.length == self.window:
+            dropped = self.keys[self.start]
+            self.keys[self.start] = key
+            self.start = (self.start + 1) % self.window
+            self._decrement(dropped)
+        else:
+            self.keys[(self.start + self.length) % self.window] = key
+            self.length += 1
+        self._increment(key)
+        return dropped
+
+    def pop(self, dropped=None) -> int:
+        """Retira a última posição acrescentada
+
+        Args:
+            dropped (int | None): chave devolvida pelo push correspondente (default: None)
+
+        Returns:
+            int: chave retirada
+        """
+        index = (self.start + self.length - 1) % self.window
+        key = self.keys[index]
+        self._decrement(key)
+        if dropped is not None:
+            self.keys[index] = dropped
+            self.start = index
+            self._increment(dropped)
+        else:
+            self.keys[index] = 0
+            self.length -= 1
+        return key
+
+    def last(self):
+        """Chave da última posição, ou None se não houver nenhuma"""
+        return self.keys[(self.start + self.length - 1) % self.window] if self.length else None
+
+    def is_repeated(self) -> bool:
+        """Verifica se a última posição já tinha ocorrido dentro da janela"""
+        return self.length > 0 and self.counts[self.last()] > 1
+
+    def has_threefold(self) -> bool:
+        """Verifica se alguma posição da janela ocorreu pelo menos THREEFOLD vezes"""
+        return self.threefold > 0
+
+    def to_list(self) -> list:
+        """Chaves da janela, da mais antiga para a mais recente"""
+        return [self.keys[(self.start + i) % self.window] for i in range(self.length)]
+
+    def load(self, keys) -> None:
+        """Substitui o conteúdo pelas chaves dadas (só ficam as últimas window)
+
+        Args:
+            keys (list): chaves da mais antiga para a mais recente
+        """
+        self.clear()
+        for key in keys:
+            self.push(key)
+
+    def _increment(self, key: int) -> None:
+        count = self.counts.get(key, 0) + 1
+        self.counts[key] = count
+        if count == THREEFOLD:
+            self.threefold += 1
+
+    def _decrement(self, key: int) -> None:
+        count = self.counts[key]
+        if count == THREEFOLD:
+            self.threefold -= 1
+        if count == 1:
+            del self.counts[key]
+        else:
+            self.counts[key] = count - 1
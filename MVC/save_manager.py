@@ -2,6 +2,7 @@ import pickle
 import os
 import numpy as np
 from MVC.model import AI, NegamaxAI, RandomAI
+from MVC.mcts import MCTSAI
 
 class SaveManager:
     """Classe para gerenciar o salvamento e carregamento de jogos"""
@@ -85,6 +86,9 @@ class SaveManager:
             'forbidden_move': controller.model.forbidden_move,
             'move_history': controller.model.move_history,
             'cycle_detected': controller.model.cycle_detected,
+            'zobrist_key': controller.model.zobrist_key,  # Identifica a posição guardada
+            'board_states': controller.model.board_states,  # Chaves de Zobrist das últimas posições
+            'repeated_states_count': controller.model.repeated_states_count,
             'elapsed_time': controller.view.elapsed_time,
             'game_time': controller.view.game_time,
         }
@@ -105,7 +109,10 @@ class SaveManager:
         # Salva configurações de IA para jogos IAxIA
         if controller.is_aixai:
             # Azul
-            if hasattr(controller.blue_ai, 'max_depth'):
+            if isinstance(controller.blue_ai, MCTSAI):  # Para MCTS, guarda os segundos por jogada
+                game_state['blue_ai_type'] = 'mcts'
+                game_state['blue_ai_depth'] = controller.blue_ai.time_limit
+            elif hasattr(controller.blue_ai, 'max_depth'):
                 if isinstance(controller.blue_ai, AI):
                     game_state['blue_ai_type'] = 'minimax'
                 else:
@@ -116,7 +123,10 @@ class SaveManager:
                 game_state['blue_ai_depth'] = 0
                 
             # Vermelho
-            if hasattr(controller.red_ai, 'max_depth'):
+            if isinstance(controller.red_ai, MCTSAI):  # Para MCTS, guarda os segundos por jogada
+                game_state['red_ai_type'] = 'mcts'
+                game_state['red_ai_depth'] = controller.red_ai.time_limit
+            elif hasattr(controller.red_ai, 'max_depth'):
                 if isinstance(controller.red_ai, AI):
                     game_state['red_ai_type'] = 'minimax'
                 else:
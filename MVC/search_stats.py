@@ -0,0 +1,73 @@
+# Origem da jogada devolvida por get_best_move
+SEARCH = "pesquisa"
+WINNING_MOVE = "jogada vencedora"
+BOOK = "livro de aberturas"
+TABLEBASE = "tabelas de finais"
+
+
+class SearchStats:
+    """Estatísticas de uma chamada a get_best_move, iguais para todas as IAs de pesquisa
+
+    Os contadores de nós, cortes e profundidade são atualizados pela pesquisa; as avaliações e a
+    cache vêm do Evaluator (diferença entre o início e o fim da jogada). Com a pesquisa paralela,
+    os nós incluem os dos processos, mas os restantes contadores são só os do processo principal.
+    """
+
+    def __init__(self):
+        self.source = SEARCH
+        self.nodes = 0
+        self.evaluations = 0            # Chamadas a evaluate_board
+        self.cache_hits = 0             # Avaliações encontradas na cache do Evaluator
+        self.cache_misses = 0           # Avaliações calculadas e guardadas na cache
+        self.cutoffs = 0                # Cortes beta
+        self.first_move_cutoffs = 0     # Cortes beta logo na primeira jogada do nó
+        self.max_depth = 0              # Maior distância à raiz atingida, incluindo a quiescência
+        self.completed_depth = 0
+        self.iteration_times = []       # Segundos de cada iteração completa
+        self.elapsed = 0.0
+
+    @property
+    def first_move_cutoff_ratio(self) -> float:
+        """Fração dos cortes feitos pela primeira jogada (mede a qualidade da ordenação)"""
+        return self.first_move_cutoffs / self.cutoffs if self.cutoffs else 0.0
+
+    @property
+    def cache_hit_ratio(self) -> float:
+        """Fração das consultas à cache de avaliações que a encontraram"""
+        lookups = self.cache_hits + self.cache_misses
+        return self.cache_hits / lookups if lookups else 0.0
+
+    @property
+    def nodes_per_second(self) -> float:
+        """Nós pesquisados por segundo"""
+        return self.nodes / self.elapsed if self.elapsed > 0 else 0.0
+
+    def record_cutoff(self, index: int) -> None:
+        """Conta um corte beta feito pela jogada com a posição index na lista ordenada"""
+        self.cutoffs += 1
+        if index == 0:
+            self.first_move_cutoffs += 1
+
+    def lines(self) -> list:
+        """Resumo em linhas curtas, para a View"""
+        if self.source != SEARCH:
+            return [f"Origem: {self.source}", f"Tempo: {self.elapsed * 1000:.1f} ms"]
+        lines = [
+            f"Nós: {self.nodes} ({self.nodes_per_second / 1000:.1f}k/s)",
+            f"Profundidade: {self.completed_depth} (máx. {self.max_depth})",
+            f"Avaliações: {self.evaluations} (cache {self.cache_hit_ratio:.0%})",
+            f"Cortes beta: {self.cutoffs} (1.ª jogada {self.first_move_cutoff_ratio:.0%})",
+            f"Tempo: {self.elapsed:.2f} s",
+        ]
+        if self.iteration_times:
+            lines.append("Iterações: " + " ".join(f"{seconds:.2f}" for seconds in self.iteration_times))
+        return lines
+
+    def __str__(self) -> str:
+        if self.source != SEARCH:
+            return f"origem={self.source} tempo={self.elapsed * 1000:.1f}ms"
+        iterations = ",".join(f"{seconds:.3f}" for seconds in self.iteration_times)
+        return (f"nós={self.nodes} nós/s={self.nodes_per_second:.0f} avaliações={self.evaluations} "
+                f"cache={self.cache_hits}/{self.cache_misses} cortes={self.cutoffs} "
+                f"primeira={self.first_move_cutoff_ratio:.2f} profundidade={self.completed_depth} "
+                f"máx={self.max_depth} tempo={self.elapsed:.3f}s iterações=[{iterations}]")
@@ -0,0 +1,384 @@
+import os
+import numpy as np
+from itertools import combinations
+from MVC.tables import SQUARES
+from MVC.batch_movegen import RIVER, OWN_DEN, generate_moves_batch
+from MVC.moves import MOVE_MASK, CAPTURE_FLAG, DEN_FLAG, ENEMY_DEN
+
+
+# Tabelas de finais: para cada combinação de peças (material), o resultado de todas as posições com
+# jogo perfeito, calculado por análise retrógrada. O valor de cada posição é a distância ao fim do
+# jogo em meias-jogadas (plies): ímpar = quem joga ganha, par = quem joga perde, 0 = empate
+# (ninguém consegue forçar a vitória, incluindo as posições sem jogadas).
+#
+# Índice de uma posição: lado a jogar, seguido da casa de cada peça (base 42), com as peças azuis
+# e depois as vermelhas, cada grupo do rank maior para o menor.
+#
+# Formato do ficheiro: cabeçalho (TABLEBASE_MAGIC, bits por posição, número de peças azuis e
+# vermelhas e os ranks, até MAX_TABLE_PIECES), seguido dos valores de todas as posições empacotados
+# com o número de bits indicado, a começar pelo bit menos significativo de cada byte.
+TABLEBASE_MAGIC = b'JCTB0001'
+HEADER_SIZE = len(TABLEBASE_MAGIC) + 8
+MAX_TABLE_PIECES = 4       # O gerador guarda os sucessores de toda a tabela em memória: 5 peças não cabem
+TABLEBASE_EXTENSION = '.tb'
+
+# Valor de uma vitória das tabelas para a pesquisa, menos a distância em plies até ao fim do jogo
+TABLEBASE_WIN = 100000
+
+DRAW = 0
+
+
+def material_name(blue, red) -> str:
+    """Nome da tabela de um material, por exemplo '81v7' (Elefante e Rato azuis contra o Leão vermelho)
+
+    Args:
+        blue (iterable): ranks das peças azuis
+        red (iterable): ranks das peças vermelhas (sem sinal)
+
+    Returns:
+        str: nome da tabela, usado também como nome do ficheiro
+    """
+    blue = ''.join(str(rank) for rank in sorted(blue, reverse=True))
+    red = ''.join(str(rank) for rank in sorted(red, reverse=True))
+    return f"{blue}v{red}"
+
+
+def table_size(pieces: int) -> int:
+    """Número de índices de uma tabela com o número de peças dado (dois lados a jogar)"""
+    return 2 * SQUARES ** pieces
+
+
+def write_table(path: str, blue, red, values: np.ndarray) -> int:
+    """Grava uma tabela empacotada com o menor número de bits que guarda o maior valor
+
+    Args:
+        path (str): caminho do ficheiro
+        blue (iterable): ranks das peças azuis
+        red (iterable): ranks das peças vermelhas (sem sinal)
+        values (ndarray): valor de cada índice
+
+    Returns:
+        int: bits por posição
+    """
+    blue = sorted(blue, reverse=True)
+    red = sorted(red, reverse=True)
+    bits = max(1, int(values.max()).bit_length())
+    header = bytes([bits, len(blue), len(red)] + blue + red).ljust(8, b'\0')
+
+    planes = (values[:, None].astype(np.uint32) >> np.arange(bits, dtype=np.uint32)) & 1
+    packed = np.packbits(planes.astype(np.uint8).reshape(-1), bitorder='little')
+    with open(path, 'wb') as file:
+        file.write(TABLEBASE_MAGIC)
+        file.write(header)
+        file.write(packed.tobytes())
+        file.write(b'\0\0')     # Folga para ler sempre 3 bytes por consulta
+    return bits
+
+
+class EndgameTable:
+    """Tabela de um material, mapeada em memória (numpy.memmap) e lida posição a posição"""
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path (str): caminho de um ficheiro gravado com write_table
+
+        Raises:
+            ValueError: se o ficheiro não for uma tabela de finais
+        """
+        with open(path, 'rb') as file:
+            header = file.read(HEADER_SIZE)
+        if len(header) != HEADER_SIZE or header[:len(TABLEBASE_MAGIC)] != TABLEBASE_MAGIC:
+            raise ValueError(f"{path} não é uma tabela de finais")
+        bits, blue_count, red_count = header[len(TABLEBASE_MAGIC):len(TABLEBASE_MAGIC) + 3]
+        ranks = header[len(TABLEBASE_MAGIC) + 3:len(TABLEBASE_MAGIC) + 3 + blue_count + red_count]
+
+        self.bits = bits
+        self.mask = (1 << bits) - 1
+        self.blue = tuple(ranks[:blue_count])
+        self.red = tuple(ranks[blue_count:])
+        self.pieces = blue_count + red_count
+        self.data = np.memmap(path, dtype=np.uint8, mode='r', offset=HEADER_SIZE)
+
+    def value(self, index: int) -> int:
+        """Valor da posição com o índice dado (ver o início do módulo)"""
+        offset = index * self.bits
+        start = offset >> 3
+        return (int.from_bytes(self.data[start:start + 3].tobytes(), 'little') >> (offset & 7)) & self.mask
+
+
+class Tablebases:
+    """Conjunto das tabelas de finais de uma pasta, abertas só quando são consultadas
+
+    As tabelas são geradas com build_tablebases.py. Os materiais sem ficheiro ficam simplesmente
+    fora das tabelas e a pesquisa trata essas posições normalmente.
+    """
+
+    def __init__(self, directory: str):
+        """
+        Args:
+            directory (str): pasta com os ficheiros das tabelas
+        """
+        self.directory = directory
+        self.paths = {}
+        for name in os.listdir(directory):
+            if name.endswith(TABLEBASE_EXTENSION):
+                self.paths[name[:-len(TABLEBASE_EXTENSION)]] = os.path.join(directory, name)
+        self.tables = {}
+        # Só as posições com até max_pieces peças podem estar nas tabelas
+        self.max_pieces = max((sum(len(part) for part in name.split('v')) for name in self.paths), default=0)
+
+    def __reduce__(self):
+        # Os processos da pesquisa paralela reabrem a pasta em vez de copiarem as tabelas
+        return Tablebases, (self.directory,)
+
+    @staticmethod
+    def load(directory: str):
+        """Abre as tabelas de finais de uma pasta, se existir e tiver tabelas
+
+        Args:
+            directory (str): pasta com os ficheiros das tabelas
+
+        Returns:
+            Tablebases | None: as tabelas, ou None se a pasta não existir ou não tiver nenhuma tabela
+        """
+        if not os.path.isdir(directory):
+            return None
+        tablebases = Tablebases(directory)
+        return tablebases if tablebases.paths else None
+
+    def get_table(self, name: str):
+        """Devolve a tabela de um material, abrindo-a na primeira consulta
+
+        Args:
+            name (str): nome do material (material_name)
+
+        Returns:
+            EndgameTable | None: a tabela, ou None se não houver ficheiro válido para o material
+        """
+        if name not in self.tables:
+            table = None
+            if name in self.paths:
+                try:
+                    table = EndgameTable(self.paths[name])
+                except (OSError, ValueError):
+                    table = None
+            self.tables[name] = table
+        return self.tables[name]
+
+    def probe(self, model, side: int):
+        """Consulta o valor da posição atual do modelo
+
+        Args:
+            model (Model): modelo do jogo
+            side (int): jogador a jogar, 0 (Azul) ou 1 (Vermelho)
+
+        Returns:
+            int | None: distância ao fim do jogo em plies (ímpar = quem joga ganha, par = perde,
+            0 = empate), ou None se a posição não estiver nas tabelas
+        """
+        blue_pieces, red_pieces = model.side_pieces
+        pieces = len(blue_pieces) + len(red_pieces)
+        if pieces > self.max_pieces or not blue_pieces or not red_pieces:
+            return None
+        blue = sorted(blue_pieces.values(), reverse=True)
+        red = sorted((-rank for rank in red_pieces.values()), reverse=True)
+        table = self.get_table(material_name(blue, red))
+        if table is None:
+            return None
+
+        index = side
+        positions = model.piece_positions
+        for rank in blue:
+            row, col = positions[rank]
+            index = index * SQUARES + row * 6 + col
+        for rank in red:
+            row, col = positions[-rank]
+            index = index * SQUARES + row * 6 + col
+        return table.value(index)
+
+
+def list_materials(ranks, max_pieces: int) -> list:
+    """Todos os materiais com pelo menos uma peça de cada lado e até max_pieces peças
+
+    Args:
+        ranks (iterable): ranks das peças que cada jogador tem no início do jogo
+        max_pieces (int): número máximo de peças
+
+    Returns:
+        list: pares (ranks azuis, ranks vermelhos), dos materiais com menos peças para os com mais,
+        para que as tabelas de que cada material depende sejam geradas primeiro
+    """
+    ranks = sorted(ranks, reverse=True)
+    materials = []
+    for pieces in range(2, max_pieces + 1):
+        for blue_count in range(1, pieces):
+            for blue in combinations(ranks, blue_count):
+                for red in combinations(ranks, pieces - blue_count):
+                    materials.append((blue, red))
+    return materials
+
+
+class TablebaseGenerator:
+    """Gera as tabelas de finais por análise retrógrada, com a geração de jogadas de batch_movegen
+
+    Primeiro calcula, por blocos de posições, os sucessores de todas as jogadas de cada posição:
+    outra posição da mesma tabela, uma posição já resolvida de uma tabela com menos peças (capturas)
+    ou o fim do jogo (entrada na toca adversária ou captura da última peça). Depois resolve as
+    posições por distância crescente: com distância ímpar d ganha quem tem uma jogada para uma
+    posição perdida em d - 1; com distância par d perde quem só tem jogadas para posições ganhas
+    em d - 1 ou menos. O que nunca fica resolvido é empate.
+
+    As regras de repetição do jogo não entram nas tabelas.
+    """
+
+    def __init__(self, directory: str, chunk_size: int = 1 << 16):
+        """
+        Args:
+            directory (str): pasta onde as tabelas são gravadas (e lidas, para as capturas)
+            chunk_size (int): posições processadas de uma vez ao calcular os sucessores (default: 65536)
+        """
+        self.directory = directory
+        self.chunk_size = chunk_size
+        self.values = {}        # Valores das tabelas já geradas nesta sessão, por nome
+
+    def path(self, name: str) -> str:
+        """Caminho do ficheiro da tabela de um material"""
+        return os.path.join(self.directory, name + TABLEBASE_EXTENSION)
+
+    def get_values(self, blue, red) -> np.ndarray:
+        """Valores de uma tabela com menos peças, gerada nesta sessão ou lida do disco"""
+        name = material_name(blue, red)
+        if name not in self.values:
+            table = EndgameTable(self.path(name))
+            bits = table.bits
+            size = table_size(table.pieces)
+            planes = np.unpackbits(np.asarray(table.data), bitorder='little')[:size * bits].reshape(size, bits)
+            self.values[name] = (planes.astype(np.uint16) << np.arange(bits, dtype=np.uint16)).sum(axis=1,
+                                                                                                   dtype=np.uint16)
+        return self.values[name]
+
+    def successors(self, blue, red) -> tuple:
+        """Calcula os sucessores de todas as posições de um material
+
+        Args:
+            blue (tuple): ranks das peças azuis, do maior para o menor
+            red (tuple): ranks das peças vermelhas, do maior para o menor
+
+        Returns:
+            tuple(ndarray, ndarray, ndarray): sucessores (N, M) em int32 (índices na tabela, ou
+            N + valor para posições de tabelas com menos peças), posições com vitória imediata (N,)
+            e posições em que se resolve alguma coisa (válidas, não terminadas e com jogadas) (N,)
+        """
+        pieces = np.array(list(blue) + [-rank for rank in red])
+        k = len(pieces)
+        counts = (len(blue), len(red))
+        size = table_size(k)
+        weights = SQUARES ** np.arange(k - 1, -1, -1)
+        max_moves = 4 * max(counts)
+
+        children = np.full((size, max_moves), size + 1, dtype=np.int32)     # N + 1: vitória do adversário
+        instant = np.zeros(size, dtype=bool)
+        playable = np.zeros(size, dtype=bool)
+        is_rat = np.abs(pieces) == 1
+        own_den = np.where(pieces > 0, OWN_DEN[0], OWN_DEN[1])
+        enemy_den = np.where(pieces > 0, ENEMY_DEN[0], ENEMY_DEN[1])
+
+        for first in range(0, size, self.chunk_size):
+            index = np.arange(first, min(first + self.chunk_size, size))
+            side = index // SQUARES ** k
+            squares = (index[:, None] // weights) % SQUARES                        # (n, k)
+
+            # Posições possíveis: casas diferentes, fora da própria toca, só o Rato no rio, jogo por acabar
+            valid = ~((squares[:, :, None] == squares[:, None, :]).sum(axis=(1, 2)) > k)
+            valid &= ~((squares == own_den) | (squares == enemy_den) | (RIVER[squares] & ~is_rat)).any(axis=1)
+            index, side, squares = index[valid], side[valid], squares[valid]
+            if index.size == 0:
+                continue
+
+            n = index.size
+            boards = np.zeros((n, SQUARES), dtype=np.int64)
+            boards[np.arange(n)[:, None], squares] = pieces
+            moves, move_counts = generate_moves_batch(boards.reshape(n, -1, 6), side, max_moves)
+            moves = moves.astype(np.int64)
+            has_move = np.arange(max_moves) < move_counts[:, None]
+            from_sq = (moves & MOVE_MASK) // SQUARES
+            to_sq = (moves & MOVE_MASK) % SQUARES
+            moved = np.argmax(squares[:, None, :] == from_sq[:, :, None], axis=2)           # (n, M)
+            captured = np.argmax(squares[:, None, :] == to_sq[:, :, None], axis=2)
+            capture = has_move & (moves & CAPTURE_FLAG != 0)
+            enemies = np.where(side == 0, counts[1], counts[0])[:, None]
+            wins = has_move & ((moves & DEN_FLAG != 0) | (capture & (enemies == 1)))
+
+            # Jogadas sem captura: a mesma tabela, com a peça movida noutra casa e o outro lado a jogar
+            new_squares = np.repeat(squares[:, None, :], max_moves, axis=1)
+            np.put_along_axis(new_squares, moved[:, :, None], to_sq[:, :, None], axis=2)
+            child = (1 - side)[:, None] * SQUARES ** k + (new_squares * weights).sum(axis=2)
+            block = np.where(has_move & ~capture, child, size + 1)
+
+            # Capturas: a tabela sem a peça capturada, já resolvida
+            for target in range(k):
+                selected = capture & ~wins & (captured == target)
+                if not selected.any():
+                    continue
+                keep = [i for i in range(k) if i != target]
+                sub_blue = [blue[i] for i in keep if i < counts[0]]
+                sub_red = [red[i - counts[0]] for i in keep if i >= counts[0]]
+                sub_values = self.get_values(sub_blue, sub_red)
+                sub_weights = SQUARES ** np.arange(k - 2, -1, -1)
+                sub_index = ((1 - side)[:, None] * SQUARES ** (k - 1)
+                             + (new_squares[:, :, keep] * sub_weights).sum(axis=2))
+                block = np.where(selected, size + sub_values[np.where(selected, sub_index, 0)].astype(np.int64), block)
+
+            children[index] = block
+            instant[index] = wins.any(axis=1)
+            playable[index] = move_counts > 0
+        return children, instant, playable & ~instant
+
+    def generate(self, blue, red) -> np.ndarray:
+        """Resolve todas as posições de um material
+
+        Args:
+            blue (iterable): ranks das peças azuis
+            red (iterable): ranks das peças vermelhas (sem sinal)
+
+        Returns:
+            ndarray: valor (uint16) de cada índice da tabela
+        """
+        blue = tuple(sorted(blue, reverse=True))
+        red = tuple(sorted(red, reverse=True))
+        children, instant, pending = self.successors(blue, red)
+        size = len(instant)
+
+        # Os valores das tabelas com menos peças ficam depois dos da tabela, como constantes
+        max_external = int(children[children >= size].max() - size) if (children >= size).any() else 1
+        values = np.zeros(size + max_external + 1, dtype=np.uint16)
+        values[size:] = np.arange(max_external + 1)
+        values[:size][instant] = 1
+
+        pending = np.flatnonzero(pending)
+        distance = 1
+        idle = 0
+        while pending.size and (idle < 2 or distance <= max_external):
+            distance += 1
+            child_values = values[children[pending]]
+            if distance % 2:
+                resolved = (child_values == distance - 1).any(axis=1)
+            else:
+                resolved = ((child_values % 2 == 1) & (child_values < distance)).all(axis=1)
+            values[pending[resolved]] = distance
+            pending = pending[~resolved]
+            idle = 0 if resolved.any() else idle + 1
+        return values[:size]
+
+    def build(self, blue, red) -> tuple:
+        """Gera e grava a tabela de um material
+
+        Returns:
+            tuple(int, int): bits por posição e maior distância ao fim do jogo
+        """
+        values = self.generate(blue, red)
+        name = material_name(blue, red)
+        self.values[name] = values
+        bits = write_table(self.path(name), blue, red, values)
+        return bits, int(values.max())
@@ -0,0 +1,138 @@
+from assets.consts import Consts
+
+
+# Tabelas de geometria do tabuleiro, calculadas uma única vez ao importar o módulo.
+# Cada tabela é indexada pela casa = linha * COLS + coluna e guarda posições (linha, coluna),
+# que é o formato devolvido por Model.get_possible_moves.
+
+ROWS = Consts.ROWS
+COLS = Consts.COLS
+SQUARES = ROWS * COLS
+
+
+def square(pos) -> int:
+    """Converte uma posição (linha, coluna) no índice da casa usado pelas tabelas
+
+    Args:
+        pos (tuple(int, int)): posição no tabuleiro
+
+    Returns:
+        int: índice da casa (0 a 41)
+    """
+    return pos[0] * COLS + pos[1]
+
+
+def is_river(pos) -> bool:
+    """Verifica se uma posição é rio (colunas 1 e 4, entre as linhas 2 e 4)"""
+    return pos[1] in (1, 4) and 2 <= pos[0] <= 4
+
+
+def _build_neighbours():
+    """Gera as casas adjacentes de cada casa, pela ordem de Consts.DIRECTIONS"""
+    neighbours = []
+    for row in range(ROWS):
+        for col in range(COLS):
+            adjacent = []
+            for dir in Consts.DIRECTIONS:
+                new_row, new_col = row + dir[0], col + dir[1]
+                if 0 <= new_row < ROWS and 0 <= new_col < COLS:
+                    adjacent.append((new_row, new_col))
+            neighbours.append(tuple(adjacent))
+    return tuple(neighbours)
+
+
+def _build_jumps():
+    """Gera os saltos do Leão sobre o rio: tuplos (destino, casas de rio pelo caminho)
+
+    A ordem é a mesma que a lógica original: esquerda, direita, cima, baixo.
+    """
+    jumps = []
+    for row in range(ROWS):
+        for col in range(COLS):
+            targets = []
+            if 2 <= row <= 4:
+                # Saltos horizontais
+                if col == 2:
+                    targets.append(((row, 0), ((row, 1),)))
+                elif col == 5:
+                    targets.append(((row, 3), ((row, 4),)))
+                if col == 0:
+                    targets.append(((row, 2), ((row, 1),)))
+                elif col == 3:
+                    targets.append(((row, 5), ((row, 4),)))
+            if col in (1, 4):
+                # Saltos verticais
+                if row == 5:
+                    targets.append(((1, col), tuple((r, col) for r in range(2, 5))))
+                if row == 1:
+                    targets.append(((5, col), tuple((r, col) for r in range(2, 5))))
+            jumps.append(tuple(targets))
+    return tuple(jumps)
+
+
+NEIGHBOURS = _build_neighbours()     # Todas as casas adjacentes (usado pelo Rato)
+LAND_NEIGHBOURS = tuple(tuple(pos for pos in adjacent if not is_river(pos)) for adjacent in NEIGHBOURS)
+WATER_NEIGHBOURS = tuple(tuple(pos for pos in adjacent if is_river(pos)) for adjacent in NEIGHBOURS)
+JUMPS = _build_jumps()               # Saltos do Leão e casas de rio onde um Rato os bloqueia
+
+
+# Terreno de cada casa, do ponto de vista da peça que lá está (0 azul, 1 vermelho)
+LAND = 0
+RIVER = 1
+ENEMY_TRAP = 2
+
+RED_TRAPS = ((0, 2), (0, 4), (1, 3))     # Armadilhas perigosas para as peças azuis
+BLUE_TRAPS = ((6, 1), (6, 3), (5, 2))    # Armadilhas perigosas para as peças vermelhas
+
+
+def _build_terrain():
+    """Gera o terreno de cada casa para cada lado"""
+    terrain = ([], [])
+    for row in range(ROWS):
+        for col in range(COLS):
+            pos = (row, col)
+            for side, enemy_traps in ((0, RED_TRAPS), (1, BLUE_TRAPS)):
+                if is_river(pos):
+                    terrain[side].append(RIVER)
+                elif pos in enemy_traps:
+                    terrain[side].append(ENEMY_TRAP)
+                else:
+                    terrain[side].append(LAND)
+    return tuple(terrain[0]), tuple(terrain[1])
+
+
+TERRAIN = _build_terrain()
+
+
+def _can_capture(rank_a: int, rank_b: int, terrain_a: int, terrain_b: int) -> bool:
+    """Regras de captura, compiladas para CAPTURES (ranks sem sinal)"""
+    # Uma peça numa armadilha do adversário pode ser capturada por qualquer peça
+    if terrain_b == ENEMY_TRAP:
+        return True
+
+    # Rato contra Rato: só se ambos estiverem no rio ou ambos em terra
+    if rank_a == 1 and rank_b == 1:
+        return (terrain_a == RIVER) == (terrain_b == RIVER)
+
+    # Rato contra Elefante: o Rato só captura a partir de terra
+    if rank_a == 1 and rank_b == 8:
+        return terrain_a != RIVER
+
+    # O Elefante não captura o Rato
+    if rank_a == 8:
+        return rank_b != 1
+
+    return rank_b <= rank_a
+
+
+# CAPTURES[capture_index(...)] diz se a peça de rank_a pode capturar a de rank_b, dados os terrenos de ambas
+CAPTURES = tuple(_can_capture(rank_a, rank_b, terrain_a, terrain_b) if rank_a != 0 else False
+                 for rank_a in range(9)
+                 for rank_b in range(9)
+                 for terrain_a in range(3)
+                 for terrain_b in range(3))
+
+
+def capture_index(rank_a: int, rank_b: int, terrain_a: int, terrain_b: int) -> int:
+    """Calcula o índice em CAPTURES para os ranks (sem sinal) e terrenos dados"""
+    return ((rank_a * 9 + rank_b) * 3 + terrain_a) * 3 + terrain_b
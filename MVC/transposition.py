@@ -0,0 +1,204 @@
+import struct
+import weakref
+from multiprocessing import shared_memory
+import numpy as np
+
+
+# Tipos de limite guardados com cada resultado da pesquisa
+EXACT = 0       # O valor é exato (ficou dentro da janela alfa-beta)
+LOWER = 1       # O valor é um limite inferior (houve corte beta)
+UPPER = 2       # O valor é um limite superior (nenhuma jogada chegou a alfa)
+
+DEFAULT_SIZE = 1 << 16      # Número de posições de cada nível da tabela (potência de 2)
+
+
+class TranspositionTable:
+    """Tabela de transposição de tamanho limitado, indexada pela chave de Zobrist da posição
+
+    Cada posição da tabela tem duas entradas: uma que só é substituída por pesquisas pelo menos tão
+    profundas (depth-preferred) e outra que é sempre substituída (always-replace). Assim os resultados
+    caros sobrevivem e os recentes continuam disponíveis. As entradas são tuplos
+    (chave, profundidade, valor, tipo de limite, melhor jogada codificada, geração).
+
+    A tabela é mantida entre jogadas; as entradas profundas de pesquisas anteriores (outra geração)
+    podem ser substituídas por qualquer resultado novo.
+    """
+
+    def __init__(self, size: int = DEFAULT_SIZE):
+        self.size = size
+        self.mask = size - 1
+        self.clear()
+
+    def clear(self) -> None:
+        """Apaga todas as entradas da tabela"""
+        self.deep = [None] * self.size
+        self.recent = [None] * self.size
+        self.generation = 0
+
+    def new_search(self) -> None:
+        """Marca o início de uma nova pesquisa (nova jogada)"""
+        self.generation += 1
+
+    def probe(self, key: int):
+        """Procura uma posição na tabela
+
+        Args:
+            key (int): chave de Zobrist da posição
+
+        Returns:
+            tuple | None: entrada (chave, profundidade, valor, limite, jogada, geração) ou None se não existir
+        """
+        index = key & self.mask
+        entry = self.deep[index]
+        if entry is not None and entry[0] == key:
+            return entry
+        entry = self.recent[index]
+        if entry is not None and entry[0] == key:
+            return entry
+        return None
+
+    def store(self, key: int, depth: int, score: float, bound: int, move) -> None:
+        """Guarda o resultado da pesquisa de uma posição
+
+        Args:
+            key (int): chave de Zobrist da posição
+            depth (int): profundidade pesquisada a partir da posição
+            score (float): valor encontrado
+            bound (int): EXACT, LOWER ou UPPER
+            move (int | None): melhor jogada codificada (MVC.moves)
+        """
+        index = key & self.mask
+        entry = (key, depth, score, bound, move, self.generation)
+        deep = self.deep[index]
+        if deep is None or deep[5] != self.generation or depth >= deep[1]:
+            self.deep[index] = entry
+        else:
+            self.recent[index] = entry
+
+    def cutoff(self, entry, depth: int, alpha: float, beta: float) -> bool:
+        """Verifica se uma entrada permite terminar a pesquisa de uma posição sem a expandir
+
+        Args:
+            entry (tuple): entrada devolvida por probe
+            depth (int): profundidade que falta pesquisar
+            alpha (float): limite inferior da janela atual
+            beta (float): limite superior da janela atual
+
+        Returns:
+            bool: True se o valor da entrada pode ser devolvido diretamente
+        """
+        if entry[1] < depth:
+            return False
+        score, bound = entry[2], entry[3]
+        return bound == EXACT or (bound == LOWER and score >= beta) or (bound == UPPER and score <= alpha)
+
+
+# Entrada da tabela partilhada; o campo key guarda a chave XOR o resto da entrada (ver SharedTranspositionTable)
+SHARED_ENTRY = np.dtype([('key', '<u8'), ('depth', '<i2'), ('score', '<f8'), ('flag', 'u1'), ('move', '<u2'),
+                         ('generation', 'u1')])
+
+_DOUBLE = struct.Struct('<d')
+_UINT64 = struct.Struct('<Q')
+
+
+def _entry_hash(depth: int, score: float, flag: int, move: int, generation: int) -> int:
+    """Junta os campos de uma entrada num inteiro de 64 bits, para a verificação por XOR"""
+    score_bits = _UINT64.unpack(_DOUBLE.pack(score))[0]
+    return score_bits ^ (depth & 0xFFFF) ^ (flag << 16) ^ (move << 24) ^ (generation << 40)
+
+
+class SharedTranspositionTable(TranspositionTable):
+    """Tabela de transposição em multiprocessing.shared_memory, partilhada por vários processos
+
+    Tem a mesma interface e a mesma política de substituição da TranspositionTable, mas as entradas
+    vivem num array estruturado do NumPy (2, size) sobre memória partilhada, por isso todos os processos
+    da pesquisa paralela consultam e guardam resultados na mesma tabela, sem a copiar entre processos.
+
+    As escritas não usam locks. Em vez da chave, cada entrada guarda a chave XOR os restantes campos:
+    se dois processos escreverem a mesma entrada ao mesmo tempo e ela ficar misturada, a chave
+    reconstruída deixa de coincidir e a entrada é simplesmente ignorada.
+
+    O processo que cria a tabela é o dono: é o único que avança a geração e que apaga a memória
+    (unlink), em close ou, se a tabela nunca for fechada, quando é destruída ou o programa sai.
+    Os outros processos ligam-se pelo nome, o que acontece automaticamente quando a tabela é
+    enviada para outro processo com pickle.
+    """
+
+    def __init__(self, size: int = DEFAULT_SIZE, name: str = None):
+        """
+        Args:
+            size (int): número de posições de cada nível da tabela, potência de 2 (default: DEFAULT_SIZE)
+            name (str): nome de uma tabela já existente a que ligar (default: None, cria uma nova)
+        """
+        self.size = size
+        self.mask = size - 1
+        self.owner = name is None
+        nbytes = SHARED_ENTRY.itemsize * 2 * size + 8
+        self.memory = shared_memory.SharedMemory(name=name, create=self.owner, size=nbytes)
+        # Os primeiros 8 bytes guardam a geração atual, igual para todos os processos
+        self.header = np.ndarray((1,), dtype='<u8', buffer=self.memory.buf)
+        self.table = np.ndarray((2, size), dtype=SHARED_ENTRY, buffer=self.memory.buf, offset=8)
+        if self.owner:
+            self.clear()
+            # Se a tabela não for fechada, a memória é apagada quando for destruída ou quando o programa sair
+            self.unlink = weakref.finalize(self, self.memory.unlink)
+
+    def __reduce__(self):
+        return SharedTranspositionTable, (self.size, self.memory.name)
+
+    @property
+    def generation(self) -> int:
+        return int(self.header[0]) & 0xFF
+
+    def clear(self) -> None:
+        """Apaga todas as entradas da tabela"""
+        self.table[:] = np.zeros((), dtype=SHARED_ENTRY)
+        self.header[0] = 0
+
+    def new_search(self) -> None:
+        """Marca o início de uma nova pesquisa (só o dono da tabela avança a geração)"""
+        if self.owner:
+            self.header[0] += 1
+
+    def probe(self, key: int):
+        """Procura uma posição na tabela
+
+        Args:
+            key (int): chave de Zobrist da posição
+
+        Returns:
+            tuple | None: entrada (chave, profundidade, valor, limite, jogada, geração) ou None se não existir
+        """
+        index = key & self.mask
+        for slot in (0, 1):
+            stored_key, depth, score, flag, move, generation = self.table[slot, index].item()
+            if depth > 0 and stored_key ^ _entry_hash(depth, score, flag, move, generation) == key:
+                return key, depth, score, flag, move or None, generation
+        return None
+
+    def store(self, key: int, depth: int, score: float, bound: int, move) -> None:
+        """Guarda o resultado da pesquisa de uma posição
+
+        Args:
+            key (int): chave de Zobrist da posição
+            depth (int): profundidade pesquisada a partir da posição
+            score (float): valor encontrado
+            bound (int): EXACT, LOWER ou UPPER
+            move (int | None): melhor jogada codificada (MVC.moves)
+        """
+        index = key & self.mask
+        generation = self.generation
+        move = move or 0
+        entry = (key ^ _entry_hash(depth, score, bound, move, generation), depth, score, bound, move, generation)
+        deep = self.table[0, index]
+        if deep['depth'] == 0 or deep['generation'] != generation or depth >= deep['depth']:
+            self.table[0, index] = entry
+        else:
+            self.table[1, index] = entry
+
+    def close(self) -> None:
+        """Liga-se da memória partilhada; o dono também a apaga"""
+        self.header = self.table = None
+        self.memory.close()
+        if self.owner:
+            self.unlink()
@@ -41,6 +41,7 @@ class View:
         self.is_paused = False
         self.show_resume_button = False  # Nova variável para controlar a exibição do botão resume
         self.is_aixai = False  # Flag para controlar se está no modo IAxIA
+        self.search_stats = [None, None]  # SearchStats da última jogada de cada IA no modo IAxIA (azul, vermelho)
         
         self.message: str = "Jogador Azul"
         pg.event.set_blocked([pg.MOUSEMOTION])
@@ -90,6 +91,7 @@ class View:
             elif not self.is_paused:
                 self.stop_button.draw(self.display)
                 self.show_resume_button = False  # Esconde o botão resume quando não está pausado
+            self.draw_search_stats()
 
         # Desenha o tabuleiro
         width = Consts.COLS * Consts.BLOCK_SIZE + (Consts.COLS - 1) * Consts.GAP    # Largura do tabuleiro real, NÃO DO ECRÃ
@@ -213,6 +215,22 @@ class View:
             
             pg.draw.rect(self.display, (245,222,52,50),(x_pos, y_pos, 30, 30), border_radius=10)
     
+    def draw_search_stats(self) -> None:
+        """Desenha as estatísticas da última pesquisa de cada IA, à direita do tabuleiro (modo IAxIA)"""
+        y = 110
+        for player, stats in zip(("Azul", "Vermelho"), self.search_stats):
+            if stats is None:
+                continue
+            color = (0, 150, 190) if player == "Azul" else (208, 0, 0)
+            title = Consts.label_font.render(f"IA {player}", True, color)
+            self.display.blit(title, (690, y))
+            y += 20
+            for line in stats.lines():
+                text = Consts.label_font.render(line, True, Consts.LABEL_COLOR)
+                self.display.blit(text, (690, y))
+                y += 18
+            y += 14
+
     def switch_turn(self, turn: int) -> None:
         """Muda a mensagem baseada no turno atual
 
@@ -296,5 +314,6 @@ class View:
         self.is_paused = False
         self.show_resume_button = False
         self.is_aixai = False
+        self.search_stats = [None, None]
         
         self.message: str = "Jogador Azul"    
\ No newline at end of file
@@ -0,0 +1,36 @@
+import random
+from MVC.tables import ROWS, COLS, SQUARES
+
+
+# Semente fixa: as chaves têm de ser iguais entre execuções, porque são guardadas nos jogos salvos
+ZOBRIST_SEED = 0x4A756E676C65
+
+_rng = random.Random(ZOBRIST_SEED)
+
+# PIECE_KEYS[rank + 8][casa] - um número aleatório de 64 bits por peça (com sinal) e por casa
+PIECE_KEYS = tuple(tuple(_rng.getrandbits(64) for _ in range(SQUARES)) if rank != 0 else (0,) * SQUARES
+                   for rank in range(-8, 9))
+
+# Aplicado quando é a vez do jogador vermelho
+SIDE_KEY = _rng.getrandbits(64)
+
+
+def board_key(board, turn: int = 0) -> int:
+    """Calcula a chave de Zobrist de um tabuleiro completo
+
+    Só é usada ao carregar um tabuleiro; durante o jogo a chave é atualizada com XORs em cada jogada.
+
+    Args:
+        board (ndarray): tabuleiro 7x6 com os ranks das peças
+        turn (int): jogador a jogar, 0 (Azul) ou 1 (Vermelho)
+
+    Returns:
+        int: chave de 64 bits da posição
+    """
+    key = SIDE_KEY if turn == 1 else 0
+    for row in range(ROWS):
+        for col in range(COLS):
+            piece = int(board[row, col])
+            if piece != 0:
+                key ^= PIECE_KEYS[piece + 8][row * COLS + col]
+    return key
@@ -36,4 +36,20 @@ class Consts:
 
     FPS = 60
 
+    # Tempo máximo (segundos) que as IAs Minimax e Negamax pensam em cada jogada; a profundidade
+    # escolhida no menu passa a ser a profundidade máxima do aprofundamento iterativo
+    AI_TIME_LIMIT = 2.0
+
+    # Processos usados pela pesquisa paralela na raiz das IAs Minimax e Negamax (1 = sem paralelismo)
+    AI_WORKERS = 1
+
+    # No modo PvE, a IA pensa na resposta durante o turno do jogador humano
+    AI_PONDER = True
+
+    # Livro de aberturas das IAs Minimax e Negamax, gerado com build_book.py (ignorado se não existir)
+    OPENING_BOOK = os.path.join(current_dir, 'opening_book.bin')
+
+    # Pasta das tabelas de finais, geradas com build_tablebases.py (ignorada se não existir)
+    TABLEBASES = os.path.join(current_dir, 'tablebases')
+
     DIRECTIONS = [(-1, 0), (1, 0), (0, -1), (0, 1)]
\ No newline at end of file
@@ -0,0 +1,125 @@
+import argparse
+import os
+import time
+
+# O benchmark corre sem janela: o pygame só é usado para carregar as constantes
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from MVC.model import Model, AI, NegamaxAI
+from MVC.mcts import MCTSAI
+from perft import parse_position
+
+
+# Posições de referência (posição em texto, jogador a jogar), sem jogadas vencedoras imediatas
+BENCH_POSITIONS = [
+    ("-7,0,0,0,0,-5/0,-4,0,0,-2,0/-1,0,0,0,0,-8/0,0,0,0,0,0/8,0,0,0,0,1/0,2,0,0,4,0/5,0,0,0,0,7", 0),
+    ("-7,0,0,0,0,-5/0,-4,0,0,-2,0/-1,0,0,0,0,-8/0,0,0,0,0,0/8,0,0,0,0,1/0,2,0,0,4,0/5,0,0,0,0,7", 1),
+    ("-7,0,0,0,0,-5/-4,0,0,0,-2,0/-1,0,0,0,0,0/0,0,0,0,0,-8/8,0,0,0,1,0/5,2,0,0,4,0/0,0,0,0,0,7", 0),
+    ("-7,0,0,0,0,-5/0,-4,0,0,0,-2/0,0,0,0,1,0/0,-1,0,0,0,-8/8,0,0,0,0,0/5,2,0,0,4,0/0,0,0,0,0,7", 0),
+    ("-7,0,0,0,0,-5/0,-4,0,1,0,-2/0,0,0,0,0,0/0,0,-1,0,0,0/8,0,0,0,0,-8/0,2,0,0,4,0/5,0,0,0,7,0", 1),
+]
+
+# Configurações comparadas para cada motor: nome -> argumentos extra do construtor
+CONFIGS = {
+    "minimax": {
+        "minimax": {"null_move": False, "lmr": False},
+        "null move": {"null_move": True, "lmr": False},
+        "lmr": {"null_move": False, "lmr": True},
+        "null move + lmr": {"null_move": True, "lmr": True},
+    },
+    "negamax": {
+        "alfa-beta": {"pvs": False, "aspiration": False, "null_move": False, "lmr": False},
+        "pvs": {"pvs": True, "aspiration": False, "null_move": False, "lmr": False},
+        "aspiração": {"pvs": False, "aspiration": True, "null_move": False, "lmr": False},
+        "pvs + aspiração": {"pvs": True, "aspiration": True, "null_move": False, "lmr": False},
+        "pvs + null move": {"pvs": True, "aspiration": False, "null_move": True, "lmr": False},
+        "pvs + lmr": {"pvs": True, "aspiration": False, "null_move": False, "lmr": True},
+        "pvs + null + lmr": {"pvs": True, "aspiration": False, "null_move": True, "lmr": True},
+    },
+}
+
+
+def run(engine: str, options: dict, depth: int, workers: int = 1) -> tuple:
+    """Pesquisa todas as posições de referência com uma configuração
+
+    Args:
+        engine (str): "minimax" ou "negamax"
+        options (dict): argumentos extra do construtor da IA
+        depth (int): profundidade máxima
+        workers (int): processos da pesquisa paralela na raiz (default: 1)
+
+    Returns:
+        tuple: (nós por profundidade somados em todas as posições, tempo total em segundos)
+    """
+    depth_nodes = [0] * depth
+    elapsed = 0.0
+    for position, turn in BENCH_POSITIONS:
+        model = Model()
+        model.set_board(parse_position(position), turn)
+        model.turn = turn
+        engine_class = AI if engine == "minimax" else NegamaxAI
+        ai = engine_class(model, depth, workers=workers, **options)
+
+        start_time = time.perf_counter()
+        ai.get_best_move()
+        elapsed += time.perf_counter() - start_time
+        for i, nodes in enumerate(ai.depth_nodes):
+            depth_nodes[i] += nodes
+        if ai.parallel is not None:
+            ai.parallel.shutdown()
+    return depth_nodes, elapsed
+
+
+def run_mcts(time_limit: float) -> list:
+    """Mede o ritmo da IA MCTS em todas as posições de referência
+
+    Args:
+        time_limit (float): segundos por posição
+
+    Returns:
+        list: (iterações, tempo em segundos) de cada posição
+    """
+    results = []
+    for position, turn in BENCH_POSITIONS:
+        model = Model()
+        model.set_board(parse_position(position), turn)
+        model.turn = turn
+        ai = MCTSAI(model, time_limit=time_limit, seed=0)
+
+        start_time = time.perf_counter()
+        ai.get_best_move()
+        results.append((ai.nodes, time.perf_counter() - start_time))
+    return results
+
+
+def branching_factor(depth_nodes: list) -> float:
+    """Fator de ramificação efetivo: média geométrica do crescimento dos nós entre iterações"""
+    if len(depth_nodes) < 2 or depth_nodes[0] == 0:
+        return 0.0
+    return (depth_nodes[-1] / depth_nodes[0]) ** (1 / (len(depth_nodes) - 1))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark da pesquisa das IAs: nós por profundidade em posições de referência")
+    parser.add_argument("--depth", type=int, default=5, help="profundidade máxima do aprofundamento iterativo")
+    parser.add_argument("--engine", choices=tuple(CONFIGS) + ("mcts",), default="negamax", help="IA a medir")
+    parser.add_argument("--workers", type=int, default=1, help="processos da pesquisa paralela na raiz")
+    parser.add_argument("--time", type=float, default=1.0, help="segundos por posição da IA MCTS")
+    args = parser.parse_args()
+
+    if args.engine == "mcts":
+        print("Posição".ljust(10) + "Iterações".rjust(11) + "Tempo".rjust(9) + "Iter/s".rjust(9))
+        for i, (iterations, elapsed) in enumerate(run_mcts(args.time), 1):
+            print(str(i).ljust(10) + str(iterations).rjust(11) + f"{elapsed:8.2f}s" + f"{iterations / elapsed:9.0f}")
+        return
+
+    header = "Configuração".ljust(20) + "".join(f"d{d}".rjust(10) for d in range(1, args.depth + 1))
+    print(header + "Total".rjust(11) + "EBF".rjust(7) + "Tempo".rjust(9))
+    for name, options in CONFIGS[args.engine].items():
+        depth_nodes, elapsed = run(args.engine, options, args.depth, args.workers)
+        row = name.ljust(20) + "".join(str(nodes).rjust(10) for nodes in depth_nodes)
+        print(row + str(sum(depth_nodes)).rjust(11) + f"{branching_factor(depth_nodes):7.2f}" + f"{elapsed:8.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+import argparse
+import os
+import time
+
+# O construtor do livro corre sem janela: o pygame só é usado para carregar as constantes
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from assets.consts import Consts
+from MVC.model import Model, AI, NegamaxAI
+from MVC.moves import MOVE_MASK, DEN_FLAG, decode_move
+from MVC.opening_book import write_book, MAX_WEIGHT
+
+
+class BookBuilder:
+    """Constrói um livro de aberturas com pesquisas profundas a partir da posição inicial
+
+    Cada posição é pesquisada com a IA até à profundidade dada e cada jogada da raiz é depois
+    pesquisada outra vez sozinha, para obter o seu valor exato. As jogadas que ficam a menos de
+    margin do melhor valor entram no livro, com um peso que desce linearmente com a diferença,
+    e as posições que resultam delas são expandidas até ao número de jogadas (plies) pedido.
+    """
+
+    def __init__(self, ai, width: int = 3, margin: float = 30.0):
+        """
+        Args:
+            ai (AI | NegamaxAI): IA usada nas pesquisas, já ligada ao modelo na posição inicial
+            width (int): número máximo de jogadas guardadas por posição (default: 3)
+            margin (float): diferença máxima para o melhor valor de uma jogada guardada (default: 30.0)
+        """
+        self.ai = ai
+        self.model = ai.model
+        self.width = width
+        self.margin = margin
+        self.entries = {}       # Chave de Zobrist -> lista de (jogada, peso)
+        self.positions = 0
+
+    def score_moves(self, depth: int) -> list:
+        """Pesquisa a posição atual e devolve o valor de cada jogada da raiz
+
+        Args:
+            depth (int): profundidade das pesquisas
+
+        Returns:
+            list: pares (valor do ponto de vista de quem joga, jogada codificada), do melhor para o pior
+        """
+        self.ai.get_best_move()     # Enche a tabela de transposição com a árvore da posição
+        moves = list(self.ai.get_all_possible_moves(self.model.turn == 1))
+        scored = [(self.ai.search_root_move(move, depth, float('-inf')), move) for move in moves]
+        scored.sort(key=lambda item: item[0], reverse=True)
+        return scored
+
+    def build(self, plies: int, depth: int) -> dict:
+        """Expande as posições a partir da posição atual do modelo
+
+        Args:
+            plies (int): número de jogadas (das duas cores) cobertas pelo livro
+            depth (int): profundidade das pesquisas
+
+        Returns:
+            dict: entradas do livro, no formato de write_book
+        """
+        key = self.model.zobrist_key
+        if plies == 0 or key in self.entries or self.model.is_win()[0]:
+            return self.entries
+
+        scored = self.score_moves(depth)
+        if not scored:
+            return self.entries
+        self.positions += 1
+        best = scored[0][0]
+
+        chosen = []
+        for score, move in scored[:self.width]:
+            if best - score > self.margin:
+                break
+            weight = MAX_WEIGHT if self.margin == 0 else MAX_WEIGHT * (1 - (best - score) / self.margin)
+            chosen.append((move, weight))
+        self.entries[key] = [(move & MOVE_MASK, weight) for move, weight in chosen]
+
+        for move, _ in chosen:
+            if move & DEN_FLAG:
+                continue
+            self.model.make_move(*decode_move(move))
+            self.model.turn = 1 - self.model.turn
+            self.build(plies - 1, depth)
+            self.model.turn = 1 - self.model.turn
+            self.model.unmake_move()
+        return self.entries
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Constrói o livro de aberturas das IAs a partir da posição inicial")
+    parser.add_argument("--plies", type=int, default=6, help="número de jogadas cobertas pelo livro")
+    parser.add_argument("--depth", type=int, default=6, help="profundidade das pesquisas de cada posição")
+    parser.add_argument("--width", type=int, default=3, help="número máximo de jogadas por posição")
+    parser.add_argument("--margin", type=float, default=30.0,
+                        help="diferença máxima para o melhor valor de uma jogada guardada")
+    parser.add_argument("--engine", choices=("minimax", "negamax"), default="negamax", help="IA usada nas pesquisas")
+    parser.add_argument("--output", default=Consts.OPENING_BOOK, help="ficheiro do livro")
+    args = parser.parse_args()
+
+    model = Model()
+    ai = AI(model, args.depth) if args.engine == "minimax" else NegamaxAI(model, args.depth)
+    builder = BookBuilder(ai, args.width, args.margin)
+
+    start_time = time.perf_counter()
+    entries = builder.build(args.plies, args.depth)
+    count = write_book(args.output, entries)
+    elapsed = time.perf_counter() - start_time
+
+    print(f"Posições: {builder.positions}")
+    print(f"Jogadas: {count}")
+    print(f"Tempo: {elapsed:.1f} s")
+    print(f"Livro gravado em {args.output}")
+
+
+if __name__ == "__main__":
+    main()
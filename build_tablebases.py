@@ -0,0 +1,50 @@
+import argparse
+import os
+import time
+
+# O gerador corre sem janela: o pygame só é usado para carregar as constantes
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from assets.consts import Consts
+from MVC.model import Model
+from MVC.tablebase import TablebaseGenerator, MAX_TABLE_PIECES, list_materials, material_name
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gera as tabelas de finais das IAs por análise retrógrada")
+    parser.add_argument("--pieces", type=int, default=3, choices=range(2, MAX_TABLE_PIECES + 1),
+                        help="número máximo de peças em jogo (as duas cores)")
+    parser.add_argument("--output", default=Consts.TABLEBASES, help="pasta das tabelas")
+    parser.add_argument("--force", action="store_true", help="gera outra vez as tabelas que já existem")
+    args = parser.parse_args()
+
+    os.makedirs(args.output, exist_ok=True)
+    generator = TablebaseGenerator(args.output)
+
+    # As peças de cada jogador no início do jogo
+    ranks = sorted(Model().side_pieces[0].values(), reverse=True)
+    materials = list_materials(ranks, args.pieces)
+
+    start_time = time.perf_counter()
+    total_size = 0
+    for number, (blue, red) in enumerate(materials, 1):
+        name = material_name(blue, red)
+        path = generator.path(name)
+        if os.path.exists(path) and not args.force:
+            total_size += os.path.getsize(path)
+            continue
+        table_start = time.perf_counter()
+        bits, longest = generator.build(blue, red)
+        total_size += os.path.getsize(path)
+        print(f"[{number}/{len(materials)}] {name}: {bits} bits por posição, "
+              f"final mais longo {longest} plies, {time.perf_counter() - table_start:.1f} s")
+    elapsed = time.perf_counter() - start_time
+
+    print(f"Tabelas: {len(materials)}")
+    print(f"Tamanho: {total_size / 1e6:.1f} MB")
+    print(f"Tempo: {elapsed:.1f} s")
+    print(f"Tabelas gravadas em {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+import argparse
+import os
+import time
+
+# O perft corre sem janela: o pygame só é usado para carregar as constantes
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from MVC.model import Model
+from MVC.bitboard import BitboardModel
+from MVC.moves import CAPTURE_FLAG, DEN_FLAG, MAX_PLY, decode_move, new_move_buffer
+from MVC.save_manager import SaveManager
+
+
+class Perft:
+    """Conta as folhas da árvore de jogadas até uma profundidade dada
+
+    Serve para medir a velocidade do gerador de movimentos do Model e para comparar um gerador
+    novo com contagens de referência. As posições ganhas (toca inimiga ocupada ou sem peças
+    inimigas) não são expandidas, tal como na pesquisa das IAs.
+    """
+
+    def __init__(self, model: Model):
+        self.model = model
+        self.move_buffers = [new_move_buffer() for _ in range(MAX_PLY)]
+
+    def has_pieces(self, side: int) -> bool:
+        """Verifica se um jogador ainda tem peças no tabuleiro
+
+        Args:
+            side (int): jogador, 0 (Azul) ou 1 (Vermelho)
+        """
+        return any((rank > 0) == (side == 0) for rank in self.model.piece_positions)
+
+    def count(self, depth: int, side: int, ply: int = 0) -> int:
+        """Conta as folhas a partir da posição atual
+
+        Args:
+            depth (int): profundidade restante
+            side (int): jogador a jogar, 0 (Azul) ou 1 (Vermelho)
+            ply (int): distância à raiz, que escolhe o buffer de jogadas usado (default: 0)
+
+        Returns:
+            int: número de folhas
+        """
+        if depth == 0:
+            return 1
+
+        buffer = self.move_buffers[ply]
+        count = self.model.generate_moves(side, buffer)
+        if depth == 1:
+            return count
+
+        nodes = 0
+        for i in range(count):
+            move = buffer[i]
+            start, end = decode_move(move)
+            captured = self.model.move_piece(start, end)
+            if move & DEN_FLAG or (move & CAPTURE_FLAG and not self.has_pieces(1 - side)):
+                nodes += 1  # Jogada vencedora: a posição é uma folha
+            else:
+                nodes += self.count(depth - 1, 1 - side, ply + 1)
+            self.model.undo_move_piece(start, end, captured)
+        return nodes
+
+    def divide(self, depth: int, side: int) -> list:
+        """Conta as folhas separadamente para cada jogada da raiz
+
+        Args:
+            depth (int): profundidade total (pelo menos 1)
+            side (int): jogador a jogar, 0 (Azul) ou 1 (Vermelho)
+
+        Returns:
+            list: pares ((início, fim), folhas) pela ordem do gerador
+        """
+        buffer = new_move_buffer()
+        count = self.model.generate_moves(side, buffer)
+        results = []
+        for move in buffer[:count]:
+            start, end = decode_move(move)
+            captured = self.model.move_piece(start, end)
+            if move & DEN_FLAG or (move & CAPTURE_FLAG and not self.has_pieces(1 - side)):
+                nodes = 1
+            else:
+                nodes = self.count(depth - 1, 1 - side, 1)
+            self.model.undo_move_piece(start, end, captured)
+            results.append(((start, end), nodes))
+        return results
+
+
+def parse_position(position: str) -> list:
+    """Converte uma posição em texto no tabuleiro 7x6 usado pelo Model
+
+    As linhas vão de cima (vermelho) para baixo (azul), separadas por '/', e as casas de cada linha
+    são os ranks das peças separados por vírgulas (positivos para o azul, negativos para o vermelho).
+    Exemplo da posição inicial:
+    -7,0,0,0,0,-5/0,-4,0,0,-2,0/-1,0,0,0,0,-8/0,0,0,0,0,0/8,0,0,0,0,1/0,2,0,0,4,0/5,0,0,0,0,7
+
+    Args:
+        position (str): posição em texto
+
+    Returns:
+        list: tabuleiro 7x6
+    """
+    board = [[int(cell) for cell in row.split(',')] for row in position.strip().split('/')]
+    if len(board) != 7 or any(len(row) != 6 for row in board):
+        raise ValueError("A posição tem de ter 7 linhas de 6 casas")
+    return board
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Perft: conta as folhas da árvore de jogadas do Jungle Chess")
+    parser.add_argument("depth", type=int, help="profundidade da contagem")
+    parser.add_argument("--position", help="posição em texto (ver parse_position); por omissão, a posição inicial")
+    parser.add_argument("--load", action="store_true", help="usa a posição do jogo salvo em saves/savegame.dat")
+    parser.add_argument("--turn", type=int, choices=(0, 1), default=None,
+                        help="jogador a jogar: 0 (Azul) ou 1 (Vermelho); por omissão 0, ou o do jogo salvo")
+    parser.add_argument("--divide", action="store_true", help="mostra a contagem de cada jogada da raiz")
+    parser.add_argument("--backend", choices=("array", "bitboard"), default="array",
+                        help="representação do tabuleiro usada pelo gerador")
+    args = parser.parse_args()
+
+    model = BitboardModel() if args.backend == "bitboard" else Model()
+    turn = 0
+    if args.load:
+        game_state = SaveManager.load_game()
+        if game_state is None:
+            parser.error("não existe nenhum jogo salvo")
+        model.set_board(game_state['game_board'], game_state['turn'])
+        turn = game_state['turn']
+    elif args.position:
+        model.set_board(parse_position(args.position))
+    if args.turn is not None:
+        turn = args.turn
+    model.set_board(model.game_board, turn)
+
+    perft = Perft(model)
+    start_time = time.perf_counter()
+    if args.divide and args.depth > 0:
+        results = perft.divide(args.depth, turn)
+        for (start, end), nodes in results:
+            print(f"{start} -> {end}: {nodes}")
+        nodes = sum(nodes for _, nodes in results)
+    else:
+        nodes = perft.count(args.depth, turn)
+    elapsed = time.perf_counter() - start_time
+
+    print(f"Nós: {nodes}")
+    print(f"Tempo: {elapsed:.3f} s")
+    print(f"Nós por segundo: {nodes / elapsed if elapsed > 0 else 0:.0f}")
+
+
+if __name__ == "__main__":
+    main()
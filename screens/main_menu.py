@@ -370,18 +370,20 @@ class MainMenu:
         title_rect = title.get_rect(center=(Consts.WINDOW_WIDTH/2, 100))
         self.display.blit(title, title_rect)
         
-        # Botões organizados em duas colunas
+        # Botões organizados em três colunas
         button_width = 200
         button_height = 60
         button_spacing = 20
         start_y = 150
         
         # Posições para coluna esquerda
-        left_x = Consts.WINDOW_WIDTH/2 - button_width - button_spacing/2
+        left_x = Consts.WINDOW_WIDTH/2 - button_width * 1.5 - button_spacing
+        # Posições para coluna do meio
+        middle_x = Consts.WINDOW_WIDTH/2 - button_width/2
         # Posições para coluna direita
-        right_x = Consts.WINDOW_WIDTH/2 + button_spacing/2
+        right_x = Consts.WINDOW_WIDTH/2 + button_width/2 + button_spacing
         
-        # Criação dos botões (organizados em duas colunas)
+        # Criação dos botões (organizados em três colunas)
         # Coluna esquerda
         self.random_button = Button("#DCDCDC", left_x, start_y, button_width, button_height, 
                                     border_radius=15, text="Aleatório", font=Consts.button_font)
@@ -395,22 +397,33 @@ class MainMenu:
                                    button_width, button_height, border_radius=15, text="Minimax 5", 
                                    font=Consts.button_font)
         
-        # Coluna direita
-        self.negamax2_button = Button("#2196F3", right_x, start_y, 
+        # Coluna do meio
+        self.negamax2_button = Button("#2196F3", middle_x, start_y, 
                                    button_width, button_height, border_radius=15, text="Negamax 3", 
                                    font=Consts.button_font)
-        self.negamax3_button = Button("#2196F3", right_x, start_y + button_height + button_spacing, 
+        self.negamax3_button = Button("#2196F3", middle_x, start_y + button_height + button_spacing, 
                                    button_width, button_height, border_radius=15, text="Negamax 4", 
                                    font=Consts.button_font)
-        self.negamax4_button = Button("#2196F3", right_x, start_y + (button_height + button_spacing) * 2, 
+        self.negamax4_button = Button("#2196F3", middle_x, start_y + (button_height + button_spacing) * 2, 
                                    button_width, button_height, border_radius=15, text="Negamax 5", 
                                    font=Consts.button_font)
         
-        # Botão voltar na coluna direita
-        self.back_button = Button("#808080", right_x, start_y + (button_height + button_spacing) * 3, 
+        # Botão voltar na coluna do meio
+        self.back_button = Button("#808080", middle_x, start_y + (button_height + button_spacing) * 3, 
                                  button_width, button_height, border_radius=15, text="Voltar", 
                                  font=Consts.button_font)
         
+        # Coluna direita: MCTS com 1, 2 e 5 segundos por jogada
+        self.mcts1_button = Button("#9C27B0", right_x, start_y, 
+                                   button_width, button_height, border_radius=15, text="MCTS 1s", 
+                                   font=Consts.button_font)
+        self.mcts2_button = Button("#9C27B0", right_x, start_y + button_height + button_spacing, 
+                                   button_width, button_height, border_radius=15, text="MCTS 2s", 
+                                   font=Consts.button_font)
+        self.mcts5_button = Button("#9C27B0", right_x, start_y + (button_height + button_spacing) * 2, 
+                                   button_width, button_height, border_radius=15, text="MCTS 5s", 
+                                   font=Consts.button_font)
+        
         # Desenha os botões
         self.random_button.draw(self.display)
         self.minimax2_button.draw(self.display)
@@ -419,6 +432,9 @@ class MainMenu:
         self.negamax2_button.draw(self.display)
         self.negamax3_button.draw(self.display)
         self.negamax4_button.draw(self.display)
+        self.mcts1_button.draw(self.display)
+        self.mcts2_button.draw(self.display)
+        self.mcts5_button.draw(self.display)
         self.back_button.draw(self.display)
         
         # Desenha a imagem do leão no canto inferior direito
@@ -471,6 +487,12 @@ class MainMenu:
                         return ("negamax", 4)
                     elif self.negamax4_button.is_over(mouse_pos):
                         return ("negamax", 5)
+                    elif self.mcts1_button.is_over(mouse_pos):
+                        return ("mcts", 1)
+                    elif self.mcts2_button.is_over(mouse_pos):
+                        return ("mcts", 2)
+                    elif self.mcts5_button.is_over(mouse_pos):
+                        return ("mcts", 5)
                     elif self.back_button.is_over(mouse_pos):
                         # Limpa a tela e redesenha o menu principal
                         self.display.fill(Consts.BACKGROUND_COLOR)
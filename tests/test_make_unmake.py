@@ -0,0 +1,69 @@
+import os
+
+# Os testes correm sem janela: o pygame só é usado para carregar as constantes
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import random
+from collections import Counter
+import pytest
+from MVC.model import Model
+from MVC.moves import decode_move, new_move_buffer
+from MVC.zobrist import board_key
+from perft import parse_position
+from bench import BENCH_POSITIONS
+
+
+def snapshot(model: Model) -> tuple:
+    """Cópia de todo o estado que make_move e make_null_move alteram"""
+    return (model.game_board.tolist(), dict(model.piece_positions), tuple(dict(pieces) for pieces in model.side_pieces),
+            model.zobrist_key, model.board_states, dict(model.repetitions.counts), model.repetitions.threefold,
+            dict(model.repeated_states_count), list(model.last_moves), model.last_move_coords,
+            model.random_factor, model.cycle_detected, model.forbidden_move)
+
+
+def assert_consistent(model: Model, side: int) -> None:
+    """A chave incremental e os índices de peças coincidem com os recalculados a partir do tabuleiro"""
+    assert model.zobrist_key == board_key(model.game_board, side)
+    pieces = {(i, j): int(model.game_board[i, j]) for i in range(7) for j in range(6) if model.game_board[i, j] != 0}
+    assert model.piece_positions == {piece: pos for pos, piece in pieces.items()}
+    assert model.side_pieces[0] == {pos: piece for pos, piece in pieces.items() if piece > 0}
+    assert model.side_pieces[1] == {pos: piece for pos, piece in pieces.items() if piece < 0}
+    assert dict(model.repetitions.counts) == dict(Counter(model.board_states))
+
+
+@pytest.mark.parametrize("seed", range(len(BENCH_POSITIONS) + 1))
+def test_make_unmake_round_trip(seed):
+    """Em passeios aleatórios com jogadas e jogadas nulas, unmake_move repõe exatamente o estado anterior"""
+    rng = random.Random(seed)
+    position, turn = ([(None, 0)] + BENCH_POSITIONS)[seed]     # Posição inicial e posições do benchmark
+    model = Model()
+    if position is not None:
+        model.set_board(parse_position(position), turn)
+    buffer = new_move_buffer()
+
+    # Pilha de (estado antes da jogada, jogador a jogar antes da jogada)
+    history = []
+    side = turn
+    for _ in range(3000):
+        assert_consistent(model, side)
+        count = 0 if model.is_win()[0] else model.generate_moves(side, buffer)
+        action = rng.random()
+        if history and (count == 0 or len(history) >= 60 or action < 0.35):
+            state, side = history.pop()
+            model.unmake_move()
+            assert snapshot(model) == state
+        elif action < 0.45:
+            history.append((snapshot(model), side))
+            model.make_null_move()
+            side = 1 - side
+        elif count:
+            history.append((snapshot(model), side))
+            model.make_move(*decode_move(buffer[rng.randrange(count)]))
+            side = 1 - side
+
+    while history:
+        state, side = history.pop()
+        model.unmake_move()
+        assert snapshot(model) == state
+        assert_consistent(model, side)
+    assert not model.undo_stack
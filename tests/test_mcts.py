@@ -0,0 +1,52 @@
+import os
+import time
+
+# Os testes correm sem janela: o pygame só é usado para carregar as constantes
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import numpy as np
+from MVC.model import Model
+from MVC.mcts import MCTSAI
+from MVC.batch_movegen import generate_moves_batch, sample_moves_batch
+from MVC.moves import MOVE_MASK, new_move_buffer
+from perft import parse_position
+from bench import BENCH_POSITIONS
+
+
+def test_mcts_iteration_budget():
+    """Com um orçamento em iterações, todas as visitas dos rollouts chegam à raiz e cada jogada é experimentada"""
+    model = Model()
+    ai = MCTSAI(model, iterations=160, seed=0)
+    assert ai.get_best_move() is not None
+    assert ai.nodes == 160
+    visits = [visits for visits, _ in ai.root_stats.values()]
+    assert len(visits) == model.generate_moves(model.turn, new_move_buffer())
+    assert sum(visits) == 160 * ai.rollout_batch
+    assert min(visits) >= ai.rollout_batch
+    assert not model.undo_stack
+
+
+def test_mcts_respects_time_limit():
+    """Com um orçamento em segundos, a jogada não demora muito mais do que o limite"""
+    model = Model()
+    ai = MCTSAI(model, time_limit=0.5, seed=0)
+    start_time = time.perf_counter()
+    assert ai.get_best_move() is not None
+    assert time.perf_counter() - start_time <= 0.5 + 2.0
+    assert ai.nodes > 0
+    assert not model.undo_stack
+
+
+def test_sample_moves_batch_plays_legal_moves():
+    """As jogadas dos rollouts são sempre jogadas legais de generate_moves_batch"""
+    boards = np.array([parse_position(position) for position, _ in BENCH_POSITIONS], dtype=np.int64).reshape(-1, 42)
+    sides = np.array([turn for _, turn in BENCH_POSITIONS])
+    moves, counts = generate_moves_batch(boards.reshape(-1, 7, 6), sides)
+    legal = [{int(move) & MOVE_MASK for move in moves[i, :counts[i]]} for i in range(len(boards))]
+
+    rng = np.random.default_rng(0)
+    for _ in range(50):
+        from_sq, to_sq, has_moves = sample_moves_batch(boards, sides, rng, 4.0)
+        assert has_moves.all()
+        for i in range(len(boards)):
+            assert int(from_sq[i]) * 42 + int(to_sq[i]) in legal[i]
@@ -0,0 +1,42 @@
+import os
+
+# Os testes correm sem janela: o pygame só é usado para carregar as constantes
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pytest
+from MVC.engine import Evaluator
+from MVC.model import Model, AI, NegamaxAI
+from perft import parse_position
+from bench import BENCH_POSITIONS
+
+
+class MaterialEvaluator(Evaluator):
+    """Avaliação só com o material, diferente da avaliação por omissão"""
+
+    def evaluate_board(self, model) -> float:
+        is_win, winner = model.is_win()
+        if is_win:
+            return float('inf') if winner == 'Vermelho' else float('-inf')
+        score = 0
+        for side_pieces in model.side_pieces:
+            for piece in side_pieces.values():
+                score += self.piece_values[abs(piece)] if piece < 0 else -self.piece_values[abs(piece)]
+        return score
+
+
+@pytest.mark.parametrize("engine", [AI, NegamaxAI])
+def test_parallel_search_uses_the_ai_evaluator(engine):
+    """Com uma função de avaliação própria, a pesquisa paralela dá o mesmo valor que a pesquisa em série"""
+    position, turn = BENCH_POSITIONS[2]
+    scores = []
+    for workers in (1, 2):
+        model = Model()
+        model.set_board(parse_position(position), turn)
+        model.turn = turn
+        ai = engine(model, 4, workers=workers, evaluator=MaterialEvaluator())
+        try:
+            assert ai.get_best_move() is not None
+            scores.append(ai.previous_score)
+        finally:
+            ai.shutdown()
+    assert scores[0] == scores[1]
@@ -0,0 +1,23 @@
+import os
+
+# Os testes correm sem janela: o pygame só é usado para carregar as constantes
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pytest
+from MVC.model import Model
+from MVC.bitboard import BitboardModel
+from perft import Perft
+
+
+# Contagens de referência a partir da posição inicial (azul a jogar), por profundidade
+PERFT_COUNTS = {1: 15, 2: 224, 3: 2913, 4: 37721}
+
+
+@pytest.mark.parametrize("model_class", [Model, BitboardModel])
+@pytest.mark.parametrize("depth", sorted(PERFT_COUNTS))
+def test_perft_reference_counts(model_class, depth):
+    """Os dois geradores de movimentos dão as contagens de referência e deixam o tabuleiro como estava"""
+    model = model_class()
+    board = model.game_board.copy()
+    assert Perft(model).count(depth, 0) == PERFT_COUNTS[depth]
+    assert (model.game_board == board).all()